@@ -10,12 +10,15 @@ import cv2 as _
 
 # Public classes
 from buzzard._footprint import Footprint
+from buzzard._footprint_grid import FootprintGrid
+from buzzard._footprint_index import FootprintIndex
 from buzzard._dataset import (
     Dataset,
     open_raster,
     open_vector,
     create_raster,
     create_vector,
+    create_memory_vector,
     wrap_numpy_raster
 )
 from buzzard._dataset import (
@@ -48,11 +51,13 @@ from buzzard._a_raster_recipe import ARasterRecipe
 # Source's concrete classes
 # Public methods, but always instanciated by Dataset, never by user.
 from buzzard._gdal_file_raster import GDALFileRaster
+from buzzard._gdal_mosaic_raster import GDALMosaicRaster
 from buzzard._gdal_mem_raster import GDALMemRaster
 from buzzard._numpy_raster import NumpyRaster
 
 from buzzard._gdal_file_vector import GDALFileVector
 from buzzard._gdal_memory_vector import GDALMemoryVector
+from buzzard._memory_vector import MemoryVector
 
 from buzzard._cached_raster_recipe import CachedRasterRecipe
 
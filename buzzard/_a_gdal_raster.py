@@ -20,8 +20,7 @@ class ABackGDALRaster(ABackStoredRaster):
                 dst_nodata,
                 self.dtype
             )
-        with self.acquire_driver_object() as gdal_ds:
-            array = self.sample_bands_driver(samplefp, channel_ids, gdal_ds)
+        array = self.sample_bands(samplefp, channel_ids)
         array = self.remap(
             samplefp,
             fp,
@@ -35,12 +34,21 @@ class ABackGDALRaster(ABackStoredRaster):
         array = array.astype(self.dtype, copy=False)
         return array
 
-    def sample_bands_driver(self, fp, channel_ids, gdal_ds):
+    def sample_bands(self, fp, channel_ids):
+        """Read the pixels of `fp` (a Footprint on the same grid as self, contained in self)
+        Overriden by the sources that can split the read between several driver objects.
+        """
+        with self.acquire_driver_object() as gdal_ds:
+            return self.sample_bands_driver(fp, channel_ids, gdal_ds)
+
+    def sample_bands_driver(self, fp, channel_ids, gdal_ds, dstarray=None):
         rtlx, rtly = self.fp.spatial_to_raster(fp.tl)
         assert rtlx >= 0 and rtlx < self.fp.rsizex, '{} >= 0 and {} < {}'.format(rtlx, rtlx, self.fp.rsizex)
         assert rtly >= 0 and rtly < self.fp.rsizey, '{} >= 0 and {} < {}'.format(rtly, rtly, self.fp.rsizey)
 
-        dstarray = np.empty(np.r_[fp.shape, len(channel_ids)], self.dtype)
+        if dstarray is None:
+            dstarray = np.empty(np.r_[fp.shape, len(channel_ids)], self.dtype)
+        assert dstarray.shape == tuple(np.r_[fp.shape, len(channel_ids)])
         for i, channel_id in enumerate(channel_ids):
             gdal_band = gdal_ds.GetRasterBand(channel_id + 1)
             success, payload = GDALErrorCatcher(gdal_band.ReadAsArray, none_is_error=True)(
@@ -58,14 +66,27 @@ class ABackGDALRaster(ABackStoredRaster):
 
     # set_data implementation ******************************************************************* **
     def set_data(self, array, fp, channel_ids, interpolation, mask):
-        if not fp.share_area(self.fp):
+        ret = self.remap_for_write(array, fp, interpolation, mask)
+        if ret is None:
             return
+        array, fp, mask = ret
+
+        # Write ****************************************************************
+        # TODO: Close all but 1 driver? Or let user do this
+        with self.acquire_driver_object() as gdal_ds:
+            for i, channel_id in enumerate(channel_ids):
+                self.write_channel_driver(array[:, :, i], fp, channel_id, mask, gdal_ds)
+
+    def remap_for_write(self, array, fp, interpolation, mask):
+        """Remap `array` (and `mask`) from `fp` to the part of `fp` that is within self.
+        Returns `(array, fp, mask)` or None if there is nothing to write."""
+        if not fp.share_area(self.fp):
+            return None
         if not fp.same_grid(self.fp) and mask is None:
             mask = np.ones(fp.shape, bool)
 
         dstfp = self.fp.intersection(fp)
 
-        # Remap ****************************************************************
         ret = self.remap(
             fp,
             dstfp,
@@ -82,26 +103,23 @@ class ABackGDALRaster(ABackStoredRaster):
             array = ret
         del ret
         array = array.astype(self.dtype, copy=False)
-        fp = dstfp
-        del dstfp
-
-        # Write ****************************************************************
-        # TODO: Close all but 1 driver? Or let user do this
-        with self.acquire_driver_object() as gdal_ds:
-            for i, channel_id in enumerate(channel_ids):
-                leftx, topy = self.fp.spatial_to_raster(fp.tl)
-                gdalband = gdal_ds.GetRasterBand(channel_id + 1)
-
-                for sl in _tools.slices_of_matrix(mask):
-                    a = array[:, :, i][sl]
-                    assert a.ndim == 2
-                    x = int(sl[1].start + leftx)
-                    y = int(sl[0].start + topy)
-                    assert x >= 0
-                    assert y >= 0
-                    assert x + a.shape[1] <= self.fp.rsizex
-                    assert y + a.shape[0] <= self.fp.rsizey
-                    gdalband.WriteArray(a, x, y)
+        return array, dstfp, mask
+
+    def write_channel_driver(self, array, fp, channel_id, mask, gdal_ds):
+        """Write `array` (2d, on the same grid as self, contained in self) to a channel"""
+        leftx, topy = self.fp.spatial_to_raster(fp.tl)
+        gdalband = gdal_ds.GetRasterBand(channel_id + 1)
+
+        for sl in _tools.slices_of_matrix(mask):
+            a = array[sl]
+            assert a.ndim == 2
+            x = int(sl[1].start + leftx)
+            y = int(sl[0].start + topy)
+            assert x >= 0
+            assert y >= 0
+            assert x + a.shape[1] <= self.fp.rsizex
+            assert y + a.shape[0] <= self.fp.rsizey
+            gdalband.WriteArray(a, x, y)
 
     # fill implementation *********************************************************************** **
     def fill(self, value, channel_ids):
@@ -1,5 +1,7 @@
 import contextlib
+import itertools
 import os
+import re
 
 import numpy as np
 from osgeo import gdal, ogr, osr
@@ -8,6 +10,7 @@ import shapely.ops
 import shapely.geometry as sg
 
 from buzzard._a_stored_vector import ABackStoredVector
+from buzzard import _tools
 from buzzard._tools import conv, GDALErrorCatcher
 from buzzard._env import Env
 
@@ -42,8 +45,23 @@ class ABackGDALVector(ABackStoredVector):
         with self.acquire_driver_object() as (_, lyr):
             return len(lyr)
 
+    def feature_count(self, mask_poly, mask_rect, where):
+        fids = self._spatial_index_fids(mask_poly, mask_rect, where)
+        if mask_poly is not None:
+            mask_poly = conv.ogr_of_shapely(mask_poly)
+        with self.acquire_driver_object() as (_, lyr):
+            if fids is not None:
+                features = self._iter_features(
+                    slice(0, None, 1), lyr, fids, mask_poly, mask_rect, where, [], True,
+                )
+                return sum(1 for _ in features)
+            with self._layer_filters(lyr, mask_poly, mask_rect, where, [], True):
+                return len(lyr)
+
     # iter_data implementation ****************************************************************** **
-    def iter_data(self, geom_type, field_indices, slicing, mask_poly, mask_rect, clip):
+    def iter_data(self, geom_type, field_indices, slicing, mask_poly, mask_rect, clip,
+                  where, simplify_tolerance):
+        fids = self._spatial_index_fids(mask_poly, mask_rect, where)
         clip_poly = None
         if mask_poly is not None:
             mask_poly = conv.ogr_of_shapely(mask_poly)
@@ -53,14 +71,29 @@ class ABackGDALVector(ABackStoredVector):
             if clip:
                 clip_poly = conv.ogr_of_shapely(sg.box(*mask_rect))
 
+        # Without reprojection the simplification is performed on the ogr geometries, before the
+        # conversion to shapely
+        simplify_ogr = simplify_tolerance is not None and not self.to_work
+        if simplify_ogr:
+            simplify_tolerance_ogr, simplify_tolerance = simplify_tolerance, None
+
         ftr = None # Necessary to prevent the old swig bug
         geom = None # Necessary to prevent the old swig bug
         with self.acquire_driver_object() as (_, lyr):
-            for ftr in self.iter_features_driver(slicing, mask_poly, mask_rect, lyr):
-                geom = ftr.geometry()
-                if geom is None or geom.IsEmpty():
+            # The geometries are converted and reprojected by chunks, with a single call to
+            # `to_work` per chunk
+            chunk = []
+            features = self._iter_features(
+                slicing, lyr, fids, mask_poly, mask_rect, where, field_indices,
+                geom_type is not None,
+            )
+            for ftr in features:
+                geom = None if geom_type is None else ftr.geometry()
+                if geom_type is None:
+                    wkb = None
+                elif geom is None or geom.IsEmpty():
                     # `geom is None` and `geom.IsEmpty()` is not exactly the same case, but whatever
-                    geom = None
+                    wkb = None
                     if not self.back_ds.allow_none_geometry: # pragma: no cover
                         raise Exception(
                             'None geometry in feature '
@@ -70,20 +103,20 @@ class ABackGDALVector(ABackStoredVector):
                     if clip:
                         geom = geom.Intersection(clip_poly)
                         assert not geom.IsEmpty()
-                    geom = conv.shapely_of_ogr(geom)
-                    if self.to_work:
-                        geom = shapely.ops.transform(self.to_work, geom)
-                    if geom_type == 'coordinates':
-                        geom = sg.mapping(geom)['coordinates']
-                    elif geom_type == 'geojson':
-                        geom = sg.mapping(geom)
-
-                yield (geom,) + tuple(
+                    if simplify_ogr:
+                        geom = geom.SimplifyPreserveTopology(simplify_tolerance_ogr)
+                    wkb = bytes(geom.ExportToWkb())
+
+                chunk.append((wkb,) + tuple(
                     self._type_of_field_index[index](ftr.GetField(index))
                     if ftr.GetField(index) is not None
                     else None
                     for index in field_indices
-                )
+                ))
+                if len(chunk) == self._ITER_DATA_CHUNK_SIZE:
+                    yield from self._convert_chunk(chunk, geom_type, simplify_tolerance)
+                    chunk = []
+            yield from self._convert_chunk(chunk, geom_type, simplify_tolerance)
 
         # Necessary to prevent the old swig bug
         # https://trac.osgeo.org/gdal/ticket/6749
@@ -92,17 +125,34 @@ class ABackGDALVector(ABackStoredVector):
         del clip_poly
         del mask_rect, mask_poly
 
-    @staticmethod
-    def iter_features_driver(slicing, mask_poly, mask_rect, lyr):
-        with contextlib.ExitStack() as stack:
-            stack.push(lambda *args, **kwargs: lyr.ResetReading())
-            if mask_poly is not None:
-                lyr.SetSpatialFilter(mask_poly)
-                stack.push(lambda *args, **kwargs: lyr.SetSpatialFilter(None))
-            elif mask_rect is not None:
-                lyr.SetSpatialFilterRect(*mask_rect)
-                stack.push(lambda *args, **kwargs: lyr.SetSpatialFilter(None))
+    _ITER_DATA_CHUNK_SIZE = 256
+
+    def _convert_chunk(self, chunk, geom_type, simplify_tolerance):
+        if geom_type is None:
+            for data in chunk:
+                yield data[1:]
+            return
+        geoms = self._geoms_of_wkbs([data[0] for data in chunk], 'shapely', simplify_tolerance)
+        for geom, data in zip(geoms, chunk):
+            if geom is None:
+                pass
+            elif geom_type == 'coordinates':
+                geom = sg.mapping(geom)['coordinates']
+            elif geom_type == 'geojson':
+                geom = sg.mapping(geom)
+            yield (geom,) + data[1:]
+
+    def fast_partitions(self, mask_poly, mask_rect, where):
+        # The partitions are reached with `SetNextByIndex`, that OGR otherwise implements by
+        # reading all the preceding features
+        if mask_poly is not None or mask_rect is not None or where is not None:
+            return False
+        with self.acquire_driver_object() as (_, lyr):
+            return bool(lyr.TestCapability(ogr.OLCFastSetNextByIndex))
 
+    @staticmethod
+    def iter_features_driver(slicing, filters, lyr):
+        with filters:
             start, stop, step = slicing.indices(len(lyr))
             indices = range(start, stop, step)
             ftr = None # Necessary to prevent the old swig bug
@@ -123,7 +173,293 @@ class ABackGDALVector(ABackStoredVector):
 
         # Necessary to prevent the old swig bug
         # https://trac.osgeo.org/gdal/ticket/6749
-        del slicing, mask_poly, mask_rect, ftr
+        del slicing, filters, ftr
+
+    @staticmethod
+    def iter_features_indexed(slicing, filters, lyr, fids, mask_poly):
+        """Same as `iter_features_driver`, the features being the candidates `fids` not disjoint
+        with `mask_poly`. Each candidate is read once by FID and tested with the same predicate as
+        the spatial filters of OGR."""
+        def _iter_matches():
+            ftr = None # Necessary to prevent the old swig bug
+            geom = None # Necessary to prevent the old swig bug
+            for fid in fids:
+                ftr = lyr.GetFeature(fid)
+                if ftr is None: # pragma: no cover
+                    raise IndexError('Feature of FID {} not found'.format(fid))
+                geom = ftr.GetGeometryRef()
+                if geom is not None and geom.Intersects(mask_poly):
+                    yield ftr
+
+            # Necessary to prevent the old swig bug
+            # https://trac.osgeo.org/gdal/ticket/6749
+            del geom
+            del ftr
+
+        with filters:
+            forward = (
+                (slicing.step is None or slicing.step > 0) and
+                (slicing.start is None or slicing.start >= 0) and
+                (slicing.stop is None or slicing.stop >= 0)
+            )
+            if forward:
+                yield from itertools.islice(
+                    _iter_matches(), slicing.start, slicing.stop, slicing.step,
+                )
+            else:
+                # The number of matches is needed to resolve the slice
+                yield from list(_iter_matches())[slicing]
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del slicing, filters
+
+    def _iter_features(self, slicing, lyr, fids, mask_poly, mask_rect, where, field_indices,
+                       read_geometry):
+        """Iterate over the features passing the filters. If `fids` is not None, those are the
+        candidates found in the spatial index maintained by buzzard, and the spatial filter is
+        performed by `iter_features_indexed` instead of the driver."""
+        if fids is None:
+            filters = self._layer_filters(
+                lyr, mask_poly, mask_rect, where, field_indices, read_geometry,
+            )
+            return self.iter_features_driver(slicing, filters, lyr)
+        # The geometries are read to be tested against the mask
+        filters = self._layer_filters(lyr, None, None, where, field_indices, True)
+        if mask_poly is None:
+            mask_poly = conv.ogr_of_shapely(sg.box(*mask_rect))
+        return self.iter_features_indexed(slicing, filters, lyr, fids, mask_poly)
+
+    def _spatial_index_fids(self, mask_poly, mask_rect, where):
+        """Find the candidate features of a read using a spatial index maintained by buzzard,
+        returns their sorted FIDs or None to let the driver filter the features"""
+        return None
+
+    @contextlib.contextmanager
+    def _layer_filters(self, lyr, mask_poly, mask_rect, where, field_indices, read_geometry):
+        """Push the filters of a read down to the driver, and reset them afterward
+
+        - The spatial filter with `SetSpatialFilter`
+        - The attribute filter with `SetAttributeFilter`
+        - The fields not read (and the geometry if not read) with `SetIgnoredFields`, except the
+          ones that may be used by `where`, and the geometry if there is a spatial filter. Some
+          drivers evaluate the filters on the features read, the ignored fields would be seen as
+          null.
+        """
+        with contextlib.ExitStack() as stack:
+            stack.push(lambda *args, **kwargs: lyr.ResetReading())
+            if mask_poly is not None:
+                lyr.SetSpatialFilter(mask_poly)
+                stack.push(lambda *args, **kwargs: lyr.SetSpatialFilter(None))
+            elif mask_rect is not None:
+                lyr.SetSpatialFilterRect(*mask_rect)
+                stack.push(lambda *args, **kwargs: lyr.SetSpatialFilter(None))
+
+            if where is not None:
+                err = lyr.SetAttributeFilter(where)
+                stack.push(lambda *args, **kwargs: lyr.SetAttributeFilter(None))
+                if err: # pragma: no cover
+                    raise ValueError('Could not set attribute filter `{}` ({})'.format(
+                        where, str(gdal.GetLastErrorMsg()).strip('\n')
+                    ))
+
+            read = set(field_indices)
+            used = self._identifiers_of_where(where)
+            ignored = [
+                field['name']
+                for i, field in enumerate(self.fields)
+                if i not in read and field['name'].lower() not in used
+            ]
+            # Some drivers also evaluate the spatial filter on the features read
+            spatial_filter = mask_poly is not None or mask_rect is not None
+            if not read_geometry and not spatial_filter and not any(
+                    name.startswith('ogr_geom') for name in used
+            ):
+                ignored.append('OGR_GEOMETRY')
+            if ignored and lyr.TestCapability(ogr.OLCIgnoreFields):
+                lyr.SetIgnoredFields(ignored)
+                stack.push(lambda *args, **kwargs: lyr.SetIgnoredFields([]))
+
+            yield
+
+    @staticmethod
+    def _identifiers_of_where(where):
+        """Lower-cased names of the fields that may be used by an attribute filter (quoted or
+        bare identifiers, case insensitive in OGR SQL)"""
+        if where is None:
+            return set()
+        # The string literals are skipped
+        where = re.sub(r"'(?:[^']|'')*'", "''", where)
+        return {
+            (quoted or bare).lower()
+            for quoted, bare in re.findall(r'"([^"]+)"|([A-Za-z_]\w*)', where)
+        }
+
+    # iter_batches implementation *************************************************************** **
+    def iter_batches(self, batch_size, geom_type, field_indices, mask_poly, mask_rect,
+                     where, simplify_tolerance):
+        fids = self._spatial_index_fids(mask_poly, mask_rect, where)
+        if mask_poly is not None:
+            mask_poly = conv.ogr_of_shapely(mask_poly)
+        fields = [self.fields[i] for i in field_indices]
+
+        with self.acquire_driver_object() as (_, lyr):
+            if fids is None and self._arrow_stream_supported(lyr, fields):
+                filters = self._layer_filters(
+                    lyr, mask_poly, mask_rect, where, field_indices, geom_type is not None,
+                )
+                gen = self._iter_raw_batches_arrow(
+                    batch_size, fields, filters, geom_type is not None, lyr
+                )
+            else:
+                features = self._iter_features(
+                    slice(0, None, 1), lyr, fids, mask_poly, mask_rect, where, field_indices,
+                    geom_type is not None,
+                )
+                gen = self._iter_raw_batches_features(
+                    batch_size, fields, field_indices, features, geom_type is not None
+                )
+            for wkbs, columns in gen:
+                if geom_type is None:
+                    yield columns
+                else:
+                    yield (self._geoms_of_wkbs(wkbs, geom_type, simplify_tolerance),) + columns
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del mask_rect, mask_poly
+
+    @staticmethod
+    def _arrow_stream_supported(lyr, fields):
+        """Is the Arrow stream of OGR (GDAL>=3.6) usable to read those fields. The other types of
+        fields are converted differently by the Arrow stream than by `GetField`."""
+        if not hasattr(lyr, 'GetArrowStreamAsNumPy'):
+            return False
+        if not lyr.TestCapability(ogr.OLCFastGetArrowStream):
+            return False
+        return all(
+            field['type'] in {'integer', 'integer64', 'real', 'string'}
+            for field in fields
+        )
+
+    def _iter_raw_batches_arrow(self, batch_size, fields, filters, read_geometry, lyr):
+        """Read batches using the columnar Arrow stream of OGR"""
+        geom_column = None
+        if read_geometry:
+            geom_column = lyr.GetGeometryColumn() or 'wkb_geometry'
+        with filters:
+            stream = lyr.GetArrowStreamAsNumPy(options=[
+                'MAX_FEATURES_IN_BATCH={}'.format(batch_size),
+                'INCLUDE_FID=NO',
+                'USE_MASKED_ARRAYS=YES',
+                'GEOMETRY_ENCODING=WKB',
+            ])
+            try:
+                yield from self._iter_arrow_stream(stream, geom_column, fields)
+            finally:
+                # The stream should be released before the layer is used again
+                del stream
+
+    @staticmethod
+    def _iter_arrow_stream(stream, geom_column, fields):
+        for batch in stream:
+            # The arrays of a batch are only valid until the next batch is requested, the numeric
+            # columns are copied and the string columns are decoded
+            columns = []
+            for field in fields:
+                col = batch[field['name']]
+                if field['type'] == 'string':
+                    mask = np.ma.getmaskarray(col).tolist()
+                    values = [
+                        None if masked else v.decode('utf-8') if isinstance(v, bytes) else v
+                        for v, masked in zip(np.ma.getdata(col).tolist(), mask)
+                    ]
+                    col = _tools.column_of_values(values, field['type'], field['nullable'])
+                else:
+                    col = _tools.column_of_array(col, field['type'], field['nullable'])
+                columns.append(col)
+            if geom_column is None:
+                wkbs = None
+            else:
+                wkbs = list(batch[geom_column])
+            yield wkbs, tuple(columns)
+
+    @staticmethod
+    def _iter_raw_batches_features(batch_size, fields, field_indices, features, read_geometry):
+        """Read batches feature by feature, without any per-feature conversion to shapely"""
+        def _batch():
+            return wkbs, tuple(
+                _tools.column_of_values(values, field['type'], field['nullable'])
+                for field, values in zip(fields, columns)
+            )
+
+        wkbs = []
+        columns = [[] for _ in field_indices]
+        ftr = None # Necessary to prevent the old swig bug
+        geom = None # Necessary to prevent the old swig bug
+        for ftr in features:
+            geom = ftr.GetGeometryRef() if read_geometry else None
+            if geom is None or geom.IsEmpty():
+                wkbs.append(None)
+            else:
+                wkbs.append(bytes(geom.ExportToWkb()))
+            for col, index in zip(columns, field_indices):
+                col.append(ftr.GetField(index))
+            if len(wkbs) == batch_size:
+                yield _batch()
+                wkbs = []
+                columns = [[] for _ in field_indices]
+        if wkbs:
+            yield _batch()
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del geom
+        del ftr
+
+    def _geoms_of_wkbs(self, wkbs, geom_type, simplify_tolerance=None):
+        """Convert a batch of WKB read from OGR to an array of geometries in work spatial
+        reference, optionally simplified"""
+        wkbs = [None if wkb is None else bytes(wkb) for wkb in wkbs]
+        if None in wkbs and not self.back_ds.allow_none_geometry: # pragma: no cover
+            raise Exception(
+                'None geometry in feature '
+                '(Set `allow_none_geometry=True` in Dataset constructor to silence)'
+            )
+        if geom_type == 'wkb' and not self.to_work and simplify_tolerance is None:
+            arr = np.empty(len(wkbs), dtype=object)
+            arr[:] = wkbs
+            return arr
+        geoms = _tools.shapely_of_wkbs(wkbs)
+        if self.to_work:
+            geoms = _tools.transform_geometries(geoms, self.to_work)
+        if simplify_tolerance is not None:
+            geoms = _tools.simplify_geometries(geoms, simplify_tolerance)
+        if geom_type == 'wkb':
+            geoms = _tools.wkbs_of_shapely(geoms)
+        return geoms
+
+    # rasterize implementation ***************************************************************** **
+    def rasterize(self, fp, field_index, all_touched):
+        if self.to_work:
+            # The geometries have to be reprojected by buzzard
+            return super(ABackGDALVector, self).rasterize(fp, field_index, all_touched)
+
+        if field_index is None:
+            attribute, where, field_indices = None, None, []
+        else:
+            attribute = self.fields[field_index]['name']
+            where = '"{}" IS NOT NULL'.format(attribute)
+            field_indices = [field_index]
+        mask_poly = conv.ogr_of_shapely(fp.poly)
+        with self.acquire_driver_object() as (_, lyr):
+            with self._layer_filters(lyr, mask_poly, None, where, field_indices, True):
+                res = self._rasterize_layer(fp, lyr, attribute, all_touched, self.wkt_stored)
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del mask_poly
+        return res
 
     # insert_data implementation **************************************************************** **
     def insert_data(self, geom, geom_type, fields, index):
@@ -165,6 +501,73 @@ class ABackGDALVector(ABackStoredVector):
                     err, str(gdal.GetLastErrorMsg()).strip('\n')
                 ))
 
+    # insert_many implementation **************************************************************** **
+    def insert_many(self, batch, validate):
+        wkbs = self._wkbs_of_geoms([geom for geom, _, _ in batch], [t for _, t, _ in batch])
+
+        ftr = None # Necessary to prevent the old swig bug
+        geom = None # Necessary to prevent the old swig bug
+        with self.acquire_driver_object() as (_, lyr):
+            defn = lyr.GetLayerDefn()
+            transaction = bool(lyr.TestCapability(ogr.OLCTransactions))
+            if transaction:
+                lyr.StartTransaction()
+            try:
+                for wkb, (_, _, fields) in zip(wkbs, batch):
+                    ftr = ogr.Feature(defn)
+                    if wkb is not None:
+                        geom = ogr.CreateGeometryFromWkb(wkb)
+                        if geom is None: # pragma: no cover
+                            raise ValueError('Could not convert geometry to `ogr.Geometry`')
+                        err = ftr.SetGeometry(geom)
+                        if err: # pragma: no cover
+                            raise ValueError('Could not set geometry (%s)' % str(gdal.GetLastErrorMsg()).strip('\n'))
+                    for i, field in enumerate(fields):
+                        if field is not None:
+                            err = ftr.SetField2(i, field)
+                            if err: # pragma: no cover
+                                raise ValueError('Could not set field #{} ({}) ({})'.format(
+                                    i, field, str(gdal.GetLastErrorMsg()).strip('\n')
+                                ))
+                    if validate and not ftr.Validate(ogr.F_VAL_ALL, True): # pragma: no cover
+                        raise ValueError('Invalid feature ({})'.format(
+                            str(gdal.GetLastErrorMsg()).strip('\n')
+                        ))
+                    err = lyr.CreateFeature(ftr)
+                    if err: # pragma: no cover
+                        raise ValueError('Could not create feature {} ({})'.format(
+                            err, str(gdal.GetLastErrorMsg()).strip('\n')
+                        ))
+            except BaseException:
+                if transaction:
+                    lyr.RollbackTransaction()
+                raise
+            else:
+                if transaction:
+                    err = lyr.CommitTransaction()
+                    if err: # pragma: no cover
+                        raise ValueError('Could not commit transaction {} ({})'.format(
+                            err, str(gdal.GetLastErrorMsg()).strip('\n')
+                        ))
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del geom
+        del ftr
+
+    def _wkbs_of_geoms(self, geoms, geom_types):
+        """Convert a batch of geometries to insert to WKB in virtual spatial reference"""
+        arr = np.empty(len(geoms), dtype=object)
+        arr[:] = [
+            sg.shape({'type': self.type, 'coordinates': geom})
+            if geom_type == 'coordinates' else
+            geom
+            for geom, geom_type in zip(geoms, geom_types)
+        ]
+        if self.to_virtual:
+            arr = _tools.transform_geometries(arr, self.to_virtual)
+        return _tools.wkbs_of_shapely(arr)
+
     def _ogr_of_geom(self, geom, geom_type):
         if geom_type is None:
             geom = geom
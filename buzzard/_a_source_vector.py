@@ -1,13 +1,17 @@
 import collections
+import functools
+import multiprocessing as mp
+import multiprocessing.pool
 import sys
 
 import shapely.geometry as sg
 import numpy as np
+from osgeo import gdal, ogr, osr
 
 from buzzard._a_source import ASource, ABackSource
 from buzzard import _tools
 from buzzard._footprint import Footprint
-from buzzard._tools import conv
+from buzzard._tools import conv, GDALErrorCatcher as Catch
 
 class ASourceVector(ASource):
     """Base abstract class defining the common behavior of all vectors.
@@ -66,8 +70,32 @@ class ASourceVector(ASource):
         """Return the number of features in vector"""
         return len(self._back)
 
+    def feature_count(self, mask=None, where=None):
+        """Count the features of the vector passing the filters
+
+        Parameters
+        ----------
+        mask: None or Footprint or shapely geometry or (nbr, nbr, nbr, nbr)
+            Add a spatial filter, see `iter_data`
+        where: None or str
+            Add an attribute filter, see `iter_data`
+
+        Returns
+        -------
+        int
+
+        Example
+        -------
+        >>> count = ds.roofs.feature_count(mask=fp, where='height > 10')
+
+        """
+        mask_poly, mask_rect = self._normalize_mask_parameter(mask)
+        where = self._normalize_where_parameter(where)
+        return self._back.feature_count(mask_poly, mask_rect, where)
+
     def iter_data(self, fields=None, geom_type='shapely',
-                  mask=None, clip=False, slicing=slice(0, None, 1)):
+                  mask=None, clip=False, slicing=slice(0, None, 1),
+                  where=None, simplify_tolerance=None, pool=None, chunks=None, ordered=True):
         """.. _vector file iter_data:
 
         Create an iterator over vector's features
@@ -82,8 +110,9 @@ class ASourceVector(ASource):
             - if string: Name of fields to include (separated by comma or space)
             - if sequence: List of indices / names to include
 
-        geom_type: {'shapely', 'coordinates'}
-            Returned geometry type
+        geom_type: {'shapely', 'coordinates', None}
+            Returned geometry type. If None, the geometries are not read and `feature` only
+            contains the fields.
         mask: None or Footprint or shapely geometry or (nbr, nbr, nbr, nbr)
             Add a spatial filter to iteration, only geometries not disjoint with mask will be \
             included.
@@ -106,23 +135,58 @@ class ASourceVector(ASource):
             - geometrycollection
 
         slicing: slice
-            Slice of the iteration to return. It is applied after spatial filtering
+            Slice of the iteration to return. It is applied after spatial and attribute filtering
+        where: None or str
+            Add an attribute filter to iteration, in the SQL WHERE clause syntax of OGR (like
+            `"volume > 10 AND type = 'wood'"`). It is evaluated by the driver.
+        simplify_tolerance: None or float
+            Simplify the geometries (preserving their topology), the tolerance being in work
+            spatial reference.
+        pool: None or multiprocessing.pool.Pool or multiprocessing.pool.ThreadPool or hashable
+            Pool used to read the features in parallel.
+
+            - if None: Read the features sequentially in the current thread
+            - if ThreadPool: Each partition is read through its own driver object. It is
+              limited by the `max_active_per_source` parameter of the Dataset.
+            - if Pool: Each partition is read by a process that opens the file again (only
+              supported for file vectors, the changes not yet flushed to disk are not seen).
+            - if hashable: A ThreadPool registered under that key in the Dataset, created if
+              missing.
+
+            The vectors that can't be read in parallel (like the `Memory` ones) are read
+            sequentially. So are the reads of OGR vectors using a `mask` or a `where` filter, or
+            using a driver that can't seek to a feature index efficiently (like `GeoJSON`): OGR
+            would read all the features preceding each partition.
+        chunks: None or int
+            Number of partitions of the features to read in parallel, defaults to 4 partitions per
+            cpu. Each partition is a range of feature indices, read in one go.
+        ordered: bool
+            If False, the features are yielded as soon as their partition is read, not in order.
 
         Yields
         ------
-        feature: geometry or (geometry,) or (geometry, *fields)
+        feature: geometry or (geometry,) or (geometry, *fields) or (*fields,)
             - If `geom_type` is 'shapely': geometry is a `shapely geometry`.
             - If `geom_type` is `coordinates`: geometry is a `nested lists of numpy arrays`.
             - If `fields` is not a sequence: `feature` is `geometry` or `(geometry, *fields)`, \
                  depending on the number of fields to yield.
             - If `fields` is a sequence or a string: `feature` is `(geometry,)` or \
                 `(geometry, *fields)`. Use `fields=[-1]` to get a monad containing all fields.
+            - If `geom_type` is None: `feature` is `(*fields,)`
+
+        The fields not requested (and the geometries if `geom_type` is None) are not read from the
+        driver when the driver supports it.
 
         Examples
         --------
         >>> for polygon, volume, stock_type in ds.stocks.iter_data('volume,type'):
                 print('area:{}m**2, volume:{}m**3'.format(polygon.area, volume))
 
+        >>> for volume, in ds.stocks.iter_data('volume', None, where="type = 'wood'"):
+                print('volume:{}m**3'.format(volume))
+
+        >>> areas = [polygon.area for polygon in ds.stocks.iter_data(pool='io', ordered=False)]
+
         >>> for polygon, in ds.stocks.iter_data([]):
                 print('area:{}m**2'.format(polygon.area))
 
@@ -137,8 +201,10 @@ class ASourceVector(ASource):
         del fields
 
         # Normalize and check geom_type parameter
-        if geom_type not in ['shapely', 'coordinates']: # pragma: no cover
+        if geom_type not in ['shapely', 'coordinates', None]: # pragma: no cover
             raise ValueError('Bad parameter `geom_type`')
+        if geom_type is None and not field_indices: # pragma: no cover
+            raise ValueError('`geom_type` is None but no fields are requested')
 
         # Normalize and check clip parameter
         clip = bool(clip)
@@ -156,8 +222,31 @@ class ASourceVector(ASource):
                 type(slicing),
             ))
 
-        for data in self._back.iter_data(geom_type, field_indices, slicing,
-                                         mask_poly, mask_rect, clip):
+        # Normalize and check where and simplify_tolerance parameters
+        where = self._normalize_where_parameter(where)
+        simplify_tolerance = self._normalize_simplify_tolerance_parameter(simplify_tolerance)
+
+        # Normalize and check pool, chunks and ordered parameters
+        pool = self._back.back_ds.pools_container._normalize_pool_parameter(pool, 'pool')
+        if chunks is None:
+            chunks = mp.cpu_count() * 4
+        chunks = int(chunks)
+        if chunks <= 0: # pragma: no cover
+            raise ValueError('`chunks` should be greater than 0')
+        ordered = bool(ordered)
+        if _tools.is_pool_worker_thread(pool):
+            # Waiting for tasks of `pool` from within one of its workers might deadlock
+            pool = None
+
+        if pool is None:
+            gen = self._back.iter_data(geom_type, field_indices, slicing,
+                                       mask_poly, mask_rect, clip, where, simplify_tolerance)
+        else:
+            gen = self._back.iter_data_parallel(pool, chunks, ordered,
+                                                geom_type, field_indices, slicing,
+                                                mask_poly, mask_rect, clip, where,
+                                                simplify_tolerance)
+        for data in gen:
             if is_flat:
                 assert len(data) == 1, len(data)
                 yield data[0]
@@ -172,6 +261,342 @@ class ASourceVector(ASource):
         else: # pragma: no cover
             raise IndexError('Feature `{}` not found'.format(index))
 
+    def iter_batches(self, batch_size=65536, fields=-1, geom_type='shapely', mask=None,
+                     where=None, simplify_tolerance=None):
+        """Create an iterator over vector's features, by batches of columns.
+
+        Much faster than `iter_data` on large vectors, the geometries and the fields are read in
+        bulk and returned as numpy arrays.
+
+        Parameters
+        ----------
+        batch_size: int
+            Maximum number of features per batch
+        fields: None or string or -1 or sequence of string/int
+            Which fields to include in iteration, see `iter_data`
+        geom_type: {'shapely', 'wkb', None}
+            Returned geometry type. If None, the geometries are not read and `batch` only contains
+            the fields.
+        mask: None or Footprint or shapely geometry or (nbr, nbr, nbr, nbr)
+            Add a spatial filter to iteration, see `iter_data`
+        where: None or str
+            Add an attribute filter to iteration, see `iter_data`
+        simplify_tolerance: None or float
+            Simplify the geometries, see `iter_data`
+
+        Yields
+        ------
+        batch: np.ndarray or (np.ndarray,) or (np.ndarray, *np.ndarray) or (*np.ndarray,)
+            - The geometries are an array of objects, containing either `shapely geometry` or
+              `bytes` (WKB), or None.
+            - The numeric fields are arrays of int32/int64/float64. If the field is nullable it is
+              a `np.ma.MaskedArray` where the null values are masked.
+            - The other fields are arrays of objects, with None for the null values.
+            - `fields` follows the same rules as in `iter_data` to choose between a geometry array
+              and a tuple of arrays.
+
+        Example
+        -------
+        >>> for polygons, volumes in ds.stocks.iter_batches(fields='volume'):
+                print('{} stocks, {}m**3'.format(len(polygons), volumes.sum()))
+
+        """
+        # Normalize and check batch_size parameter
+        batch_size = int(batch_size)
+        if batch_size <= 0: # pragma: no cover
+            raise ValueError('`batch_size` should be greater than 0')
+
+        # Normalize and check fields parameter
+        field_indices, is_flat = _tools.normalize_fields_parameter(
+            fields, self._back.index_of_field_name
+        )
+        del fields
+
+        # Normalize and check geom_type parameter
+        if geom_type not in ['shapely', 'wkb', None]: # pragma: no cover
+            raise ValueError('Bad parameter `geom_type`')
+        if geom_type is None and not field_indices: # pragma: no cover
+            raise ValueError('`geom_type` is None but no fields are requested')
+
+        # Normalize and check mask parameter
+        mask_poly, mask_rect = self._normalize_mask_parameter(mask)
+        del mask
+
+        # Normalize and check where and simplify_tolerance parameters
+        where = self._normalize_where_parameter(where)
+        simplify_tolerance = self._normalize_simplify_tolerance_parameter(simplify_tolerance)
+
+        for data in self._back.iter_batches(batch_size, geom_type, field_indices,
+                                            mask_poly, mask_rect, where, simplify_tolerance):
+            if is_flat:
+                assert len(data) == 1, len(data)
+                yield data[0]
+            else:
+                yield data
+
+    def get_table(self, fields=-1, geom_type='shapely', mask=None,
+                  where=None, simplify_tolerance=None):
+        """Read all the features of the vector at once, as columns. See ASourceVector.iter_batches
+
+        Example
+        -------
+        >>> polygons, volumes, stock_types = ds.stocks.get_table('volume,type')
+        >>> mean_volume = volumes[stock_types == 'wood'].mean()
+
+        >>> volumes, = ds.stocks.get_table('volume', None, where="type = 'wood'")
+
+        """
+        # Normalize and check fields parameter
+        field_indices, is_flat = _tools.normalize_fields_parameter(
+            fields, self._back.index_of_field_name
+        )
+        del fields
+
+        # Normalize and check geom_type parameter
+        if geom_type not in ['shapely', 'wkb', None]: # pragma: no cover
+            raise ValueError('Bad parameter `geom_type`')
+        if geom_type is None and not field_indices: # pragma: no cover
+            raise ValueError('`geom_type` is None but no fields are requested')
+
+        # Normalize and check mask parameter
+        mask_poly, mask_rect = self._normalize_mask_parameter(mask)
+        del mask
+
+        # Normalize and check where and simplify_tolerance parameters
+        where = self._normalize_where_parameter(where)
+        simplify_tolerance = self._normalize_simplify_tolerance_parameter(simplify_tolerance)
+
+        batches = list(self._back.iter_batches(
+            _BATCH_SIZE, geom_type, field_indices, mask_poly, mask_rect, where, simplify_tolerance,
+        ))
+        if geom_type is None:
+            batches = [(None,) + batch for batch in batches]
+        if batches:
+            geoms = None if geom_type is None else np.concatenate([batch[0] for batch in batches])
+            columns = [
+                _tools.concatenate_columns([batch[i] for batch in batches])
+                for i in range(1, len(field_indices) + 1)
+            ]
+        else:
+            geoms = np.empty(0, dtype=object)
+            columns = [
+                _tools.column_of_values([], self._back.fields[i]['type'], self._back.fields[i]['nullable'])
+                for i in field_indices
+            ]
+        del batches
+
+        if geom_type is None:
+            return tuple(columns)
+        if is_flat:
+            return geoms
+        return (geoms,) + tuple(columns)
+
+    def bucket_by_tiles(self, tiles, mask=None, where=None):
+        """Find the features intersecting each tile of a tiling, with a single scan of the vector.
+
+        Much faster than calling `iter_data(mask=tile)` for each tile, the geometries are read
+        once and indexed in an STRtree.
+
+        Parameters
+        ----------
+        tiles: FootprintGrid or array_like of Footprint or of shapely geometry
+            The tiles, of any shape (like the output of `Footprint.tile`)
+        mask: None or Footprint or shapely geometry or (nbr, nbr, nbr, nbr)
+            Add a spatial filter to the scan, see `iter_data`
+        where: None or str
+            Add an attribute filter to the scan, see `iter_data`
+
+        Returns
+        -------
+        np.ndarray of object of shape `tiles.shape`
+            For each tile, the sorted indices of the features not disjoint with the tile. Those
+            are the indices in the iteration order of `iter_data` (with the same `mask` and
+            `where`).
+
+        Example
+        -------
+        >>> tiles = fp.tile((512, 512))
+        >>> buckets = ds.roofs.bucket_by_tiles(tiles)
+        >>> polygons = ds.roofs.get_table(None)
+        >>> for tile, indices in zip(tiles.flat, buckets.flat):
+        ...     print(tile, [polygons[i].area for i in indices])
+
+        """
+        from buzzard._footprint_grid import FootprintGrid
+
+        if not isinstance(tiles, FootprintGrid):
+            tiles = np.asarray(tiles, dtype=object)
+        shape = tiles.shape
+        tiles = list(tiles.flat)
+        polys = np.empty(len(tiles), dtype=object)
+        for i, tile in enumerate(tiles):
+            if isinstance(tile, Footprint):
+                polys[i] = tile.poly
+            elif isinstance(tile, sg.base.BaseGeometry):
+                polys[i] = tile
+            else: # pragma: no cover
+                raise TypeError('`tiles` should contain Footprints or shapely geometries')
+
+        geoms = self.get_table(None, mask=mask, where=where)
+        pairs = _tools.query_geometries(geoms, polys, 'intersects')
+
+        buckets = np.empty(len(polys), dtype=object)
+        bounds = np.searchsorted(pairs[0], np.arange(len(polys) + 1))
+        for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+            buckets[i] = pairs[1, a:b]
+        return buckets.reshape(shape)
+
+    def sjoin(self, other, predicate='intersects', mask=None, other_mask=None):
+        """Spatial join between the features of two vectors, with a single scan of each vector.
+        The geometries of `other` are indexed in an STRtree.
+
+        Parameters
+        ----------
+        other: ASourceVector
+            A vector of a Dataset having the same work spatial reference
+        predicate: str
+            Name of a binary predicate of shapely (like 'intersects', 'within', 'contains',
+            'overlaps', 'touches', 'crosses', 'covers', 'covered_by'), evaluated as
+            `predicate(feature_of_self, feature_of_other)`
+        mask: None or Footprint or shapely geometry or (nbr, nbr, nbr, nbr)
+            Add a spatial filter to the scan of `self`, see `iter_data`
+        other_mask: None or Footprint or shapely geometry or (nbr, nbr, nbr, nbr)
+            Add a spatial filter to the scan of `other`, see `iter_data`
+
+        Returns
+        -------
+        np.ndarray of int of shape (2, n)
+            Sorted pairs of indices of features (in `self`, in `other`), in the iteration order
+            of `iter_data`
+
+        Example
+        -------
+        >>> roof_indices, parcel_indices = ds.roofs.sjoin(ds.parcels, 'within')
+
+        """
+        if not isinstance(other, ASourceVector): # pragma: no cover
+            raise TypeError('`other` should be a vector source')
+        if predicate not in _SJOIN_PREDICATES: # pragma: no cover
+            raise ValueError('Unknown predicate `{}`'.format(predicate))
+        wkt_work, other_wkt_work = self._back.back_ds.wkt_work, other._back.back_ds.wkt_work
+        if wkt_work != other_wkt_work and (
+                wkt_work is None or other_wkt_work is None or
+                not osr.SpatialReference(wkt_work).IsSame(osr.SpatialReference(other_wkt_work))
+        ):
+            # The geometries are read in the work spatial reference of their own Dataset
+            raise ValueError('`other` should belong to a Dataset with the same `sr_work`')
+        geoms = self.get_table(None, mask=mask)
+        other_geoms = other.get_table(None, mask=other_mask)
+        return _tools.query_geometries(other_geoms, geoms, predicate)
+
+    def rasterize(self, fp, field=None, all_touched=False, out=None):
+        """Burn the features of the vector in an image.
+
+        The features not disjoint with `fp` are read and rasterized by `gdal.RasterizeLayer`
+        directly from the layer of the driver when possible (without reprojection), without any
+        conversion of the geometries to shapely.
+
+        Parameters
+        ----------
+        fp: Footprint
+            Location of the image, in work spatial reference
+        field: None or str or int
+            - if None: Create a boolean mask of the features
+            - if str or int: Name or index of a numeric field, create an image of the values of
+              this field. The features having a null value are not burnt (a NaN value of a
+              real field is burnt). The values are rasterized as float64, the integer64 values
+              beyond 2**53 are not exact.
+        all_touched: bool
+            Burn all the pixels touched by the features, instead of the pixels having their
+            center inside a feature
+        out: None or np.ndarray of shape (fp.shape)
+            If provided, burn the features in this array instead of a new one and return it. The
+            pixels outside of the features are left unchanged.
+
+        Returns
+        -------
+        np.ndarray of shape (fp.shape)
+            of bool if `field` is None, of the dtype of the field otherwise (see `iter_batches`).
+            Where features overlap, the last one wins.
+
+        Example
+        -------
+        >>> mask = ds.buildings.rasterize(fp)
+        >>> heights = ds.buildings.rasterize(fp, 'height', out=np.full(fp.shape, np.nan))
+
+        """
+        if not isinstance(fp, Footprint): # pragma: no cover
+            raise TypeError('`fp` should be a Footprint')
+        field_index, dtype = self._normalize_rasterize_field_parameter(field)
+        all_touched = bool(all_touched)
+        out = fp._normalize_burn_out(out, dtype, False, 0)
+
+        arr, burnt = self._back.rasterize(fp, field_index, all_touched)
+        out[burnt] = arr[burnt]
+        return out
+
+    def acreate_rasterized_recipe(self, fp, cache_dir, field=None, all_touched=False,
+                                  computation_pool='cpu', cache_tiles=(512, 512), **kwargs):
+        """Create a cached raster recipe anonymously within the Dataset of this vector, whose pixels
+        are computed tile by tile with `rasterize`.
+
+        Parameters
+        ----------
+        fp: Footprint
+            Location of the raster, in work spatial reference
+        cache_dir: str or pathlib.Path
+            see :py:meth:`Dataset.create_cached_raster_recipe` method
+        field: None or str or int
+            see `rasterize`. If None, the raster is of dtype uint8 (with 0 and 1).
+        all_touched: bool
+            see `rasterize`
+        computation_pool:
+            see :py:meth:`Dataset.create_raster_recipe` method. It should be a thread pool (or
+            None). The vectors that can't be read from several threads at once (like the
+            `Memory` ones) are always rasterized in the scheduler's thread.
+        cache_tiles:
+            see :py:meth:`Dataset.create_cached_raster_recipe` method
+        **kwargs:
+            Other parameters of :py:meth:`Dataset.create_cached_raster_recipe` (like `ow`,
+            `io_pool` or `computation_tiles`)
+
+        Returns
+        -------
+        source: CachedRasterRecipe
+            ..
+
+        Example
+        -------
+        >>> heights = ds.buildings.acreate_rasterized_recipe(fp, '/tmp/heights', 'height')
+        >>> heights.get_data(fp=fp.intersection(roi))
+
+        """
+        if not isinstance(fp, Footprint): # pragma: no cover
+            raise TypeError('`fp` should be a Footprint')
+        field_index, dtype = self._normalize_rasterize_field_parameter(field)
+        all_touched = bool(all_touched)
+        if field_index is None:
+            dtype = np.dtype('uint8')
+
+        pool = self._back.back_ds.pools_container._normalize_pool_parameter(
+            computation_pool, 'computation_pool'
+        )
+        if pool is not None:
+            if not isinstance(pool, mp.pool.ThreadPool): # pragma: no cover
+                raise ValueError('`computation_pool` should be a ThreadPool or None')
+            if self._back.partition_reader(pool) is None:
+                pool = None
+
+        def _compute_array(fp, *_):
+            return self.rasterize(fp, field_index, all_touched).astype(dtype, copy=False)
+
+        return self._ds.acreate_cached_raster_recipe(
+            fp, dtype, 1, sr=self._back.back_ds.wkt_work,
+            compute_array=_compute_array, cache_dir=cache_dir,
+            computation_pool=pool, cache_tiles=cache_tiles,
+            **kwargs
+        )
+
     def iter_geojson(self, mask=None, clip=False, slicing=slice(0, None, 1)):
         """Create an iterator over vector's features
 
@@ -236,6 +661,8 @@ class ASourceVector(ASource):
             mask_poly,
             mask_rect,
             clip,
+            None,
+            None,
         )
         for data in gen:
             yield {
@@ -255,6 +682,39 @@ class ASourceVector(ASource):
         else: # pragma: no cover
             raise IndexError('Feature `{}` not found'.format(index))
 
+    def _normalize_rasterize_field_parameter(self, field):
+        """Returns the index of the field to burn (or None) and the dtype of the image"""
+        if field is None:
+            return None, np.dtype(bool)
+        field_indices, _ = _tools.normalize_fields_parameter([field], self._back.index_of_field_name)
+        if len(field_indices) != 1: # pragma: no cover
+            raise ValueError('`field` should designate a single field')
+        field_index, = field_indices
+        defn = self._back.fields[field_index]
+        dtype = np.asarray(_tools.column_of_values([], defn['type'], False)).dtype
+        if dtype == object: # pragma: no cover
+            raise TypeError('Field `{}` of type `{}` is not numeric'.format(
+                defn['name'], defn['type'],
+            ))
+        return field_index, dtype
+
+    @staticmethod
+    def _normalize_where_parameter(where):
+        if where is None:
+            return None
+        if not isinstance(where, str): # pragma: no cover
+            raise TypeError('`where` should be None or a string')
+        return where
+
+    @staticmethod
+    def _normalize_simplify_tolerance_parameter(simplify_tolerance):
+        if simplify_tolerance is None:
+            return None
+        simplify_tolerance = float(simplify_tolerance)
+        if not simplify_tolerance >= 0: # pragma: no cover
+            raise ValueError('`simplify_tolerance` should be positive')
+        return simplify_tolerance
+
     @staticmethod
     def _normalize_mask_parameter(mask):
         if isinstance(mask, sg.base.BaseGeometry):
@@ -315,9 +775,157 @@ class ABackSourceVector(ABackSource):
     def __len__(self): # pragma: no cover
         raise NotImplementedError('ABackSourceVector.__len__ is virtual pure')
 
-    def iter_data(self, geom_type, field_indices, slicing, mask_poly, mask_rect, clip): # pragma: no cover
+    def iter_data(self, geom_type, field_indices, slicing, mask_poly, mask_rect, clip,
+                  where, simplify_tolerance): # pragma: no cover
         raise NotImplementedError('ABackSourceVector.iter_data is virtual pure')
 
+    def iter_data_parallel(self, pool, chunks, ordered, geom_type, field_indices, slicing,
+                           mask_poly, mask_rect, clip, where, simplify_tolerance):
+        """Read the features by partitions of indices in `pool`"""
+        reader = self.partition_reader(pool)
+        if reader is None or not self.fast_partitions(mask_poly, mask_rect, where):
+            yield from self.iter_data(geom_type, field_indices, slicing,
+                                      mask_poly, mask_rect, clip, where, simplify_tolerance)
+            return
+
+        count = self.feature_count(mask_poly, mask_rect, where)
+        slices = _partition_slicing(slicing, count, chunks)
+        reader = functools.partial(
+            reader, (geom_type, field_indices, mask_poly, mask_rect, clip, where, simplify_tolerance),
+        )
+        imap = pool.imap if ordered else pool.imap_unordered
+        for partition in imap(reader, slices):
+            yield from partition
+
+    def partition_reader(self, pool):
+        """Get a function that reads a partition of the features in one of the workers of `pool`,
+        or None if this source can't be read in parallel in that pool.
+
+        The function takes the parameters of `iter_data` (without `slicing`) and a slice, and
+        returns a list of features.
+        """
+        return None
+
+    def fast_partitions(self, mask_poly, mask_rect, where):
+        """Can a partition of the features be reached without reading the features preceding
+        it"""
+        return True
+
+    def feature_count(self, mask_poly, mask_rect, where): # pragma: no cover
+        raise NotImplementedError('ABackSourceVector.feature_count is virtual pure')
+
+    def iter_batches(self, batch_size, geom_type, field_indices, mask_poly, mask_rect,
+                     where, simplify_tolerance): # pragma: no cover
+        raise NotImplementedError('ABackSourceVector.iter_batches is virtual pure')
+
+    def rasterize(self, fp, field_index, all_touched):
+        """Rasterize the features not disjoint with `fp`, returns an array of float64 of the
+        burnt values and an array of bool of the burnt pixels.
+
+        The geometries are read by batches in work spatial reference and copied to a temporary
+        OGR layer.
+        """
+        mask_poly, mask_rect = self._stored_mask_of_fp(fp)
+        field_indices = [] if field_index is None else [field_index]
+
+        ogr_ds = ogr.GetDriverByName('Memory').CreateDataSource('')
+        lyr = ogr_ds.CreateLayer('rasterize', srs=osr.SpatialReference(_RASTERIZE_WKT))
+        if field_index is not None:
+            lyr.CreateField(ogr.FieldDefn('val', ogr.OFTReal))
+        defn = lyr.GetLayerDefn()
+        ftr = None # Necessary to prevent the old swig bug
+        for batch in self.iter_batches(_BATCH_SIZE, 'wkb', field_indices, mask_poly, mask_rect,
+                                       None, None):
+            wkbs = batch[0]
+            values = [None] * len(wkbs) if field_index is None else batch[1].tolist()
+            for wkb, value in zip(wkbs, values):
+                if wkb is None or (field_index is not None and value is None):
+                    continue
+                ftr = ogr.Feature(defn)
+                ftr.SetGeometryDirectly(ogr.CreateGeometryFromWkb(bytes(wkb)))
+                if value is not None:
+                    ftr.SetField(0, float(value))
+                lyr.CreateFeature(ftr)
+
+        attribute = None if field_index is None else 'val'
+        res = self._rasterize_layer(fp, lyr, attribute, all_touched, _RASTERIZE_WKT)
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del ftr
+        del lyr
+        del ogr_ds
+        return res
+
+    def _stored_mask_of_fp(self, fp):
+        """Spatial filter of the features not disjoint with `fp`, in stored spatial reference"""
+        if not self.to_virtual:
+            return fp.poly, None
+        # The edges of `fp` are densified before the reprojection
+        ring = np.asarray(fp.poly.exterior.coords)
+        steps = np.linspace(0, 1, 17)[:, None]
+        xy = np.concatenate([a + (b - a) * steps for a, b in zip(ring[:-1], ring[1:])])
+        xy = np.asarray(self.to_virtual(xy))[:, :2]
+        minx, miny = xy.min(axis=0)
+        maxx, maxy = xy.max(axis=0)
+        return None, (minx, miny, maxx, maxy)
+
+    @staticmethod
+    def _rasterize_layer(fp, lyr, attribute, all_touched, wkt):
+        """Burn an OGR layer (with its filters) with `gdal.RasterizeLayer`. The values of
+        `attribute` are burnt in a first band, and the coverage of the features in a second one
+        (the values may be nan)."""
+        target_ds = gdal.GetDriverByName('MEM').Create(
+            '', int(fp.rsizex), int(fp.rsizey), 2, gdal.GDT_Float64
+        )
+        target_ds.SetGeoTransform(fp.gt)
+        if wkt is not None:
+            target_ds.SetProjection(wkt)
+
+        options = []
+        if all_touched:
+            options.append('ALL_TOUCHED=TRUE')
+        passes = [([2], [1], options)]
+        if attribute is not None:
+            passes.append(([1], [], options + ['ATTRIBUTE={}'.format(attribute)]))
+
+        for bands, burn_values, pass_options in passes:
+            success, payload = Catch(gdal.RasterizeLayer, nonzero_int_is_error=True)(
+                target_ds, bands, lyr, burn_values=burn_values, options=pass_options
+            )
+            if not success: # pragma: no cover
+                raise ValueError('Could not rasterize (gdal error: `{}`)'.format(payload[1]))
+        burnt = target_ds.GetRasterBand(2).ReadAsArray() != 0
+        if attribute is None:
+            arr = burnt.astype(np.float64)
+        else:
+            arr = target_ds.GetRasterBand(1).ReadAsArray()
+
+        # Necessary to prevent the old swig bug
+        # https://trac.osgeo.org/gdal/ticket/6749
+        del target_ds
+        return arr, burnt
+
+# Number of features read at once when a whole vector is read by batches
+_BATCH_SIZE = 65536
+
+_RASTERIZE_WKT = 'LOCAL_CS["arbitrary"]'
+
+_SJOIN_PREDICATES = {
+    'intersects', 'within', 'contains', 'overlaps', 'touches', 'crosses', 'covers', 'covered_by',
+}
+
+def _partition_slicing(slicing, count, chunks):
+    """Split a slice of the `count` features in at most `chunks` contiguous slices"""
+    indices = range(*slicing.indices(count))
+    bounds = np.unique(np.linspace(0, len(indices), chunks + 1).astype(int))
+    slices = []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        sub = indices[a:b]
+        stop = sub.stop if sub.stop >= 0 else None
+        slices.append(slice(sub.start, stop, sub.step))
+    return slices
+
 if sys.version_info < (3, 6):
     # https://www.python.org/dev/peps/pep-0487/
     for k, v in ASourceVector.__dict__.items():
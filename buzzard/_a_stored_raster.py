@@ -12,8 +12,73 @@ class AStoredRaster(AStored, ASourceRaster):
     Features Defined
     ----------------
     - Has a `set_data` method that allows to write pixels to storage
+    - Has an `iter_data` method that reads several rectangles of data with readahead
     """
 
+    def iter_data(self, fps, channels=None, dst_nodata=None, interpolation='cv_area',
+                  max_queue_size=5, io_pool=None, **kwargs):
+        """Read several rectangles of data on several channels from the source raster.
+
+        Using `iter_data` instead of multiple calls to `get_data` allows the reads to overlap with
+        the processing of the arrays on the caller's side. While an array is being used, the
+        next `max_queue_size` ones are read in `io_pool`. The reads are submitted to the pool in
+        the order of the blocks of the file, the arrays are still yielded in the same order as
+        in the `fps` parameter.
+
+        If you wish to cancel your request, loose the reference to the iterable. The reads already
+        submitted to the pool are not interrupted.
+
+        see rasters' `get_data` documentation, it shares most of the concepts
+
+        Parameters
+        ----------
+        fps: sequence of Footprint
+            The Footprints at which the raster should be sampled.
+        channels:
+            see `get_data` method
+        dst_nodata:
+            see `get_data` method
+        interpolation:
+            see `get_data` method
+        max_queue_size: int
+            Maximum number of arrays to read in advance.
+        io_pool: None or multiprocessing.pool.ThreadPool or hashable
+            Pool used to perform the reads.
+            If None: The `io_pool` of the raster is used if it has one, otherwise the arrays are
+            read on the calling thread when requested (no readahead).
+
+        Returns
+        -------
+        iterable: iterable of ndarray
+            The arrays are yielded into the generator in the same order as in the `fps` parameter.
+
+        Example
+        -------
+        >>> tiles = ds.ortho.fp.tile((512, 512)).flatten()
+        >>> for tile, arr in zip(tiles, ds.ortho.iter_data(tiles, io_pool='io')):
+        ...     process(tile, arr)
+
+        """
+        fps = list(fps)
+        for fp in fps:
+            if not isinstance(fp, Footprint):
+                raise ValueError('element of `fps` parameter should be a Footprint (not {})'.format(
+                    fp
+                )) # pragma: no cover
+
+        if io_pool is None:
+            io_pool = getattr(self._back, 'io_pool', None)
+        else:
+            io_pool = self._ds._normalize_io_pool_parameter(io_pool)
+
+        return self._back.iter_data(
+            fps=fps,
+            io_pool=io_pool,
+            **_tools.parse_queue_data_parameters(
+                'iter_data', self, channels, dst_nodata, interpolation, max_queue_size, **kwargs
+            )
+        )
+
     def set_data(self, array, fp=None, channels=None, interpolation='cv_area', mask=None, **kwargs):
         """.. _raster file set_data:
 
@@ -35,7 +100,10 @@ class AStoredRaster(AStored, ASourceRaster):
         The alpha bands are currently resampled like any other band, this behavior may change in
         the future.
 
-        This method is not thread-safe.
+        This method is not thread-safe, except on a `GDALFileRaster`. There, the remapping of
+        concurrent calls is performed in parallel and the calls touching the same blocks of the
+        file are written one after the other. Use the `NUM_THREADS` option of the GTiff driver to
+        also compress the blocks in parallel.
 
         Parameters
         ----------
@@ -157,7 +225,7 @@ class AStoredRaster(AStored, ASourceRaster):
     def fill(self, value, channels=None, **kwargs):
         """Fill raster with value.
 
-        This method is not thread-safe.
+        This method is not thread-safe, except on a `GDALFileRaster`.
 
         Parameters
         ----------
@@ -230,6 +298,44 @@ class AStoredRaster(AStored, ASourceRaster):
 class ABackStoredRaster(ABackStored, ABackSourceRaster):
     """Implementation of AStoredRaster's specifications"""
 
+    def iter_data(self, fps, channel_ids, dst_nodata, interpolation, max_queue_size, is_flat,
+                  io_pool):
+        def _get_data(fp):
+            array = self.get_data(fp, channel_ids, dst_nodata, interpolation)
+            if is_flat:
+                array = array.reshape(tuple(fp.shape))
+            return array
+
+        if io_pool is None:
+            return (_get_data(fp) for fp in fps)
+
+        def _iter_data_generator():
+            # Submit the reads by batches to be able to reorder them, a batch is submitted as soon
+            # as there is room for half of the queue.
+            batch_size = max(1, max_queue_size // 2)
+            futures = {}
+            next_idx = 0
+            for idx in range(len(fps)):
+                stop = min(len(fps), idx + max_queue_size)
+                if next_idx < stop and (stop - next_idx >= batch_size or
+                                        stop == len(fps) or next_idx == idx):
+                    indices = sorted(
+                        range(next_idx, stop),
+                        key=lambda i: self._block_order_key(fps[i]),
+                    )
+                    for i in indices:
+                        futures[i] = io_pool.apply_async(_get_data, (fps[i],))
+                    next_idx = stop
+                yield futures.pop(idx).get()
+
+        return _iter_data_generator()
+
+    def _block_order_key(self, fp):
+        """Sort key of the Footprints to read, following the blocks of the file"""
+        rtlx, rtly = self.fp.spatial_to_raster(fp.tl)
+        blockx, blocky = getattr(self, 'block_size', (self.fp.rsizex, 1))
+        return (rtly // blocky, rtlx // blockx, rtly, rtlx)
+
     def set_data(self, array, fp, channels, interpolation, mask, **kwargs): # pragma: no cover
         raise NotImplementedError('ABackStoredRaster.set_data is virtual pure')
 
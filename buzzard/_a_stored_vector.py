@@ -12,6 +12,7 @@ class AStoredVector(AStored, ASourceVector):
     Features Defined
     ----------------
     - Has an `insert_data` method that allows to write geometries to storage
+    - Has an `insert_many` method that allows to write many geometries to storage in bulk
     """
 
     def insert_data(self, geom, fields=(), index=-1):
@@ -49,20 +50,80 @@ class AStoredVector(AStored, ASourceVector):
         driver cache is flushed to disk, call `.close` or `.deactivate` on this Vector.
 
         """
+        geom_type = self._normalize_geom_value(geom)
+        fields = self._normalize_field_values(fields)
+        self._back.insert_data(geom, geom_type, fields, index)
+
+    def insert_many(self, features, batch_size=10000, validate=False):
+        """Insert many features in vector, in bulk.
+
+        Much faster than calling `insert_data` in a loop. The features are inserted by batches,
+        each batch within a transaction when the driver supports it (like GPKG or SQLite).
+
+        This method is not thread-safe.
+
+        Parameters
+        ----------
+        features: iterable of shapely.base.BaseGeometry or (geom, fields)
+            The features to append, either a geometry alone or a pair of a geometry and its fields,
+            see `insert_data`.
+        batch_size: int
+            Number of features per batch
+        validate: bool
+            Whether to check that each feature respects the constraints of the fields (like
+            nullable or width) before inserting it, as `insert_data` does.
+
+        Returns
+        -------
+        int
+            Number of features inserted
+
+        Example
+        -------
+        >>> polys = fp.find_polygons(mask)
+        >>> ds.zones.insert_many(polys)
+        >>> ds.stocks.insert_many(zip(polys, ({'volume': p.area * 2} for p in polys)))
+
+        """
+        # Normalize and check batch_size parameter
+        batch_size = int(batch_size)
+        if batch_size <= 0: # pragma: no cover
+            raise ValueError('`batch_size` should be greater than 0')
+        validate = bool(validate)
+
+        count = 0
+        batch = []
+        for feature in features:
+            if isinstance(feature, sg.base.BaseGeometry) or feature is None:
+                geom, fields = feature, ()
+            else:
+                geom, fields = feature
+            geom_type = self._normalize_geom_value(geom)
+            batch.append((geom, geom_type, self._normalize_field_values(fields)))
+            if len(batch) == batch_size:
+                self._back.insert_many(batch, validate)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._back.insert_many(batch, validate)
+            count += len(batch)
+        return count
+
+    def _normalize_geom_value(self, geom):
+        """Used on feature insertion, returns the type of `geom`"""
         if geom is None: # pragma: no cover
             if not self._back.back_ds.allow_none_geometry:
                 raise TypeError(
                     'Inserting None geometry not allowed '
                     '(Set `allow_none_geometry=True` in Dataset constructor to proceed)'
                 )
+            return None
         elif isinstance(geom, sg.base.BaseGeometry):
-            geom_type = 'shapely'
+            return 'shapely'
         elif isinstance(geom, collections.Iterable):
-            geom_type = 'coordinates'
+            return 'coordinates'
         else:
             raise TypeError('input `geom` should be a shapely geometry or nest coordinates')
-        fields = self._normalize_field_values(fields)
-        self._back.insert_data(geom, geom_type, fields, index)
 
     def _normalize_field_values(self, fields):
         """Used on feature insertion"""
@@ -101,3 +162,6 @@ class ABackStoredVector(ABackStored, ABackSourceVector):
 
     def insert_data(self, geom, geom_type, fields, index): # pragma: no cover
         raise NotImplementedError('ABackStoredVector.insert_data is virtual pure')
+
+    def insert_many(self, batch, validate): # pragma: no cover
+        raise NotImplementedError('ABackStoredVector.insert_many is virtual pure')
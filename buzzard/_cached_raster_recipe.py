@@ -4,10 +4,11 @@ import glob
 import os
 
 import numpy as np
-import rtree.index
 
 from buzzard._actors.message import Msg
 from buzzard._a_raster_recipe import ARasterRecipe, ABackRasterRecipe
+from buzzard._footprint_grid import FootprintGrid
+from buzzard._footprint_index import FootprintIndex
 
 from buzzard._actors.cached.cache_extractor import ActorCacheExtractor
 from buzzard._actors.cached.cache_supervisor import ActorCacheSupervisor
@@ -106,19 +107,30 @@ class BackCachedRasterRecipe(ABackRasterRecipe):
             max_resampling_size=max_resampling_size,
             debug_observers=debug_observers,
         )
+        # The actors work with Footprint objects, a FootprintGrid is only used to speed up the
+        # construction of the shortcuts below.
+        if isinstance(cache_tiles, FootprintGrid):
+            cache_grid = cache_tiles.rebase(self.fp)
+            cache_tiles = cache_grid.to_ndarray()
+        else:
+            cache_grid = FootprintGrid.of_footprints(self.fp, cache_tiles)
+        if isinstance(computation_tiles, FootprintGrid):
+            computation_tiles = computation_tiles.to_ndarray()
+
         self.io_pool = io_pool
         self.cache_fps = cache_tiles
         self.cache_dir = cache_dir
         self.overwrite = overwrite
 
         # Tilings shortcuts ****************************************************
-        self._cache_footprint_index = self._build_cache_fps_index(
-            cache_tiles,
-        )
+        self._cache_footprint_index = FootprintIndex(cache_grid)
+        self._cache_rtls = cache_grid.rtl
         self.cache_fps_of_compute_fp = {
-            compute_fp: self.cache_fps_of_fp(compute_fp)
+            compute_fp: []
             for compute_fp in computation_tiles.flat
         }
+        for i, j in self._cache_footprint_index.query_bulk(computation_tiles).T:
+            self.cache_fps_of_compute_fp[computation_tiles.flat[i]].append(self.cache_fps.flat[j])
         self.compute_fps_of_cache_fp = collections.defaultdict(list)
         for compute_fp, cache_fps in self.cache_fps_of_compute_fp.items():
             for cache_fp in cache_fps:
@@ -136,11 +148,9 @@ class BackCachedRasterRecipe(ABackRasterRecipe):
     # ******************************************************************************************* **
     def cache_fps_of_fp(self, fp):
         assert fp.same_grid(self.fp)
-        rtl = self.fp.spatial_to_raster(fp.tl, dtype=float)
-        bounds = np.r_[rtl, rtl + fp.rsize]
         return [
             self.cache_fps.flat[i]
-            for i in list(self._cache_footprint_index.intersection(bounds))
+            for i in self._cache_footprint_index.query(fp)
         ]
 
     def fname_prefix_of_cache_fp(self, cache_fp):
@@ -148,7 +158,7 @@ class BackCachedRasterRecipe(ABackRasterRecipe):
         params = np.r_[
             x,
             y,
-            self.fp.spatial_to_raster(cache_fp.tl),
+            self._cache_rtls[y, x],
         ]
         return "buzz_x{:03d}-y{:03d}_x{:05d}-y{:05d}".format(*params)
 
@@ -185,18 +195,3 @@ class BackCachedRasterRecipe(ABackRasterRecipe):
         for a in actors:
             self.debug_mngr.event('object_allocated', a)
         return actors
-
-    # ******************************************************************************************* **
-    def _build_cache_fps_index(self, cache_fps):
-        idx = rtree.index.Index()
-        bounds_inset = np.asarray([
-            + 1 / 4,
-            + 1 / 4,
-            - 1 / 4,
-            - 1 / 4,
-        ])
-        for i, fp in enumerate(cache_fps.flat):
-            rtl = self.fp.spatial_to_raster(fp.tl, dtype=float)
-            bounds = np.r_[rtl, rtl + fp.rsize] + bounds_inset
-            idx.insert(i, bounds)
-        return idx
@@ -2,10 +2,14 @@
 
 # pylint: disable=too-many-lines
 import sys
+import glob
 import pathlib
 import itertools
+import numbers
 from types import MappingProxyType
 import os
+import multiprocessing as mp
+import multiprocessing.pool
 
 from osgeo import osr
 import numpy as np
@@ -14,16 +18,20 @@ from buzzard._tools import conv, deprecation_pool
 from buzzard._tools import GDALErrorCatcher as Catch
 
 from buzzard._footprint import Footprint
+from buzzard._footprint_grid import FootprintGrid
 from buzzard import _tools
 from buzzard._dataset_back import BackDataset
 from buzzard._a_source import ASource
 from buzzard._gdal_file_raster import GDALFileRaster, BackGDALFileRaster
+from buzzard._gdal_mosaic_raster import GDALMosaicRaster
 from buzzard._gdal_file_vector import GDALFileVector, BackGDALFileVector
 from buzzard._gdal_mem_raster import GDALMemRaster
 from buzzard._gdal_memory_vector import GDALMemoryVector
 from buzzard._dataset_register import DatasetRegisterMixin
 from buzzard._numpy_raster import NumpyRaster
+from buzzard._memory_vector import MemoryVector
 from buzzard._cached_raster_recipe import CachedRasterRecipe
+from buzzard._headers_cache import HeadersCache
 from buzzard._a_pooled_emissary import APooledEmissary
 import buzzard.utils
 
@@ -50,6 +58,7 @@ class Dataset(DatasetRegisterMixin):
     - :doc:`source_cached_raster_recipe`
     - :doc:`source_gdal_file_vector`
     - :doc:`source_gdal_memory_vector`
+    - :doc:`source_memory_vector`
 
     .. warning::
         This class is not equivalent to the `gdal.Dataset` class.
@@ -75,7 +84,8 @@ class Dataset(DatasetRegisterMixin):
         Whether or not to perform a basic analysis on two `sr` to check their compatibility.
 
         if True: Read the `buzz.env.significant` variable and raise an exception if a spatial
-        reference conversions is too lossy in precision.
+        reference conversions is too lossy in precision. The analyses are memoized per spatial
+        reference and per source extent.
 
         if False: Skip all checks.
 
@@ -88,6 +98,20 @@ class Dataset(DatasetRegisterMixin):
     max_active: nbr >= 1
         Maximum number of pooled sources active at the same time.
         (see :ref:`Sources activation / deactivation` below)
+    max_active_per_source: nbr >= 1
+        Maximum number of driver objects active at the same time for a single pooled source.
+        (see :ref:`Sources activation / deactivation` below)
+    active_timeout: None or nbr >= 0
+        Number of seconds to wait for a driver object to be released when `max_active` or
+        `max_active_per_source` is reached, before raising an exception.
+        If `0` (default), raise immediately. If `None`, wait forever.
+    headers_cache: None or path
+        Path to a json file where the headers of the files opened with `lazy=True` are persisted.
+        The file is read on construction if it exists, and written when the Dataset is closed.
+        (see :ref:`Lazy opening` below)
+    auto_spatial_index: bool
+        Whether or not the spatial index of a vector file should be built on the first read using
+        a `mask` (see `GDALFileVector.build_spatial_index`).
     debug_observers: sequence of object
         Entry points to observe what is happening in the Dataset's sheduler.
 
@@ -172,7 +196,31 @@ class Dataset(DatasetRegisterMixin):
     Those sources are automatically activated and deactivated given the current needs and
     constraints. Setting a `max_active` lower than `np.inf` in the Dataset constructor will
     ensure that no more than `max_active` driver objects are active at the same time, by
-    deactivating the LRU ones.
+    deactivating the LRU ones. Setting a `max_active_per_source` lower than `np.inf` limits the
+    number of driver objects that a single source may use concurrently.
+
+    When no driver object can be deactivated to make room (i.e. they are all being used), an
+    exception is raised, unless `active_timeout` allows to wait for one to be released.
+
+    The `activation_stats` property gives the number of driver objects reused (`hits`),
+    allocated (`allocations`), deactivated to make room (`evictions`), and the number of
+    acquisitions that had to wait (`waits`).
+
+    .. _Lazy opening:
+    Lazy opening
+    ------------
+
+    By default `open_raster` and `open_vector` open the file right away to read its metadata, the
+    driver object is then kept active for future uses. With `lazy=True` the metadata are read
+    with a temporary driver object (or taken from the `headers_cache`), and the driver object
+    of the source is only allocated on its first use.
+
+    To open a large number of files, the :py:meth:`Dataset.preload_raster_headers` and
+    :py:meth:`Dataset.preload_vector_headers` methods read the metadata in parallel beforehand.
+
+    >>> ds = buzz.Dataset(headers_cache='/path/to/headers.json')
+    ... ds.preload_raster_headers(paths)
+    ... tiles = [ds.aopen_raster(path, lazy=True) for path in paths]
 
     .. _On the fly re-projections in buzzard:
     On the fly re-projections in buzzard
@@ -301,6 +349,10 @@ class Dataset(DatasetRegisterMixin):
                  allow_none_geometry=False,
                  allow_interpolation=False,
                  max_active=np.inf,
+                 max_active_per_source=np.inf,
+                 active_timeout=0,
+                 headers_cache=None,
+                 auto_spatial_index=False,
                  debug_observers=(),
                  **kwargs):
         sr_fallback, kwargs = deprecation_pool.handle_param_renaming_with_kwargs(
@@ -369,8 +421,16 @@ class Dataset(DatasetRegisterMixin):
 
         if max_active < 1: # pragma: no cover
             raise ValueError('`max_active` should be greater than 1')
+        if max_active_per_source < 1: # pragma: no cover
+            raise ValueError('`max_active_per_source` should be greater than 1')
+        if active_timeout is not None and active_timeout < 0: # pragma: no cover
+            raise ValueError('`active_timeout` should be None or greater than 0')
+
+        if headers_cache is not None:
+            headers_cache = str(headers_cache)
 
         allow_interpolation = bool(allow_interpolation)
+        auto_spatial_index = bool(auto_spatial_index)
         allow_none_geometry = bool(allow_none_geometry)
         analyse_transformation = bool(analyse_transformation)
         self._ds_closed = False
@@ -382,13 +442,18 @@ class Dataset(DatasetRegisterMixin):
             allow_none_geometry=allow_none_geometry,
             allow_interpolation=allow_interpolation,
             max_active=max_active,
+            max_active_per_source=max_active_per_source,
+            active_timeout=active_timeout,
+            headers_cache=headers_cache,
+            auto_spatial_index=auto_spatial_index,
             ds_id=id(self),
             debug_observers=debug_observers,
         )
         super(Dataset, self).__init__()
 
     # Raster entry points *********************************************************************** **
-    def open_raster(self, key, path, driver='GTiff', options=(), mode='r'):
+    def open_raster(self, key, path, driver='GTiff', options=(), mode='r', io_pool=None,
+                    lazy=False, async_writes=False):
         """Open a raster file within this Dataset under `key`. Only metadata are kept in memory.
 
         >>> help(GDALFileRaster)
@@ -408,6 +473,35 @@ class Dataset(DatasetRegisterMixin):
             options for gdal
         mode: one of {'r', 'w'}
             ..
+        io_pool: None or multiprocessing.pool.ThreadPool or hashable
+            Pool used to read large windows in parallel.
+
+            - If `None`, the reads are performed on the calling thread.
+            - If hashable, the pool with this alias is used (or created) within this Dataset.
+
+            When a `get_data` covers more than ~1M pixels, the window is split along the blocks
+            of the file and each part is read with its own driver object. Each part holds a
+            driver object while it is being read, so `max_active` should leave room for them
+            (or `active_timeout` should allow to wait for them).
+            Don't call `get_data` from within a task of that same pool, or all its threads
+            might end up waiting for each other.
+        lazy: bool
+            If False, the file is opened right away and the driver object is kept active.
+            If True, the metadata are read with a temporary driver object, or taken from the
+            headers cache of the Dataset, and no driver object is allocated until the first use.
+            (see :ref:`Lazy opening`)
+        async_writes: bool or int
+            Only with `mode='w'`. If True or a number of bytes, `set_data` returns as soon as the
+            array is copied and the write is performed later in `io_pool` (which is then
+            mandatory).
+
+            - At most that many bytes of writes are pending (256MB with True), `set_data` blocks
+              beyond that.
+            - The pending writes are performed in order, the ones adjacent on the grid of the
+              raster are merged.
+            - Use :py:meth:`GDALFileRaster.flush` to wait for them. `close`, `get_data` and `fill`
+              do it too.
+            - The error of a failed write is raised by the next `set_data` or `flush`.
 
         Returns
         -------
@@ -433,6 +527,9 @@ class Dataset(DatasetRegisterMixin):
         driver = str(driver)
         options = [str(arg) for arg in options]
         _ = conv.of_of_mode(mode)
+        io_pool = self._normalize_io_pool_parameter(io_pool)
+        lazy = bool(lazy)
+        async_writes = self._normalize_async_writes_parameter(async_writes, io_pool, mode)
 
         # Construction dispatch ************************************************
         if driver.lower() == 'mem': # pragma: no cover
@@ -441,7 +538,12 @@ class Dataset(DatasetRegisterMixin):
             allocator = lambda: BackGDALFileRaster.open_file(
                 path, driver, options, mode
             )
-            prox = GDALFileRaster(self, allocator, options, mode)
+            header = None
+            if lazy:
+                header = self._raster_header(path, driver, options)
+            prox = GDALFileRaster(
+                self, allocator, options, mode, io_pool, header, async_writes,
+            )
         else:
             pass
 
@@ -452,7 +554,8 @@ class Dataset(DatasetRegisterMixin):
             self._register([], prox)
         return prox
 
-    def aopen_raster(self, path, driver='GTiff', options=(), mode='r'):
+    def aopen_raster(self, path, driver='GTiff', options=(), mode='r', io_pool=None,
+                     lazy=False, async_writes=False):
         """Open a raster file anonymously within this Dataset. Only metadata are kept in memory.
 
         See :py:meth:`~Dataset.open_raster`
@@ -468,10 +571,111 @@ class Dataset(DatasetRegisterMixin):
         - :py:func:`buzzard.open_raster`: To skip the explicit `Dataset` instanciation
 
         """
-        return self.open_raster(_AnonymousSentry(), path, driver, options, mode)
+        return self.open_raster(
+            _AnonymousSentry(), path, driver, options, mode, io_pool, lazy, async_writes,
+        )
+
+    def open_raster_mosaic(self, key, paths, driver='GTiff', options=(), io_pool='io'):
+        """Open many raster files lying on the same grid as a single read-only raster source
+        within this Dataset under `key`. Only metadata are kept in memory.
+
+        The files are indexed with an rtree, a `get_data` only reads the files intersecting the
+        requested Footprint. No driver object is allocated before the first read.
+
+        >>> help(GDALMosaicRaster)
+
+        Parameters
+        ----------
+        key: hashable (like a string)
+            File identifier within Dataset
+
+            To avoid using a `key`, you may use :py:meth:`aopen_raster_mosaic`
+        paths: string or sequence of string
+            If string: A glob pattern
+            If sequence: The paths to the files. Where files overlap, the last one wins.
+        driver: string
+            see :py:meth:`Dataset.open_raster` method
+        options: sequence of str
+            see :py:meth:`Dataset.open_raster` method
+        io_pool: None or multiprocessing.pool.ThreadPool or hashable
+            Pool used to read the headers and the intersecting files in parallel.
+            If `None`, the files are read sequentially on the calling thread.
+
+        Returns
+        -------
+        source: GDALMosaicRaster
+            ..
+
+        Example
+        -------
+        >>> ds.open_raster_mosaic('ortho', '/path/to/tiles/*.tif')
+        >>> array = ds.ortho.get_data(fp)
+
+        Caveat
+        ------
+        All the files should have the same spatial reference, dtype and number of channels. The
+        nodata values of the mosaic are the ones of the first file, the nodata pixels of the other
+        files are converted.
+
+        See Also
+        --------
+        - :py:meth:`Dataset.aopen_raster_mosaic`: To skip the `key` assigment
+
+        """
+        # Parameter checking ***************************************************
+        if isinstance(paths, (str, pathlib.Path)):
+            paths = sorted(glob.glob(str(paths)))
+        else:
+            paths = [str(path) for path in paths]
+        if len(paths) == 0:
+            raise ValueError('No file to open in the mosaic')
+        driver = str(driver)
+        options = [str(arg) for arg in options]
+        io_pool = self._normalize_io_pool_parameter(io_pool)
+
+        # Headers reading ******************************************************
+        self._preload_headers(
+            'raster', BackGDALFileRaster.read_header,
+            [(path, driver, options) for path in paths],
+            io_pool,
+        )
+        headers = [
+            self._raster_header(path, driver, options)
+            for path in paths
+        ]
+        self._preload_transforms('raster', headers)
+
+        # Construction *********************************************************
+        prox = GDALMosaicRaster(self, headers, options, io_pool)
+
+        # Dataset Registering ***********************************************
+        if not isinstance(key, _AnonymousSentry):
+            self._register([key], prox)
+        else:
+            self._register([], prox)
+        return prox
+
+    def aopen_raster_mosaic(self, paths, driver='GTiff', options=(), io_pool='io'):
+        """Open many raster files anonymously as a single read-only raster source within this
+        Dataset. Only metadata are kept in memory.
+
+        See :py:meth:`~Dataset.open_raster_mosaic`
+
+        Example
+        -------
+        >>> ortho = ds.aopen_raster_mosaic('/path/to/tiles/*.tif')
+        >>> tile_count = len(ortho.paths)
+
+        See Also
+        --------
+        - :py:meth:`Dataset.open_raster_mosaic`: To assign a `key` to this source within the `Dataset`
+
+        """
+        return self.open_raster_mosaic(_AnonymousSentry(), paths, driver, options, io_pool)
 
     def create_raster(self, key, path, fp, dtype, channel_count, channels_schema=None,
-                      driver='GTiff', options=(), sr=None, ow=False, **kwargs):
+                      driver='GTiff', options=(), sr=None, ow=False, io_pool=None,
+                      async_writes=False, **kwargs):
         """Create a raster file and register it under `key` within this Dataset. Only metadata are
         kept in memory.
 
@@ -515,6 +719,10 @@ class Dataset(DatasetRegisterMixin):
             <https://gdal.org/doxygen/classOGRSpatialReference.html#aec3c6a49533fe457ddc763d699ff8796>`_.
         ow: bool
             Overwrite. Whether or not to erase the existing files.
+        io_pool: None or multiprocessing.pool.ThreadPool or hashable
+            see :py:meth:`Dataset.open_raster` method (ignored with `driver=MEM`)
+        async_writes: bool or int
+            see :py:meth:`Dataset.open_raster` method (ignored with `driver=MEM`)
 
         Returns
         -------
@@ -585,6 +793,9 @@ class Dataset(DatasetRegisterMixin):
         channels_schema = _tools.sanitize_channels_schema(channels_schema, channel_count)
         driver = str(driver)
         options = [str(arg) for arg in options]
+        io_pool = self._normalize_io_pool_parameter(io_pool)
+        if driver.lower() != 'mem':
+            async_writes = self._normalize_async_writes_parameter(async_writes, io_pool, 'w')
 
         if sr is not None:
             success, payload = Catch(osr.GetUserInputAsWKT, nonzero_int_is_error=True)(sr)
@@ -610,7 +821,7 @@ class Dataset(DatasetRegisterMixin):
             allocator = lambda: BackGDALFileRaster.create_file(
                 path, fp, dtype, channel_count, channels_schema, driver, options, wkt, ow,
             )
-            prox = GDALFileRaster(self, allocator, options, 'w')
+            prox = GDALFileRaster(self, allocator, options, 'w', io_pool, None, async_writes)
         else:
             pass
 
@@ -622,7 +833,8 @@ class Dataset(DatasetRegisterMixin):
         return prox
 
     def acreate_raster(self, path, fp, dtype, channel_count, channels_schema=None,
-                       driver='GTiff', options=(), sr=None, ow=False, **kwargs):
+                       driver='GTiff', options=(), sr=None, ow=False, io_pool=None,
+                       async_writes=False, **kwargs):
         """Create a raster file anonymously within this Dataset. Only metadata are kept in memory.
 
         See :py:meth:`~Dataset.create_raster`
@@ -646,7 +858,7 @@ class Dataset(DatasetRegisterMixin):
 
         """
         return self.create_raster(_AnonymousSentry(), path, fp, dtype, channel_count, channels_schema,
-                                  driver, options, sr, ow, **kwargs)
+                                  driver, options, sr, ow, io_pool, async_writes, **kwargs)
 
     def wrap_numpy_raster(self, key, fp, array, channels_schema=None, sr=None, mode='w', **kwargs):
         """Register a numpy array as a raster under `key` within this Dataset.
@@ -1089,11 +1301,14 @@ class Dataset(DatasetRegisterMixin):
             see :py:meth:`Dataset.create_raster_recipe` method
         resample_pool:
             see :py:meth:`Dataset.create_raster_recipe` method
-        cache_tiles: (int, int) or numpy.ndarray of Footprint
+        cache_tiles: (int, int) or numpy.ndarray of Footprint or FootprintGrid
             A tiling of the `fp` parameter. Each tile will correspond to one cache file.
-            if (int, int): Construct the tiling by calling Footprint.tile with this parameter
+            if (int, int): Construct the tiling by calling Footprint.tile_grid with this parameter
+            A FootprintGrid (see `Footprint.tile_grid`) is much cheaper to check than an array
+            of Footprint for tilings of many tiles.
         computation_tiles:
             if None: Use the same tiling as `cache_tiles`
+            if FootprintGrid: A tiling covering the `fp` parameter
             else: see `create_raster_recipe` method
         max_resampling_size: None or int or (int, int)
             see :py:meth:`Dataset.create_raster_recipe` method
@@ -1191,7 +1406,8 @@ class Dataset(DatasetRegisterMixin):
         )
 
         # Tilings ******************************************
-        if isinstance(cache_tiles, np.ndarray) and cache_tiles.dtype == np.object:
+        if (isinstance(cache_tiles, FootprintGrid) or
+                isinstance(cache_tiles, np.ndarray) and cache_tiles.dtype == np.object):
             if not _tools.is_tiling_covering_fp(
                     cache_tiles, fp,
                     allow_outer_pixels=False, allow_overlapping_pixels=False,
@@ -1200,12 +1416,13 @@ class Dataset(DatasetRegisterMixin):
                                 "without overlap, with `boundary_effect='shrink'`"
                 )
         else:
-            # Defer the parameter checking to fp.tile
-            cache_tiles = fp.tile(cache_tiles, 0, 0, boundary_effect='shrink')
+            # Defer the parameter checking to fp.tile_grid
+            cache_tiles = fp.tile_grid(cache_tiles, 0, 0, boundary_effect='shrink')
 
         if computation_tiles is None:
             computation_tiles = cache_tiles
-        elif isinstance(computation_tiles, np.ndarray) and computation_tiles.dtype == np.object:
+        elif (isinstance(computation_tiles, FootprintGrid) or
+              isinstance(computation_tiles, np.ndarray) and computation_tiles.dtype == np.object):
             if not _tools.is_tiling_covering_fp(
                     cache_tiles, fp,
                     allow_outer_pixels=True, allow_overlapping_pixels=True,
@@ -1293,7 +1510,8 @@ class Dataset(DatasetRegisterMixin):
         )
 
     # Vector entry points *********************************************************************** **
-    def open_vector(self, key, path, layer=None, driver='ESRI Shapefile', options=(), mode='r'):
+    def open_vector(self, key, path, layer=None, driver='ESRI Shapefile', options=(), mode='r',
+                    lazy=False):
         """Open a vector file within this Dataset under `key`. Only metadata are kept in memory.
 
         >>> help(GDALFileVector)
@@ -1315,6 +1533,8 @@ class Dataset(DatasetRegisterMixin):
             options for ogr
         mode: one of {'r', 'w'}
             ..
+        lazy: bool
+            see :py:meth:`Dataset.open_raster` method
 
         Returns
         -------
@@ -1337,15 +1557,11 @@ class Dataset(DatasetRegisterMixin):
         """
         # Parameter checking ***************************************************
         path = str(path)
-        if layer is None:
-            layer = 0
-        elif np.all(np.isreal(layer)):
-            layer = int(layer)
-        else:
-            layer = str(layer)
+        layer = self._normalize_layer_parameter(layer)
         driver = str(driver)
         options = [str(arg) for arg in options]
         _ = conv.of_of_mode(mode)
+        lazy = bool(lazy)
 
         # Construction dispatch ************************************************
         if driver.lower() == 'memory': # pragma: no cover
@@ -1354,7 +1570,10 @@ class Dataset(DatasetRegisterMixin):
             allocator = lambda: BackGDALFileVector.open_file(
                 path, layer, driver, options, mode
             )
-            prox = GDALFileVector(self, allocator, options, mode)
+            header = None
+            if lazy:
+                header = self._vector_header(path, layer, driver, options)
+            prox = GDALFileVector(self, allocator, options, mode, header)
         else:
             pass
 
@@ -1365,7 +1584,8 @@ class Dataset(DatasetRegisterMixin):
             self._register([], prox)
         return prox
 
-    def aopen_vector(self, path, layer=None, driver='ESRI Shapefile', options=(), mode='r'):
+    def aopen_vector(self, path, layer=None, driver='ESRI Shapefile', options=(), mode='r',
+                     lazy=False):
         """Open a vector file anonymously within this Dataset. Only metadata are kept in memory.
 
         See :py:meth:`~Dataset.open_vector`
@@ -1381,7 +1601,7 @@ class Dataset(DatasetRegisterMixin):
         - :py:func:`buzzard.open_vector`: To skip the `key` assigment and the explicit `Dataset` instanciation
 
         """
-        return self.open_vector(_AnonymousSentry(), path, layer, driver, options, mode)
+        return self.open_vector(_AnonymousSentry(), path, layer, driver, options, mode, lazy)
 
     def create_vector(self, key, path, type, fields=(), layer=None,
                       driver='ESRI Shapefile', options=(), sr=None, ow=False):
@@ -1561,6 +1781,222 @@ class Dataset(DatasetRegisterMixin):
         return self.create_vector(_AnonymousSentry(), path, type, fields, layer,
                                   driver, options, sr, ow)
 
+    def create_memory_vector(self, key, type, fields=(), sr=None):
+        """Create an empty vector stored in memory as numpy arrays and register it under `key`
+        within this Dataset.
+
+        >>> help(MemoryVector)
+
+        Much faster than a vector using the OGR `Memory` driver, the features are not converted
+        to OGR features and the spatial filters use an STRtree. It is best suited for the
+        intermediate results of a computation. The `where` filters of the read methods are not
+        supported.
+
+        Parameters
+        ----------
+        key: hashable (like a string)
+            File identifier within Dataset
+
+            To avoid using a `key`, you may use :py:meth:`acreate_memory_vector`
+        type: string
+            name of a wkb geometry type, without the `wkb` prefix. For example: "Point", "Polygon", "LineString".
+        fields: sequence of dict
+            Attributes of fields, one dict per field. (see :py:meth:`Dataset.create_vector`)
+        sr: string or None
+            Spatial reference of the new vector
+
+            In order not to set a spatial reference, use `None`.
+
+            In order to set a spatial reference, use a string that can be `converted to WKT by GDAL
+            <https://gdal.org/doxygen/classOGRSpatialReference.html#aec3c6a49533fe457ddc763d699ff8796>`_.
+
+        Returns
+        -------
+        source: MemoryVector
+            ..
+
+        Example
+        -------
+        >>> ds.create_memory_vector('buildings', 'polygon', [{'name': 'height', 'type': float}])
+        >>> ds.buildings.insert_many(zip(polygons, heights))
+        >>> for poly, height in ds.buildings.iter_data(mask=fp):
+                print(poly.area * height)
+
+        See Also
+        --------
+        - :py:meth:`Dataset.acreate_memory_vector`: To skip the `key` assigment
+        - :py:func:`buzzard.create_memory_vector`: To skip the `key` assigment and the explicit `Dataset` instanciation
+
+        """
+        type_ = type
+        del type
+
+        # Parameter checking ***************************************************
+        type_ = conv.str_of_wkbgeom(conv.wkbgeom_of_str(type_))
+        fields = _tools.normalize_fields_defn(fields)
+        if sr is None:
+            wkt = None
+        else:
+            success, payload = Catch(osr.GetUserInputAsWKT, nonzero_int_is_error=True)(sr)
+            if not success:
+                raise ValueError('Could not transform `sr` to `wkt` (gdal error: `{}`)'.format(
+                    payload[1]
+                ))
+            wkt = payload
+
+        # Construction *********************************************************
+        prox = MemoryVector(self, type_, fields, wkt)
+
+        # Dataset Registering ***********************************************
+        if not isinstance(key, _AnonymousSentry):
+            self._register([key], prox)
+        else:
+            self._register([], prox)
+        return prox
+
+    def acreate_memory_vector(self, type, fields=(), sr=None):
+        """Create an empty vector stored in memory as numpy arrays anonymously within this Dataset.
+
+        See :py:meth:`~Dataset.create_memory_vector`
+
+        See Also
+        --------
+        - :py:meth:`Dataset.create_memory_vector`: To assign a `key` to this source within the `Dataset`
+        - :py:func:`buzzard.create_memory_vector`: To skip the `key` assigment and the explicit `Dataset` instanciation
+
+        """
+        return self.create_memory_vector(_AnonymousSentry(), type, fields, sr)
+
+    # Headers ********************************************************************************** **
+    def preload_raster_headers(self, paths, driver='GTiff', options=(), pool='io'):
+        """Read the metadata of many raster files in parallel and store them in the headers cache
+        of this Dataset. The following calls to `open_raster` with `lazy=True` won't have to
+        open those files.
+
+        If the Dataset performs reprojections, the checks of `analyse_transformation` are also
+        performed for all the files at once.
+
+        Parameters
+        ----------
+        paths: sequence of string
+            ..
+        driver: string
+            see :py:meth:`Dataset.open_raster` method
+        options: sequence of str
+            see :py:meth:`Dataset.open_raster` method
+        pool: None or multiprocessing.pool.Pool or multiprocessing.pool.ThreadPool or hashable
+            Pool used to open the files. If `None`, the files are opened on the calling thread.
+
+        Example
+        -------
+        >>> ds = buzz.Dataset(headers_cache='/path/to/headers.json')
+        ... paths = glob.glob('/path/to/tiles/*.tif')
+        ... ds.preload_raster_headers(paths)
+        ... tiles = [ds.aopen_raster(path, lazy=True) for path in paths]
+
+        """
+        driver = str(driver)
+        options = [str(arg) for arg in options]
+        pool = self._back.pools_container._normalize_pool_parameter(pool, 'pool')
+        args_list = [(str(path), driver, options) for path in paths]
+        self._preload_headers('raster', BackGDALFileRaster.read_header, args_list, pool)
+        self._preload_transforms('raster', [self._raster_header(*args) for args in args_list])
+
+    def preload_vector_headers(self, paths, layer=None, driver='ESRI Shapefile', options=(),
+                               pool='io'):
+        """Read the metadata of many vector files in parallel and store them in the headers cache
+        of this Dataset. The following calls to `open_vector` with `lazy=True` won't have to
+        open those files.
+
+        If the Dataset performs reprojections, the checks of `analyse_transformation` are also
+        performed for all the files at once.
+
+        Parameters
+        ----------
+        paths: sequence of string
+            ..
+        layer: None or int or string
+            see :py:meth:`Dataset.open_vector` method
+        driver: string
+            see :py:meth:`Dataset.open_vector` method
+        options: sequence of str
+            see :py:meth:`Dataset.open_vector` method
+        pool: None or multiprocessing.pool.Pool or multiprocessing.pool.ThreadPool or hashable
+            see :py:meth:`Dataset.preload_raster_headers` method
+
+        """
+        layer = self._normalize_layer_parameter(layer)
+        driver = str(driver)
+        options = [str(arg) for arg in options]
+        pool = self._back.pools_container._normalize_pool_parameter(pool, 'pool')
+        args_list = [(str(path), layer, driver, options) for path in paths]
+        self._preload_headers('vector', BackGDALFileVector.read_header, args_list, pool)
+        self._preload_transforms('vector', [self._vector_header(*args) for args in args_list])
+
+    def _preload_headers(self, kind, read_header, args_list, pool):
+        cache = self._back.headers_cache
+        todo = []
+        for args in args_list:
+            key = self._header_key(kind, args)
+            if key is not None and cache.get(key) is None:
+                todo.append((key, args))
+        if not todo:
+            return
+
+        if pool is None:
+            headers = [read_header(*args) for _, args in todo]
+        else:
+            headers = pool.starmap(read_header, [args for _, args in todo])
+        for (key, _), header in zip(todo, headers):
+            cache.put(key, header)
+        cache.save()
+
+    def _preload_transforms(self, kind, headers):
+        """Analyse at once the reprojections of the files about to be opened"""
+        if kind == 'raster':
+            rects = [Footprint(gt=header['gt'], rsize=header['rsize']) for header in headers]
+        else:
+            rects = [
+                None if header['rect'] is None else tuple(header['rect'])
+                for header in headers
+            ]
+        self._back.preload_transforms([header['wkt_stored'] for header in headers], rects)
+
+    def _raster_header(self, path, driver, options):
+        return self._header('raster', BackGDALFileRaster.read_header, (path, driver, options))
+
+    def _vector_header(self, path, layer, driver, options):
+        return self._header('vector', BackGDALFileVector.read_header, (path, layer, driver, options))
+
+    def _header(self, kind, read_header, args):
+        cache = self._back.headers_cache
+        key = self._header_key(kind, args)
+        header = cache.get(key)
+        if header is None:
+            header = read_header(*args)
+            cache.put(key, header)
+        # The cached header may have been read through another path to the same file (like a
+        # relative path from another working directory)
+        return dict(header, path=args[0])
+
+    @staticmethod
+    def _header_key(kind, args):
+        if kind == 'raster':
+            path, driver, options = args
+            layer = None
+        else:
+            path, layer, driver, options = args
+        return HeadersCache.key_of_file(kind, path, driver, options, layer)
+
+    @staticmethod
+    def _normalize_layer_parameter(layer):
+        if layer is None:
+            return 0
+        elif np.all(np.isreal(layer)):
+            return int(layer)
+        else:
+            return str(layer)
+
     # Cleanup *********************************************************************************** **
     def __del__(self):
         if not self._ds_closed:
@@ -1623,6 +2059,7 @@ class Dataset(DatasetRegisterMixin):
             self._back.pools_container._close()
             for source in list(self._keys_of_source.keys()):
                 source.close()
+            self._back.headers_cache.save()
 
         return _CloseRoutine(self, _close)
 
@@ -1680,6 +2117,19 @@ class Dataset(DatasetRegisterMixin):
         """Count how many driver objects are currently active"""
         return self._back.active_count()
 
+    @property
+    def activation_stats(self):
+        """Counters of the driver objects pooling, as a dict with the following keys
+
+        - 'hits': Number of acquisitions that reused an idle driver object
+        - 'allocations': Number of driver objects allocated
+        - 'evictions': Number of idle driver objects deactivated to make room for a new one
+        - 'waits': Number of acquisitions that had to wait for a driver object to be released
+        - 'idle': Number of driver objects currently idle
+        - 'used': Number of driver objects currently used
+        """
+        return self._back.activation_stats()
+
     def activate_all(self):
         """Activate all deactivable proxies.
         May raise an exception if the number of sources is greater than `max_activated`
@@ -1724,6 +2174,29 @@ class Dataset(DatasetRegisterMixin):
         """
         return self._back.pools_container
 
+    def _normalize_io_pool_parameter(self, io_pool):
+        """The io_pool of a file raster writes in the memory of the caller, it has to be a
+        ThreadPool"""
+        io_pool = self._back.pools_container._normalize_pool_parameter(io_pool, 'io_pool')
+        if io_pool is not None and not isinstance(io_pool, mp.pool.ThreadPool): # pragma: no cover
+            raise TypeError('`io_pool` should be None, a multiprocessing.pool.ThreadPool or a hashable')
+        return io_pool
+
+    @staticmethod
+    def _normalize_async_writes_parameter(async_writes, io_pool, mode):
+        """Returns the maximum number of bytes of pending writes, or None"""
+        if async_writes is None or async_writes is False:
+            return None
+        if async_writes is True:
+            async_writes = 2 ** 28
+        elif not isinstance(async_writes, numbers.Integral) or async_writes <= 0: # pragma: no cover
+            raise TypeError('`async_writes` should be a bool or a positive integer')
+        if mode != 'w': # pragma: no cover
+            raise ValueError("`async_writes` can only be used with `mode='w'`")
+        if io_pool is None:
+            raise ValueError('`async_writes` requires an `io_pool`')
+        return int(async_writes)
+
     # Deprecation ******************************************************************************* **
     open_araster = deprecation_pool.wrap_method(
         aopen_raster,
@@ -1803,6 +2276,19 @@ def create_vector(*args, **kwargs):
     """
     return Dataset().acreate_vector(*args, **kwargs)
 
+def create_memory_vector(*args, **kwargs):
+    """Shortcut for `Dataset().acreate_memory_vector`
+
+    >>> help(Dataset.create_memory_vector)
+
+    See Also
+    --------
+    - :py:func:`Dataset.create_memory_vector`
+    - :py:meth:`Dataset.acreate_memory_vector`
+
+    """
+    return Dataset().acreate_memory_vector(*args, **kwargs)
+
 def wrap_numpy_raster(*args, **kwargs):
     """Shortcut for `Dataset().awrap_numpy_raster`
 
@@ -3,6 +3,7 @@ from buzzard._dataset_back_conversions import BackDatasetConversionsMixin
 from buzzard._dataset_back_activation_pool import BackDatasetActivationPoolMixin
 from buzzard._dataset_back_scheduler import BackDatasetSchedulerMixin
 from buzzard._dataset_pools_container import PoolsContainer
+from buzzard._headers_cache import HeadersCache
 
 class BackDataset(BackDatasetConversionsMixin,
                      BackDatasetActivationPoolMixin,
@@ -10,8 +11,11 @@ class BackDataset(BackDatasetConversionsMixin,
     """Backend of the Dataset, referenced by backend proxies
     Implements activation (pooling) and conversion methods"""
 
-    def __init__(self, allow_none_geometry, allow_interpolation, **kwargs):
+    def __init__(self, allow_none_geometry, allow_interpolation, headers_cache, auto_spatial_index,
+                 **kwargs):
         self.allow_interpolation = allow_interpolation
+        self.auto_spatial_index = auto_spatial_index
         self.allow_none_geometry = allow_none_geometry
         self.pools_container = PoolsContainer()
+        self.headers_cache = HeadersCache(headers_cache)
         super(BackDataset, self).__init__(**kwargs)
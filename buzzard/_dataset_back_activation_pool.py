@@ -1,57 +1,94 @@
 import collections
 import threading
 import contextlib
+import time
 
 from buzzard._tools import MultiOrderedDict
 
 _ERR_FMT = 'Dataset is configured for a maximum of {} simultaneous active driver objects \
 but there are already {} idle objects and {} used objects'
 
+_ERR_PER_SOURCE_FMT = 'Dataset is configured for a maximum of {} simultaneous active driver \
+objects per source but there are already {} used objects for this source'
+
 class BackDatasetActivationPoolMixin(object):
     """Private mixin for the Dataset class containing subroutines for proxies' driver
-    objects pooling"""
+    objects pooling
+
+    All counters are maintained incrementally and the lock is only held for constant time
+    bookkeeping, the allocation and the destruction of the driver objects are performed outside of
+    the lock.
+    """
 
-    def __init__(self, max_active, **kwargs):
+    def __init__(self, max_active, max_active_per_source, active_timeout, **kwargs):
         self.max_active = max_active
-        self._ap_lock = threading.Lock()
+        self.max_active_per_source = max_active_per_source
+        self.active_timeout = active_timeout
+        self._ap_lock = threading.Condition(threading.Lock())
         self._ap_idle = MultiOrderedDict()
+
+        # Driver objects lent to a user
         self._ap_used = collections.Counter()
+        self._ap_used_total = 0
+
+        # Slots reserved for driver objects being allocated
+        self._ap_reserved = collections.Counter()
+        self._ap_reserved_total = 0
+
+        self._ap_stats = collections.Counter()
         super(BackDatasetActivationPoolMixin, self).__init__(**kwargs)
 
     def activate(self, uid, allocator):
         """Make sure at least one driver object is idle or used for uid"""
         with self._ap_lock:
-            if self._ap_used[uid] == 0 and uid not in self._ap_idle:
-                self._ensure_one_slot()
-                self._ap_idle.push_front(uid, allocator())
+            if self._ap_used[uid] > 0 or self._ap_reserved[uid] > 0 or uid in self._ap_idle:
+                return
+            allocate, obj = self._pop_or_reserve(uid)
+            if not allocate:
+                self._ap_idle.push_front(uid, obj)
+                return
+        del obj
+
+        obj = self._allocate(uid, allocator)
+        with self._ap_lock:
+            self._unreserve(uid)
+            self._ap_stats['allocations'] += 1
+            self._ap_idle.push_front(uid, obj)
 
     def deactivate(self, uid):
         """Flush all occurrences of uid from _ap_idle. Raises an exception if uid is in _ap_used
+        or if a driver object of uid is being allocated
         """
         with self._ap_lock:
-            if self._ap_used[uid] > 0:
+            if self._ap_used[uid] > 0 or self._ap_reserved[uid] > 0:
                 raise RuntimeError('Attempting to deactivate a source currently used')
-            self._ap_idle.pop_all_occurrences(uid)
+            objs = self._ap_idle.pop_all_occurrences(uid)
+            self._ap_lock.notify_all()
+        del objs
 
     def deactivate_many(self, uid_set):
         # TODO idea: allow recursive uids to group activated rasters and allow group deactivation
         if len(uid_set) == 0:
             return
         with self._ap_lock:
-            being_used = uid_set & self._ap_used.keys()
+            being_used = uid_set & (self._ap_used.keys() | self._ap_reserved.keys())
             if being_used:
                 raise RuntimeError('Attempting to deactivate {} source currently used'.format(
                     len(being_used)
                 ))
             idle = self._ap_idle & uid_set
-            for uid in idle:
+            objs = [
                 self._ap_idle.pop_all_occurrences(uid)
+                for uid in idle
+            ]
+            self._ap_lock.notify_all()
+        del objs
 
     def used_count(self, uid=None):
         """Count how many driver objects exist for uid"""
         with self._ap_lock:
             if uid is None:
-                return sum(self._ap_used.values())
+                return self._ap_used_total
             else:
                 return self._ap_used[uid]
 
@@ -67,10 +104,22 @@ class BackDatasetActivationPoolMixin(object):
         """Count how many driver objects exist for uid"""
         with self._ap_lock:
             if uid is None:
-                return len(self._ap_idle) + sum(self._ap_used.values())
+                return len(self._ap_idle) + self._ap_used_total
             else:
                 return self._ap_idle.count(uid) + self._ap_used[uid]
 
+    def activation_stats(self):
+        """Snapshot of the counters of the pool"""
+        with self._ap_lock:
+            return {
+                'hits': self._ap_stats['hits'],
+                'allocations': self._ap_stats['allocations'],
+                'evictions': self._ap_stats['evictions'],
+                'waits': self._ap_stats['waits'],
+                'idle': len(self._ap_idle),
+                'used': self._ap_used_total,
+            }
+
     def acquire_driver_object(self, uid, allocator):
         """Return a context manager to acquire a driver object
 
@@ -82,42 +131,118 @@ class BackDatasetActivationPoolMixin(object):
         @contextlib.contextmanager
         def _acquire():
             with self._ap_lock:
-                if uid in self._ap_idle:
-                    obj = self._ap_idle.pop_first_occurrence(uid)
-                    allocate = False
-                else:
-                    self._ensure_one_slot()
-                    allocate = True
-                self._ap_used[uid] += 1
+                allocate, obj = self._pop_or_reserve(uid)
+                if not allocate:
+                    self._ap_used[uid] += 1
+                    self._ap_used_total += 1
 
             if allocate:
-                try:
-                    obj = allocator()
-                except:
-                    with self._ap_lock:
-                        self._ap_used[uid] -= 1
-                    raise
+                # `obj` is the driver object evicted to make room, close it outside of the lock
+                del obj
+                obj = self._allocate(uid, allocator)
+                with self._ap_lock:
+                    self._unreserve(uid)
+                    self._ap_stats['allocations'] += 1
+                    self._ap_used[uid] += 1
+                    self._ap_used_total += 1
 
             try:
                 yield obj
             finally:
                 with self._ap_lock:
                     self._ap_used[uid] -= 1
+                    self._ap_used_total -= 1
                     assert self._ap_used[uid] >= 0
                     self._ap_idle.push_front(uid, obj)
                     if self._ap_used[uid] == 0:
                         del self._ap_used[uid]
+                    self._ap_lock.notify_all()
 
         return _acquire()
 
-    def _ensure_one_slot(self):
-        total = sum(self._ap_used.values()) + len(self._ap_idle)
-        assert total <= self.max_active
-        if total == self.max_active:
-            if len(self._ap_idle) == 0:
+    def _pop_or_reserve(self, uid):
+        """Either pop an idle driver object of `uid`, or reserve a slot to allocate a new one.
+        Waits for a driver object to be released if both are impossible. Must be called with the
+        lock held.
+
+        Returns
+        -------
+        (False, obj)
+            `obj` is an idle driver object of `uid`
+        (True, obj)
+            A slot is reserved, `obj` is the driver object evicted to make room (or None). The
+            caller should destroy it after releasing the lock, and then call `_allocate`.
+        """
+        if self.active_timeout is None:
+            deadline = None
+        else:
+            deadline = time.time() + self.active_timeout
+        waited = False
+
+        while True:
+            if uid in self._ap_idle:
+                self._ap_stats['hits'] += 1
+                return False, self._ap_idle.pop_first_occurrence(uid)
+
+            # Per source limit
+            per_source = self._ap_used[uid] + self._ap_reserved[uid]
+            if per_source >= self.max_active_per_source:
+                if not self._wait(deadline, waited):
+                    raise RuntimeError(_ERR_PER_SOURCE_FMT.format(
+                        self.max_active_per_source, per_source,
+                    ))
+                waited = True
+                continue
+
+            # Global limit
+            total = self._ap_used_total + self._ap_reserved_total + len(self._ap_idle)
+            assert total <= self.max_active
+            if total < self.max_active:
+                evicted = None
+                break
+            if len(self._ap_idle) > 0:
+                _, evicted = self._ap_idle.pop_back()
+                self._ap_stats['evictions'] += 1
+                break
+            if not self._wait(deadline, waited):
                 raise RuntimeError(_ERR_FMT.format(
                     self.max_active,
                     len(self._ap_idle),
-                    sum(self._ap_used.values()),
+                    self._ap_used_total + self._ap_reserved_total,
                 ))
-            self._ap_idle.pop_back()
+            waited = True
+
+        self._ap_reserved[uid] += 1
+        self._ap_reserved_total += 1
+        return True, evicted
+
+    def _allocate(self, uid, allocator):
+        """Call `allocator` outside of the lock. On success the caller should then call
+        `_unreserve` and register the new object as idle or used, in the same critical section."""
+        try:
+            return allocator()
+        except:
+            with self._ap_lock:
+                self._unreserve(uid)
+            raise
+
+    def _unreserve(self, uid):
+        """Release a slot reserved by `_pop_or_reserve`. Must be called with the lock held."""
+        self._ap_reserved[uid] -= 1
+        self._ap_reserved_total -= 1
+        if self._ap_reserved[uid] == 0:
+            del self._ap_reserved[uid]
+        self._ap_lock.notify_all()
+
+    def _wait(self, deadline, waited):
+        """Wait for a driver object to be released. Returns False if the deadline is reached"""
+        if deadline is None:
+            timeout = None
+        else:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                return False
+        if not waited:
+            self._ap_stats['waits'] += 1
+        self._ap_lock.wait(timeout)
+        return True
@@ -1,8 +1,11 @@
+import threading
+
 import numpy as np
 from osgeo import osr
 
 from buzzard import srs
 from buzzard._footprint import Footprint
+from buzzard._env import env
 
 class BackDatasetConversionsMixin(object):
     """Private mixin for the Dataset class containing the spatial coordinates
@@ -30,6 +33,9 @@ class BackDatasetConversionsMixin(object):
         self.sr_fallback = sr_fallback
         self.sr_forced = sr_forced
         self.analyse_transformations = analyse_transformation
+        self._osr_transformations = threading.local()
+        self._transforms = {}
+        self._analyses = {}
         super(BackDatasetConversionsMixin, self).__init__(**kwargs)
 
     def get_transforms(self, sr_virtual, rect, rect_from='virtual'):
@@ -48,17 +54,18 @@ class BackDatasetConversionsMixin(object):
 
         assert sr_virtual is not None
 
-        to_work = osr.CreateCoordinateTransformation(sr_virtual, self.sr_work).TransformPoints
-        to_virtual = osr.CreateCoordinateTransformation(self.sr_work, sr_virtual).TransformPoints
-
-        to_work = self._make_transfo(to_work)
-        to_virtual = self._make_transfo(to_virtual)
+        wkt_virtual = sr_virtual.ExportToWkt()
+        to_work, to_virtual = self._get_transforms_of_wkt(wkt_virtual)
 
         if self.analyse_transformations:
-            if rect_from == 'virtual':
-                an = srs.Analysis(to_work, to_virtual, rect)
-            else:
-                an = srs.Analysis(to_virtual, to_work, rect)
+            key = self._analysis_key(wkt_virtual, rect, rect_from)
+            an = self._analyses.get(key)
+            if an is None:
+                if rect_from == 'virtual':
+                    an = srs.Analysis(to_work, to_virtual, rect)
+                else:
+                    an = srs.Analysis(to_virtual, to_work, rect)
+                self._analyses[key] = an
             if rect is None:
                 pass
             elif isinstance(rect, Footprint):
@@ -94,6 +101,89 @@ class BackDatasetConversionsMixin(object):
 
         return to_work, to_virtual
 
+    def preload_transforms(self, wkts_stored, rects):
+        """Analyse at once the transformations of many sources about to be opened, the results
+        being memoized for `get_transforms`. A single call to the forward and inverse
+        transformations is performed per spatial reference.
+
+        Parameters
+        ----------
+        wkts_stored: sequence of (None or str)
+        rects: sequence of (Footprint or extent or None)
+        """
+        if self.sr_work is None or not self.analyse_transformations:
+            return
+
+        todo = {}
+        for wkt_stored, rect in zip(wkts_stored, rects):
+            if wkt_stored is None and self.wkt_fallback is None and self.wkt_forced is None:
+                # `get_transforms` won't be reached for this source
+                continue
+            wkt_virtual = self.virtual_of_stored_given_mode(
+                wkt_stored, self.wkt_work, self.wkt_fallback, self.wkt_forced,
+            )
+            # Same normalization as in `ABackSource`
+            wkt_virtual = osr.SpatialReference(wkt_virtual).ExportToWkt()
+            key = self._analysis_key(wkt_virtual, rect, 'virtual')
+            if key not in self._analyses:
+                todo.setdefault(wkt_virtual, {})[key] = rect
+
+        for wkt_virtual, rect_of_key in todo.items():
+            to_work, to_virtual = self._get_transforms_of_wkt(wkt_virtual)
+            ans = srs.Analysis.many(to_work, to_virtual, list(rect_of_key.values()))
+            self._analyses.update(zip(rect_of_key.keys(), ans))
+
+    @staticmethod
+    def _analysis_key(wkt_virtual, rect, rect_from):
+        """Key of the memoized `srs.Analysis`, the tolerances of the analysis depend on
+        `env.significant`"""
+        if rect is None:
+            rect_key = None
+        elif isinstance(rect, Footprint):
+            rect_key = ('fp',) + tuple(rect.gt.tolist()) + tuple(rect.rsize.tolist())
+        else:
+            rect_key = ('extent',) + tuple(float(v) for v in rect)
+        return wkt_virtual, rect_key, rect_from, env.significant
+
+    def _get_transforms_of_wkt(self, wkt_virtual):
+        """Get the `to_work` and `to_virtual` functions of a spatial reference, those functions
+        are created once and shared between all the sources"""
+        transforms = self._transforms.get(wkt_virtual)
+        if transforms is None:
+            transforms = (
+                self._make_transfo(self._transform_points_of(wkt_virtual, self.wkt_work)),
+                self._make_transfo(self._transform_points_of(self.wkt_work, wkt_virtual)),
+            )
+            transforms = self._transforms.setdefault(wkt_virtual, transforms)
+        return transforms
+
+    def _transform_points_of(self, wkt_src, wkt_dst):
+        """Build a `TransformPoints` function between two spatial references, the
+        `osr.CoordinateTransformation` objects being shared between all the sources"""
+
+        def _f(arr):
+            return self._get_osr_transformation(wkt_src, wkt_dst).TransformPoints(arr)
+
+        return _f
+
+    def _get_osr_transformation(self, wkt_src, wkt_dst):
+        """Get the `osr.CoordinateTransformation` of a pair of spatial references.
+
+        Those objects are not thread-safe, they are created once per pair and per thread.
+        """
+        cache = getattr(self._osr_transformations, 'cache', None)
+        if cache is None:
+            cache = {}
+            self._osr_transformations.cache = cache
+        key = (wkt_src, wkt_dst)
+        transfo = cache.get(key)
+        if transfo is None:
+            transfo = osr.CreateCoordinateTransformation(
+                osr.SpatialReference(wkt_src), osr.SpatialReference(wkt_dst),
+            )
+            cache[key] = transfo
+        return transfo
+
     @staticmethod
     def _make_transfo(osr_transfo):
         """Wrap osr coordinate transformation input/output"""
@@ -7,22 +7,23 @@ import logging
 import itertools
 
 import shapely
+import shapely.affinity
 import shapely.geometry as sg
+import shapely.ops
 import affine
 import numpy as np
-import scipy
 from osgeo import gdal
 from osgeo import ogr
 from osgeo import osr
 from six.moves import filterfalse
-import scipy.ndimage as ndi
 import skimage.morphology as skm
 
 from buzzard import _tools
 from buzzard._tools import conv
 from buzzard._tools import GDALErrorCatcher as Catch
 from buzzard._env import env
-from buzzard._footprint_tile import TileMixin
+from buzzard._footprint_tile import TileMixin, TileIterable
+from buzzard._footprint_grid import FootprintGrid
 from buzzard._footprint_intersection import IntersectionMixin
 from buzzard._footprint_move import MoveMixin
 
@@ -74,11 +75,11 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
     +-------------------------------------------------+--------------------------------------------------------+
     | Numpy                                           | shape, meshgrid_raster, meshgrid_spatial, slice_in, ...|
     +-------------------------------------------------+--------------------------------------------------------+
-    | Coordinates conversions                         | spatial_to_raster, raster_to_spatial                   |
+    | Coordinates conversions                         | spatial_to_raster, spatial_to_raster_many, ...         |
     +-------------------------------------------------+--------------------------------------------------------+
     | Geometry / Raster conversions                   | find_polygons, burn_polygons, ...                      |
     +-------------------------------------------------+--------------------------------------------------------+
-    | Tiling                                          | tile, tile_count, tile_occurrence                      |
+    | Tiling                                          | tile, tile_grid, iter_tiles, tile_count, ...           |
     +-------------------------------------------------+--------------------------------------------------------+
     | Serialization                                   | __str__, ...                                           |
     +-------------------------------------------------+--------------------------------------------------------+
@@ -113,7 +114,10 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
 
     """
 
-    __slots__ = ['_tl', '_bl', '_br', '_tr', '_aff', '_rsize', '_significant_min']
+    __slots__ = [
+        '_tl', '_bl', '_br', '_tr', '_aff', '_rsize', '_significant_min',
+        '_coords', '_poly', '_hash', '_conversion_constants',
+    ]
 
     # Footprint construction ******************************************************************** **
     # Footprint construction - from scratch ***************************************************** **
@@ -177,6 +181,39 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         if kwargs:
             raise ValueError('Unknown parameters [{}]'.format(kwargs.keys()))
 
+        aff = affine.Affine(a, b, c, d, e, f)
+        self._check_affine(aff)
+        self._init_unsafe(aff, rsize)
+
+        rect = _tools.Rect(self._tl, self._bl, self._br, self._tr)
+        self._significant_min = rect.significant_min((rect.size / self._rsize).min())
+
+    @classmethod
+    def _of_affine(cls, aff, rsize):
+        """Fast constructor for the Footprints derived from another Footprint (like in `clip`,
+        `tile` or `intersection`). The parameters are trusted: Only the cheap checks are
+        performed, and `significant_min` is computed without the `Rect` machinery."""
+        rsize = np.asarray(rsize, dtype=env.default_index_dtype)
+        if (rsize <= 0).any():
+            raise ValueError('Invalid rsize value `%s`' % rsize)
+        cls._check_affine(aff)
+        self = cls.__new__(cls)
+        self._init_unsafe(aff, rsize)
+
+        a, b, _, d, e, _ = aff[:6]
+        if b == 0 and d == 0:
+            # Same value as `Rect.significant_min` for a north-up Footprint
+            smallest_reso = min(abs(a), abs(e))
+            largest_coord = max(np.abs(self._coords).max(), 1.)
+            self._significant_min = -np.log10(smallest_reso / largest_coord)
+        else:
+            rect = _tools.Rect(self._tl, self._bl, self._br, self._tr)
+            self._significant_min = rect.significant_min((rect.size / self._rsize).min())
+        return self
+
+    @staticmethod
+    def _check_affine(aff):
+        a, b, c, d, e, f = aff[:6]
         if a * e - d * b == 0:
             raise ValueError('Determinent should not be 0: {}'.format(
                 a * e - d * b
@@ -191,24 +228,27 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
                      'deactivate this error.affine matrix:\n{}').format(arr)
                 raise ValueError(s)
 
-        rsizex, rsizey = rsize
-        aff = affine.Affine(a, b, c, d, e, f)
-
-        self._tl = c, f
-        self._bl = aff * (0, rsizey)
-        self._br = aff * (rsizex, rsizey)
-        self._tr = aff * (rsizex, 0)
+    def _init_unsafe(self, aff, rsize):
+        """Set all the attributes but `_significant_min`"""
+        rsizex, rsizey = int(rsize[0]), int(rsize[1])
+        a, b, c, d, e, f = aff[:6]
+
+        # Same operations as `aff * (x, y)`, for the 3 corners at once
+        xs = np.asarray([0., rsizex, rsizex])
+        ys = np.asarray([rsizey, rsizey, 0.])
+        corners = np.empty((4, 2), dtype=np.float64)
+        corners[0] = c, f
+        corners[1:, 0] = xs * a + ys * b + c
+        corners[1:, 1] = xs * d + ys * e + f
+        corners.flags.writeable = False
+
+        self._tl, self._bl, self._br, self._tr = corners
         self._aff = aff
-        self._rsize = rsize
-
-        self._tl = np.asarray(self._tl, dtype=np.float64)
-        self._bl = np.asarray(self._bl, dtype=np.float64)
-        self._br = np.asarray(self._br, dtype=np.float64)
-        self._tr = np.asarray(self._tr, dtype=np.float64)
-        self._rsize = np.asarray(self._rsize, dtype=env.default_index_dtype)
-
-        rect = _tools.Rect(*self.coords)
-        self._significant_min = rect.significant_min((rect.size / self._rsize).min())
+        self._rsize = np.asarray(rsize, dtype=env.default_index_dtype)
+        self._coords = corners
+        self._poly = None
+        self._hash = None
+        self._conversion_constants = None
 
 
     # Footprint construction - from Footprint *************************************************** **
@@ -301,22 +341,19 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
             [endx - startx, endy - starty]
         )
         tl = self.tl + startx * self.pxlrvec + starty * self.pxtbvec
-        gt = self.gt
-        gt[0] = tl[0]
-        gt[3] = tl[1]
-
-        return self.__class__(
-            gt=gt,
-            rsize=rsize,
+        a, b, _, d, e, _ = self._aff[:6]
+        return self._of_affine(
+            affine.Affine(a, b, tl[0], d, e, tl[1]),
+            rsize,
         )
 
     def _morpho(self, left, right, top, bottom):
         if left == right == top == bottom == 0:
             return self
         aff = self._aff * affine.Affine.translation(-left, -top)
-        return Footprint(
-            gt=aff.to_gdal(),
-            rsize=(self.rsize + [left + right, top + bottom]),
+        return self._of_affine(
+            aff,
+            self.rsize + [left + right, top + bottom],
         )
 
     def erode(self, *args):
@@ -692,16 +729,17 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         -------
         >>> tl, bl, br, tr = fp.coords
         """
-        return np.asarray(
-            [self.tl, self.bl, self.br, self.tr]
-        )
+        return self._coords.copy()
 
     @property
     def poly(self):
         """Convert self to shapely.geometry.Polygon"""
-        return sg.Polygon([
-            self.tl, self.bl, self.br, self.tr, self.tl
-        ])
+        # Computed once, shapely geometries being immutable
+        if self._poly is None:
+            self._poly = sg.Polygon([
+                self._tl, self._bl, self._br, self._tr, self._tl
+            ])
+        return self._poly
 
     @property
     def __geo_interface__(self):
@@ -1429,8 +1467,9 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         """
         if not isinstance(other, self.__class__):
             raise TypeError('other should be a Footprint') # pragma: no cover
-        startx, starty = other.spatial_to_raster(self.tl)
-        endx, endy = other.spatial_to_raster(self.br)
+        (startx, starty), (endx, endy) = other.spatial_to_raster(
+            np.asarray([self._tl, self._br])
+        )
         if clip:
             startx = startx.clip(0, other.rsizex)
             endx = endx.clip(0, other.rsizex)
@@ -1478,23 +1517,67 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         if not np.issubdtype(dtype, np.integer):
             op = None
 
-        if env.significant <= self._significant_min:
-            s = ('This Footprint have large coordinates and small pixels, at least {:.2} '
-                'significant digits are necessary to perform this operation, but '
-                 '`buzz.env.significant` is set to {}. Increase this value by using '
-                 'buzz.Env(significant={}) in a `with statement`.'
-            ).format(self._significant_min, env.significant, env.significant + 1)
-            raise RuntimeError(s)
-        largest_coord = np.abs(self.coords).max()
-        spatial_precision = largest_coord * 10 ** -env.significant
-        smallest_reso = self.pxsize.min()
-        pixel_precision = spatial_precision / smallest_reso
-        abstract_grid_density = np.floor(1 / pixel_precision)
-
         workshape = int(xy.size / 2), 2
         xy2 = np.empty(workshape, 'float64')
         xy2[:, :] = xy.reshape(workshape)
-        aff = ~self._aff
+        return self._spatial_to_raster_unsafe(xy2, dtype, op).reshape(xy.shape)
+
+    def spatial_to_raster_many(self, fps, dtype=None, op=np.floor):
+        """Convert the top left coordinates of many Footprints to raster xy indices, at once.
+
+        Equivalent to `np.asarray([self.spatial_to_raster(fp.tl) for fp in fps])` but without the
+        per-call overhead, for the large tilings.
+
+        Parameters
+        ----------
+        fps: array_like of Footprint or FootprintGrid
+            Footprints of any shape
+        dtype: None or convertible to np.dtype
+            Output dtype
+            If None: Use buzz.env.default_index_dtype
+        op: None or vectorized function
+            Function to apply before casting output to dtype
+            If None: Do not transform data before casting
+
+        Returns
+        -------
+        out_xy: np.ndarray
+            Raster indices
+            with shape = np.asarray(fps).shape + (2,)
+            with dtype = dtype
+
+        """
+        # Check dtype parameter
+        if dtype is None:
+            dtype = env.default_index_dtype
+        else:
+            dtype = conv.dtype_of_any_downcast(dtype)
+
+        # Check op parameter
+        if not np.issubdtype(dtype, np.integer):
+            op = None
+
+        # Check fps parameter
+        if isinstance(fps, FootprintGrid):
+            # Convert it without materializing the Footprints
+            shape = fps.shape
+            if self.same_grid(fps.parent):
+                return fps.rebase(self).rtl.astype(dtype)
+            xy = fps.parent.raster_to_spatial(fps.rtl.reshape(-1, 2))
+        else:
+            fps = np.asarray(fps, dtype=object)
+            shape = fps.shape
+            xy = np.empty((fps.size, 2), 'float64')
+            for i, fp in enumerate(fps.flat):
+                if not isinstance(fp, self.__class__):
+                    raise TypeError('`fps` should only contain Footprints') # pragma: no cover
+                xy[i] = fp._tl
+
+        return self._spatial_to_raster_unsafe(xy, dtype, op).reshape(shape + (2,))
+
+    def _spatial_to_raster_unsafe(self, xy2, dtype, op):
+        """Convert a float64 array of shape (n, 2) in place"""
+        aff, abstract_grid_density = self._get_conversion_constants()
         xy2[:, 0], xy2[:, 1] = (
             xy2[:, 0] * aff.a + xy2[:, 1] * aff.b + aff.c,
             xy2[:, 0] * aff.d + xy2[:, 1] * aff.e + aff.f,
@@ -1502,7 +1585,31 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         xy2 = np.around(xy2 * abstract_grid_density, 0) / abstract_grid_density # Should move this line in if?
         if op is not None:
             xy2 = op(xy2)
-        return xy2.astype(dtype, copy=False).reshape(xy.shape)
+        return xy2.astype(dtype, copy=False)
+
+    def _get_conversion_constants(self):
+        """Inverse affine and abstract grid density of `spatial_to_raster`, computed once per
+        value of `env.significant`"""
+        significant = env.significant
+        constants = self._conversion_constants
+        if constants is not None and constants[0] == significant:
+            return constants[1:]
+
+        if significant <= self._significant_min:
+            s = ('This Footprint have large coordinates and small pixels, at least {:.2} '
+                'significant digits are necessary to perform this operation, but '
+                 '`buzz.env.significant` is set to {}. Increase this value by using '
+                 'buzz.Env(significant={}) in a `with statement`.'
+            ).format(self._significant_min, significant, significant + 1)
+            raise RuntimeError(s)
+        largest_coord = np.abs(self._coords).max()
+        spatial_precision = largest_coord * 10 ** -significant
+        smallest_reso = self.pxsize.min()
+        pixel_precision = spatial_precision / smallest_reso
+        abstract_grid_density = np.floor(1 / pixel_precision)
+
+        self._conversion_constants = (significant, ~self._aff, abstract_grid_density)
+        return self._conversion_constants[1:]
 
     def raster_to_spatial(self, xy):
         """Convert xy raster coordinates to spatial coordinates
@@ -1536,10 +1643,12 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         return xy2.reshape(xy.shape)
 
     # Geometry / Raster conversions ************************************************************* **
-    def find_lines(self, arr, output_offset='middle', merge=True):
+    def find_lines(self, arr, output_offset='middle', merge=True, tile_size=None, pool=None,
+                   tile_margin=32):
         """Create a list of line-strings from a mask. Works with connectivity 4 and 8. The input
-        raster is preprocessed using `skimage.morphology.thin`. The output linestrings are
-        postprocessed using `shapely.ops.linemerge`.
+        raster is preprocessed using `skimage.morphology.thin`. The segments between the pixels
+        are then merged to polylines going through the pixels with two neighbors, like
+        `shapely.ops.linemerge` would do.
 
         .. warning::
             All standalone pixels contained in arr will be ignored.
@@ -1551,6 +1660,16 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         output_offset: 'middle' or (nbr, nbr)
             Coordinate offset in meter
             if `middle`: substituted by `self.pxvec / 2`
+        merge: bool
+            If False, return the segments between the pixels without merging them
+        tile_size: None or (int, int)
+            If provided, the thinning is performed tile by tile, possibly in parallel in `pool`.
+            Each tile is thinned with a margin of `tile_margin` pixels, so that the seams are
+            stitched seamlessly as long as the features are thinner than twice the margin.
+        pool: None or multiprocessing.pool.ThreadPool
+            Pool where the tiles are thinned. If None, they are processed in the current thread.
+        tile_margin: int
+            Width of the margin around the tiles, in pixel
 
         Returns
         -------
@@ -1592,24 +1711,24 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
          [0 1 1 1 0]
          [0 1 0 0 0]
          [0 1 1 0 0]]
-        edge-id:1 of type:<class 'shapely.geometry.linestring.LineString'> and length:2.0
+        edge-id:1 of type:<class 'shapely.geometry.linestring.LineString'> and length:4.0
+        [[0 1 1 1 0]
+         [0 1 0 0 0]
+         [0 1 0 0 0]
+         [0 0 0 0 0]
+         [0 0 0 0 0]]
+        edge-id:2 of type:<class 'shapely.geometry.linestring.LineString'> and length:2.0
         [[0 0 0 0 0]
          [0 0 0 0 0]
-         [0 1 1 1 0]
+         [0 2 2 2 0]
          [0 0 0 0 0]
          [0 0 0 0 0]]
-        edge-id:2 of type:<class 'shapely.geometry.linestring.LineString'> and length:3.0
+        edge-id:3 of type:<class 'shapely.geometry.linestring.LineString'> and length:3.0
         [[0 0 0 0 0]
          [0 0 0 0 0]
-         [0 2 0 0 0]
-         [0 2 0 0 0]
-         [0 2 2 0 0]]
-        edge-id:3 of type:<class 'shapely.geometry.linestring.LineString'> and length:4.0
-        [[0 3 3 3 0]
          [0 3 0 0 0]
          [0 3 0 0 0]
-         [0 0 0 0 0]
-         [0 0 0 0 0]]
+         [0 3 3 0 0]]
         DegreeView({(3.0, 2.0): 1, (1.0, 2.0): 3, (2.0, 4.0): 1, (3.0, 0.0): 1})
 
         """
@@ -1630,103 +1749,48 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
 
         # Step 2: Array normalization *********************************************************** **
         arr = arr.astype(bool, copy=False)
-        arr = skm.thin(arr)
+        if tile_size is None:
+            arr = skm.thin(arr)
+        else:
+            arr = _thin_tiled(self, arr, tile_size, pool, int(tile_margin))
         arr = arr.astype('uint8', copy=False)
 
-        # Step 3: Prepare to collapse 2x2 squares to single points ****************************** **
-        squares2x2_topleft_mask = ndi.convolve(
-            arr,[
-                [1, 1, 0],
-                [1, 1, 0],
-                [0, 0, 0],
-            ],
-            mode='constant',
-        ) == 4
-        squares2x2_yx_links = {
-            (int(y + dy), int(x + dx)): (int(y), (x))
-            for y, x in zip(*squares2x2_topleft_mask.nonzero())
-            for dy in range(2)
-            for dx in range(2)
-            # if dy + dx != 0
-        }
-
-        # Step 4: Retrieve pixel indices ******************************************************** **
-        count = np.sum(arr)
-        yx_lst = np.stack(arr.nonzero(), -1)
-        index_lst = np.arange(count)
-        index = np.empty(self.shape, dtype=int)
-        index[arr != 0] = index_lst
-
-        # Step 5: Retrieve edge indices ********************************************************* **
-        convolve = lambda arr, kernel: scipy.ndimage.convolve(arr, kernel, mode='constant', cval=0)
-        has_top = convolve(arr, [[0, 0, 0], [0, 0, 0], [0, 1, 0]]) * arr
-        has_right = convolve(arr, [[0, 0, 0], [1, 0, 0], [0, 0, 0]]) * arr
-        has_left = convolve(arr, [[0, 0, 0], [0, 0, 1], [0, 0, 0]]) * arr
-        has_topright = convolve(arr, [[0, 0, 0], [0, 0, 0], [1, 0, 0]]) * arr
-        has_topleft = convolve(arr, [[0, 0, 0], [0, 0, 0], [0, 0, 1]]) * arr
-        has_topright = (has_topright.astype('i1', copy=False) - has_right - has_top).clip(0, 1).astype('u1', copy=False)
-        has_topleft = (has_topleft.astype('i1', copy=False) - has_left - has_top).clip(0, 1).astype('u1', copy=False)
-
-        def _build_neighbors_in_direction(mask, yx_vector):
-            has_indices = mask[yx_lst[:, 0], yx_lst[:, 1]].nonzero()[0]
-            neig_yx = yx_lst[has_indices] + yx_vector
-            neig = index[neig_yx[:, 0], neig_yx[:, 1]]
-            return np.c_[neig, has_indices]
-
-        edges_indices = np.vstack([
-            _build_neighbors_in_direction(has_top, (-1, 0)),
-            _build_neighbors_in_direction(has_right, (0, 1)),
-            _build_neighbors_in_direction(has_topright, (-1, 1)),
-            _build_neighbors_in_direction(has_topleft, (-1, -1)),
-        ])
-        if edges_indices.size == 0:
+        # Step 3: Build the graph of the pixels ************************************************* **
+        yx, edges = _tools.graph_of_skeleton(arr)
+        if edges.size == 0:
             return []
 
-        # Step 6: Convert segments made of indices to segments made of shapely objets *********** **
-        lines = []
-        for (n1, n2) in edges_indices:
-            yx1 = tuple(yx_lst[n1].tolist())
-            yx2 = tuple(yx_lst[n2].tolist())
-
-            if yx1 in squares2x2_yx_links and yx2 in squares2x2_yx_links:
-                # Drop segments inside 2x2 squares
-                continue
-            points = [
-                yx1,
-                yx2,
-            ]
-            if points[0] in squares2x2_yx_links:
-                points.insert(0, squares2x2_yx_links[points[0]])
-            if points[-1] in squares2x2_yx_links:
-                points.append(squares2x2_yx_links[points[-1]])
-            l = shapely.geometry.LineString(self.raster_to_spatial(
-                list(map(np.flipud, points))
-            ) + output_offset)
-            lines.append(l)
-
-        # Step 7: Merge segments to polylines *************************************************** **
+        # Step 4: Merge segments to polylines *************************************************** **
         if merge:
-            mline = shapely.ops.linemerge(lines)
-            if isinstance(mline, shapely.geometry.LineString):
-                mline = sg.MultiLineString([mline])
+            nodes, lengths = _tools.chains_of_graph(len(yx), edges)
+        else:
+            nodes, lengths = edges.ravel(), np.full(len(edges), 2)
 
-        # Step 8: Return ************************************************************************ **
-        if isinstance(mline, shapely.geometry.LineString):
-            return [mline]
-        if isinstance(mline, shapely.geometry.MultiLineString):
-            return list(mline.geoms)
-        assert False # pragma: no cover
+        # Step 5: Convert polylines made of indices to shapely objects ************************** **
+        xy = self.raster_to_spatial(yx[nodes][:, ::-1]) + output_offset
+        if hasattr(shapely, 'linestrings'):
+            # shapely>=2, vectorized construction
+            return list(shapely.linestrings(xy, indices=np.repeat(np.arange(len(lengths)), lengths)))
+        return [
+            sg.LineString(coords)
+            for coords in np.split(xy, np.cumsum(lengths)[:-1])
+        ]
 
-    def burn_lines(self, obj, all_touched=False, labelize=False):
-        """Creates a 2d image from lines. Uses gdal.Polygonize.
+    def burn_lines(self, obj, all_touched=False, labelize=False, out=None):
+        """Creates a 2d image from lines. Uses gdal.RasterizeLayer.
 
         Parameters
         ----------
         obj: shapely line or nested iterators over shapely lines
             ..
+        all_touched: bool
+            Burn all pixels touched by the lines
         labelize: bool
             - if `False`: Create a boolean mask
             - if `True`: Create an integer matrix containing lines indices from order in input
+        out: None or np.ndarray of shape (self.shape)
+            If provided, burn the lines in this array instead of a new one and return it. The
+            pixels not touched by the lines are left unchanged.
 
         Returns
         ----------
@@ -1736,11 +1800,6 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         """
         lines = list(_line_iterator(obj))
 
-        # https://svn.osgeo.org/gdal/trunk/autotest/alg/rasterize.py
-
-        sr_wkt = 'LOCAL_CS["arbitrary"]'
-        sr = osr.SpatialReference(sr_wkt)
-
         if labelize:
             if len(lines) > 255:
                 dtype = conv.dtype_of_any_downcast('int')
@@ -1748,39 +1807,14 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
                 dtype = conv.dtype_of_any_downcast('uint8')
         else:
             dtype = conv.dtype_of_any_downcast('bool')
-        gdt = conv.gdt_of_any_equiv(dtype) # Set to downcast
+        out = self._normalize_burn_out(out, dtype, labelize, len(lines))
 
-        target_ds = gdal.GetDriverByName('MEM').Create(
-            '', int(self.rsizex), int(self.rsizey), 1, gdt
-        )
-        target_ds.SetGeoTransform(self.gt)
-        target_ds.SetProjection(sr_wkt)
+        arr = self._burn_with_gdal(lines, dtype, all_touched)
+        mask = arr != 0
+        out[mask] = arr[mask]
+        return out
 
-        rast_ogr_ds = ogr.GetDriverByName('Memory').CreateDataSource('wrk')
-        rast_mem_lyr = rast_ogr_ds.CreateLayer('line', srs=sr)
-        val_field = ogr.FieldDefn('val', ogr.OFTInteger64)
-        rast_mem_lyr.CreateField(val_field)
-        for i, line in enumerate(lines, 1):
-            feat = ogr.Feature(rast_mem_lyr.GetLayerDefn())
-            wkt_geom = line.wkt
-            feat.SetGeometryDirectly(ogr.Geometry(wkt=wkt_geom))
-            feat.SetFieldInteger64(0, i)
-            rast_mem_lyr.CreateFeature(feat)
-
-        if all_touched:
-            options = ["ALL_TOUCHED=TRUE, ATTRIBUTE=val"]
-        else:
-            options = ["ATTRIBUTE=val"]
-
-        success, payload = Catch(gdal.RasterizeLayer, nonzero_int_is_error=True)(
-            target_ds, [1], rast_mem_lyr, options=options
-        )
-        if not success:
-            raise ValueError('Could not rasterize (gdal error: `{}`)'.format(payload[1]))
-        arr = target_ds.GetRasterBand(1).ReadAsArray()
-        return arr.astype(dtype, copy=False)
-
-    def find_polygons(self, mask):
+    def find_polygons(self, mask, tile_size=None, pool=None):
         """Creates a list of polygons from a mask. Uses gdal.Polygonize.
 
         .. warning::
@@ -1804,59 +1838,94 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
             ... # 0 1 1 1 1 1 1     returned with this method.
             ... # 0 0 0 0 0 0 0
 
+        Tiled mode
+        ----------
+        If `tile_size` is provided, or if `mask` is a raster, `self` is tiled and the tiles are
+        polygonized independently, possibly in parallel in `pool`. The polygons crossing the
+        seams between tiles are then merged. The mask is read tile by tile and never fully
+        loaded in memory when it is a raster.
+
+        The tiles are polygonized in pixel coordinates, so the edges on the seams match
+        exactly. The order of the polygons differs from the non-tiled mode.
+
         Parameters
         ----------
-        mask: np.ndarray of bool of shape (self.shape)
+        mask: np.ndarray of bool of shape (self.shape) or raster source
+            If a raster (like a GDALFileRaster or a recipe), its first channel is read on `self`,
+            the non-zero pixels being the features
+        tile_size: None or (int, int)
+            Size of the tiles in pixel, defaults to (1024, 1024) if `mask` is a raster
+        pool: None or multiprocessing.pool.ThreadPool
+            Pool where the tiles are read and polygonized. If None, they are processed in the
+            current thread.
 
         Returns
         -------
         list of shapely.geometry.Polygon
 
         """
-        if mask.shape != tuple(self.shape):
-            raise ValueError('Mask shape%s incompatible with self shape%s' % (
-                mask.shape, tuple(self.shape)
-            )) # pragma: no cover
-        mask = mask.astype('uint8', copy=False).clip(0, 1)
-        sr_wkt = 'LOCAL_CS["arbitrary"]'
-        sr = osr.SpatialReference(sr_wkt)
-
-        source_ds = gdal.GetDriverByName('MEM').Create(
-            '', int(self.rsizex), int(self.rsizey), 1, gdal.GDT_Byte
-        )
-        source_ds.SetGeoTransform(self.gt)
-        source_ds.SetProjection(sr_wkt)
-        source_ds.GetRasterBand(1).WriteArray(mask, 0, 0)
-
-        ogr_ds = ogr.GetDriverByName('Memory').CreateDataSource('wrk')
-        ogr_lyr = ogr_ds.CreateLayer('poly', srs=sr)
-        field_defn = ogr.FieldDefn('elev', ogr.OFTReal)
-        ogr_lyr.CreateField(field_defn)
-
-        success, payload = Catch(gdal.Polygonize, nonzero_int_is_error=True)(
-            srcBand=source_ds.GetRasterBand(1),
-            maskBand=source_ds.GetRasterBand(1),
-            outLayer=ogr_lyr,
-            iPixValField=0,
-        )
-        if not success:
-            raise ValueError('Could not polygonize (gdal error: `{}`)'.format(payload[1]))
-        del source_ds
-
-        def _polygon_iterator():
-            feat = ogr_lyr.GetNextFeature()
-            while feat is not None:
-                geometry = feat.geometry()
-                geometry = conv.shapely_of_ogr(geometry)
-                if not geometry.is_valid:
-                    geometry = geometry.buffer(0)
-                yield geometry
-                feat = ogr_lyr.GetNextFeature()
+        from buzzard._a_source_raster import ASourceRaster
+
+        is_raster = isinstance(mask, ASourceRaster)
+        if not is_raster:
+            mask = np.asarray(mask)
+            if mask.shape != tuple(self.shape):
+                raise ValueError('Mask shape%s incompatible with self shape%s' % (
+                    mask.shape, tuple(self.shape)
+                )) # pragma: no cover
+            if tile_size is None:
+                return _polygonize(mask, self.gt)
+        elif tile_size is None:
+            tile_size = (1024, 1024)
+        grid = self.tile_grid(tile_size, boundary_effect='shrink')
+
+        def _polygonize_tile(i):
+            x, y, w, h = (int(a.flat[i]) for a in [grid.rx, grid.ry, grid.rw, grid.rh])
+            if is_raster:
+                arr = mask.get_data(fp=grid.flat[i], channels=0)
+            else:
+                arr = mask[y:y + h, x:x + w]
+            polys = _polygonize(arr, (x, 1, 0, y, 0, 1))
+
+            # The polygons touching a seam are merged later
+            inside, on_seams = [], []
+            for poly in polys:
+                minx, miny, maxx, maxy = poly.bounds
+                if ((minx == x and x > 0) or (miny == y and y > 0) or
+                        (maxx == x + w and x + w < self.rsizex) or
+                        (maxy == y + h and y + h < self.rsizey)):
+                    on_seams.append(poly)
+                else:
+                    inside.append(poly)
+            return inside, on_seams
+
+        if pool is None:
+            results = map(_polygonize_tile, range(grid.size))
+        else:
+            results = pool.imap(_polygonize_tile, range(grid.size))
+        polys, on_seams = [], []
+        for inside, seam in results:
+            polys += inside
+            on_seams += seam
+
+        if on_seams:
+            merged = shapely.ops.unary_union(on_seams)
+            for poly in _poly_iterator(merged):
+                if not poly.is_valid:
+                    poly = poly.buffer(0)
+                polys.append(poly)
+
+        # From pixel coordinates to spatial coordinates
+        aff = self._aff
+        matrix = [aff.a, aff.b, aff.d, aff.e, aff.c, aff.f]
+        return [shapely.affinity.affine_transform(poly, matrix) for poly in polys]
 
-        return list(_polygon_iterator())
+    def burn_polygons(self, obj, all_touched=False, labelize=False, out=None):
+        """Creates a 2d image from polygons.
 
-    def burn_polygons(self, obj, all_touched=False, labelize=False):
-        """Creates a 2d image from polygons. Uses gdal.RasterizeLayer.
+        A pixel is burnt if its center is inside a polygon, or if it is touched by a polygon when
+        `all_touched` is True. The first case is computed with numpy from the coordinates of the
+        polygons, the second one uses gdal.RasterizeLayer.
 
         .. warning::
             This method is not equivalent to `cv2.drawContours` that considers that pixels are
@@ -1871,6 +1940,13 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
             ..
         all_touched: bool
             Burn all polygons touched
+        labelize: bool
+            - if `False`: Create a boolean mask
+            - if `True`: Create an integer matrix containing polygons indices from order in input,
+              the last polygon winning where polygons overlap
+        out: None or np.ndarray of shape (self.shape)
+            If provided, burn the polygons in this array instead of a new one and return it. The
+            pixels outside of the polygons are left unchanged.
 
         Returns
         ----------
@@ -1883,14 +1959,10 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         >>> burn_polygons(poly)
         >>> burn_polygons([poly, poly])
         >>> burn_polygons([poly, poly, [poly, poly], multipoly, poly])
+        >>> burn_polygons(polys, labelize=True, out=labels)
         """
         polys = list(_poly_iterator(obj))
 
-        # https://svn.osgeo.org/gdal/trunk/autotest/alg/rasterize.py
-
-        sr_wkt = 'LOCAL_CS["arbitrary"]'
-        sr = osr.SpatialReference(sr_wkt)
-
         if labelize:
             if len(polys) >= 65535:
                 dtype = conv.dtype_of_any_downcast('uint32')
@@ -1900,6 +1972,44 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
                 dtype = conv.dtype_of_any_downcast('uint8')
         else:
             dtype = conv.dtype_of_any_downcast('bool')
+        out = self._normalize_burn_out(out, dtype, labelize, len(polys))
+
+        if all_touched:
+            arr = self._burn_with_gdal(polys, dtype, all_touched)
+            mask = arr != 0
+            out[mask] = arr[mask]
+            return out
+
+        # Scanline rasterization of the rings, in raster coordinates
+        xy, ring_lengths, ring_labels = _tools.rings_of_polygons(polys)
+        aff = ~self._aff
+        xy = np.stack([
+            xy[:, 0] * aff.a + xy[:, 1] * aff.b + aff.c,
+            xy[:, 0] * aff.d + xy[:, 1] * aff.e + aff.f,
+        ], axis=-1)
+        rows, starts, ends, labels = _tools.spans_of_rings(
+            xy, ring_lengths, ring_labels, tuple(self.shape),
+        )
+        return _tools.burn_spans(out, rows, starts, ends, labels if labelize else None)
+
+    def _normalize_burn_out(self, out, dtype, labelize, count):
+        if out is None:
+            return np.zeros(tuple(self.shape), dtype)
+        if not isinstance(out, np.ndarray) or out.shape != tuple(self.shape):
+            raise ValueError('`out` should be a numpy array of shape {}'.format(
+                tuple(self.shape)
+            ))
+        if labelize and (out.dtype.kind not in 'iu' or np.iinfo(out.dtype).max < count):
+            raise ValueError('`out` of dtype {} cannot hold {} labels'.format(out.dtype, count))
+        return out
+
+    def _burn_with_gdal(self, geoms, dtype, all_touched):
+        """Rasterize shapely geometries with gdal.RasterizeLayer, the value burnt being the index
+        of the geometry (starting from 1)"""
+        # https://svn.osgeo.org/gdal/trunk/autotest/alg/rasterize.py
+
+        sr_wkt = 'LOCAL_CS["arbitrary"]'
+        sr = osr.SpatialReference(sr_wkt)
         gdt = conv.gdt_of_any_equiv(dtype) # Set to downcast
 
         target_ds = gdal.GetDriverByName('MEM').Create(
@@ -1909,19 +2019,21 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         target_ds.SetProjection(sr_wkt)
 
         rast_ogr_ds = ogr.GetDriverByName('Memory').CreateDataSource('wrk')
-        rast_mem_lyr = rast_ogr_ds.CreateLayer('polygon', srs=sr)
+        rast_mem_lyr = rast_ogr_ds.CreateLayer('geometry', srs=sr)
         val_field = ogr.FieldDefn('val', ogr.OFTInteger64)
         rast_mem_lyr.CreateField(val_field)
 
-        for i, poly in enumerate(polys, 1):
-            feat = ogr.Feature(rast_mem_lyr.GetLayerDefn())
-            wkt_geom = poly.wkt
-            feat.SetGeometryDirectly(ogr.Geometry(wkt=wkt_geom))
+        # Geometries are passed as WKB with a single feature definition, the WKT round trip
+        # dominates when burning many geometries
+        defn = rast_mem_lyr.GetLayerDefn()
+        for i, geom in enumerate(geoms, 1):
+            feat = ogr.Feature(defn)
+            feat.SetGeometryDirectly(ogr.CreateGeometryFromWkb(geom.wkb))
             feat.SetFieldInteger64(0, i)
             rast_mem_lyr.CreateFeature(feat)
 
         if all_touched:
-            options = ["ALL_TOUCHED=TRUE, ATTRIBUTE=val"]
+            options = ["ALL_TOUCHED=TRUE", "ATTRIBUTE=val"]
         else:
             options = ["ATTRIBUTE=val"]
 
@@ -1997,6 +2109,100 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
                 - with N the column count
 
         """
+        size, overlapx, overlapy = self._normalize_tile_parameters(
+            size, overlapx, overlapy, boundary_effect, boundary_effect_locus
+        )
+        return self._tile_unsafe(size, overlapx, overlapy, boundary_effect, boundary_effect_locus)
+
+    def tile_grid(self, size, overlapx=0, overlapy=0,
+                  boundary_effect='extend', boundary_effect_locus='br'):
+        """Tile a Footprint to a FootprintGrid, a compact alternative to the matrix of Footprint
+        returned by `tile`.
+
+        The tiles are stored as arrays of pixel offsets and sizes, and only created as Footprint
+        objects when accessed. Use this method for tilings of more than a few thousand tiles.
+
+        Parameters
+        ----------
+        see `tile` method
+
+        Returns
+        -------
+        FootprintGrid
+            - of shape (M, N)
+
+                - with M the line count
+                - with N the column count
+
+        Example
+        -------
+        >>> grid = fp.tile_grid((512, 512))
+        >>> tile = grid[0, 0]
+        >>> tiles_in_aoi = grid[grid.share_area(aoi)]
+
+        """
+        from buzzard._footprint_grid import FootprintGrid
+
+        size, overlapx, overlapy = self._normalize_tile_parameters(
+            size, overlapx, overlapy, boundary_effect, boundary_effect_locus
+        )
+        xs, widths, ys, heights = self._tile_axes_unsafe(
+            size, overlapx, overlapy, boundary_effect, boundary_effect_locus
+        )
+        return FootprintGrid.of_axes(self, xs, widths, ys, heights)
+
+    def iter_tiles(self, size, overlapx=0, overlapy=0,
+                   boundary_effect='extend', boundary_effect_locus='br', order='row'):
+        """Tile a Footprint lazily, the tiles are created while iterating.
+
+        The memory used does not depend on the number of tiles, this method is suited to
+        tilings too large to be stored.
+
+        Parameters
+        ----------
+        size, overlapx, overlapy, boundary_effect, boundary_effect_locus:
+            see `tile` method
+        order: {'row', 'column', 'zorder', 'hilbert'}
+            Order in which the tiles are generated
+
+            - 'row': Row by row, like `tile(...).flat`
+            - 'column': Column by column, like `tile(...).T.flat`
+            - 'zorder': Following a Z-order (Morton) curve
+            - 'hilbert': Following a Hilbert curve, two consecutive tiles are always neighbors
+              if the tiling is a square of side a power of two
+
+            The 'zorder' and 'hilbert' orders keep close tiles close in the sequence, which
+            improves the reuse of the caches when reading a raster tile by tile.
+
+        Returns
+        -------
+        TileIterable
+            An iterable of Footprint, with a `len` and a `shape` (the shape of `tile`).
+            It can be iterated several times.
+
+        Example
+        -------
+        >>> tiles = fp.iter_tiles((512, 512), order='hilbert')
+        >>> len(tiles)
+        1200
+        >>> for tile in tiles:
+        ...     process(ds.ortho.get_data(tile))
+
+        """
+        size, overlapx, overlapy = self._normalize_tile_parameters(
+            size, overlapx, overlapy, boundary_effect, boundary_effect_locus
+        )
+        if order not in TileIterable._ORDERS:
+            raise ValueError('order(%s) should be one of %s' % (
+                order, TileIterable._ORDERS
+            ))
+        xs, widths, ys, heights = self._tile_axes_unsafe(
+            size, overlapx, overlapy, boundary_effect, boundary_effect_locus
+        )
+        return TileIterable(self, xs, widths, ys, heights, order)
+
+    def _normalize_tile_parameters(self, size, overlapx, overlapy, boundary_effect,
+                                   boundary_effect_locus):
         size = np.asarray(size, dtype=int)
         overlapx = int(overlapx)
         overlapy = int(overlapy)
@@ -2021,7 +2227,7 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
             raise ValueError('boundary_effect_locus(%s) should be one of %s' % (
                 boundary_effect_locus, self._TILE_BOUNDARY_EFFECT_LOCI
             ))
-        return self._tile_unsafe(size, overlapx, overlapy, boundary_effect, boundary_effect_locus)
+        return size, overlapx, overlapy
 
     def tile_count(self, rowcount, colcount, overlapx=0, overlapy=0,
                    boundary_effect='extend', boundary_effect_locus='br'):
@@ -2291,11 +2497,13 @@ class Footprint(TileMixin, IntersectionMixin, MoveMixin):
         return (_restore, (self.gt, self.rsize))
 
     def __hash__(self):
-        # TODO: Speed test and optimize
-        return hash((
-            self._aff.to_gdal(),
-            tuple(self._rsize.tolist()),
-        ))
+        # Computed once, Footprints are used as dict keys in the scheduler
+        if self._hash is None:
+            self._hash = hash((
+                self._aff.to_gdal(),
+                tuple(self._rsize.tolist()),
+            ))
+        return self._hash
 
     # Convolutions ****************************************************************************** **
     def forward_conv2d(self, kernel_size, stride=1, padding=0, dilation=1):
@@ -2675,6 +2883,65 @@ def _poly_iterator(obj):
                 for poly in _poly_iterator(obj2):
                     yield poly
 
+def _polygonize(mask, gt):
+    """Polygonize the non-zero pixels of a 2d mask georeferenced with `gt`"""
+    mask = mask.astype('uint8', copy=False).clip(0, 1)
+    sr_wkt = 'LOCAL_CS["arbitrary"]'
+    sr = osr.SpatialReference(sr_wkt)
+
+    source_ds = gdal.GetDriverByName('MEM').Create(
+        '', int(mask.shape[1]), int(mask.shape[0]), 1, gdal.GDT_Byte
+    )
+    source_ds.SetGeoTransform(gt)
+    source_ds.SetProjection(sr_wkt)
+    source_ds.GetRasterBand(1).WriteArray(mask, 0, 0)
+
+    ogr_ds = ogr.GetDriverByName('Memory').CreateDataSource('wrk')
+    ogr_lyr = ogr_ds.CreateLayer('poly', srs=sr)
+    field_defn = ogr.FieldDefn('elev', ogr.OFTReal)
+    ogr_lyr.CreateField(field_defn)
+
+    success, payload = Catch(gdal.Polygonize, nonzero_int_is_error=True)(
+        srcBand=source_ds.GetRasterBand(1),
+        maskBand=source_ds.GetRasterBand(1),
+        outLayer=ogr_lyr,
+        iPixValField=0,
+    )
+    if not success:
+        raise ValueError('Could not polygonize (gdal error: `{}`)'.format(payload[1]))
+    del source_ds
+
+    def _polygon_iterator():
+        feat = ogr_lyr.GetNextFeature()
+        while feat is not None:
+            geometry = feat.geometry()
+            geometry = conv.shapely_of_ogr(geometry)
+            if not geometry.is_valid:
+                geometry = geometry.buffer(0)
+            yield geometry
+            feat = ogr_lyr.GetNextFeature()
+
+    return list(_polygon_iterator())
+
+def _thin_tiled(fp, arr, tile_size, pool, margin):
+    """Thin `arr` tile by tile, each tile being thinned with a margin"""
+    out = np.zeros(arr.shape, bool)
+    grid = fp.tile_grid(tile_size, boundary_effect='shrink')
+
+    def _thin_tile(i):
+        x, y, w, h = (int(a.flat[i]) for a in [grid.rx, grid.ry, grid.rw, grid.rh])
+        x0, y0 = max(x - margin, 0), max(y - margin, 0)
+        x1, y1 = min(x + w + margin, arr.shape[1]), min(y + h + margin, arr.shape[0])
+        thinned = skm.thin(arr[y0:y1, x0:x1])
+        out[y:y + h, x:x + w] = thinned[y - y0:y - y0 + h, x - x0:x - x0 + w]
+
+    if pool is None:
+        for i in range(grid.size):
+            _thin_tile(i)
+    else:
+        pool.map(_thin_tile, range(grid.size))
+    return out
+
 def _restore(gt, rsize):
     return Footprint(gt=gt, rsize=rsize)
 
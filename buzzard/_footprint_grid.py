@@ -0,0 +1,240 @@
+""">>> help(FootprintGrid)"""
+
+import numpy as np
+
+class FootprintGrid(object):
+    """Immutable array of Footprints lying on the grid of a `parent` Footprint, stored as integer
+    arrays of pixel offsets and sizes relative to that parent.
+
+    A FootprintGrid behaves like the numpy array of Footprint returned by `Footprint.tile`
+    (`shape`, `flat`, indexing, iteration), but the tiles are only materialized as Footprint
+    objects when they are accessed. Creating and querying a tiling of millions of tiles thus takes
+    milliseconds and a few bytes per tile.
+
+    >>> grid = fp.tile_grid((512, 512))
+    >>> grid.shape
+    (40, 30)
+    >>> tile = grid[3, 4] # A Footprint
+    >>> grid.intersecting(aoi) # Indices of the tiles sharing area with `aoi`
+
+    Parameters
+    ----------
+    parent: Footprint
+        The reference of the pixel offsets
+    rx, ry: array of int
+        Pixel offsets of the top left corners of the tiles in `parent`, may be negative
+    rw, rh: array of int
+        Sizes of the tiles in pixel, broadcasted against `rx` and `ry`
+    """
+
+    __slots__ = ['_parent', '_rx', '_ry', '_rw', '_rh']
+
+    def __init__(self, parent, rx, ry, rw, rh):
+        rx, ry, rw, rh = np.broadcast_arrays(*[
+            np.asarray(a, dtype='int64') for a in [rx, ry, rw, rh]
+        ])
+        if (rw <= 0).any() or (rh <= 0).any():
+            raise ValueError('The sizes of the tiles should be > 0')
+        self._parent = parent
+        self._rx, self._ry, self._rw, self._rh = [
+            np.array(a, copy=True) for a in [rx, ry, rw, rh]
+        ]
+        for a in [self._rx, self._ry, self._rw, self._rh]:
+            a.flags.writeable = False
+
+    @classmethod
+    def of_axes(cls, parent, xs, widths, ys, heights):
+        """Create the FootprintGrid of shape (len(ys), len(xs)) where the tiles of a column share
+        the same `x` and `width`, and the tiles of a row share the same `y` and `height`."""
+        xs, widths, ys, heights = [np.asarray(a, dtype='int64') for a in [xs, widths, ys, heights]]
+        return cls(
+            parent,
+            xs[np.newaxis, :], ys[:, np.newaxis],
+            widths[np.newaxis, :], heights[:, np.newaxis],
+        )
+
+    @classmethod
+    def of_footprints(cls, parent, fps):
+        """Create a FootprintGrid from an array of Footprint, all on the same grid as `parent`"""
+        fps = np.asarray(fps, dtype=object)
+        if fps.size == 0:
+            zeros = np.zeros(fps.shape, 'int64')
+            return cls(parent, zeros, zeros, zeros + 1, zeros + 1)
+        for fp in fps.flat:
+            if not isinstance(fp, parent.__class__):
+                raise TypeError('`fps` should only contain Footprints') # pragma: no cover
+            if not parent.same_grid(fp):
+                raise ValueError('All the Footprints should be on the same grid as `parent`')
+        rtls = parent.spatial_to_raster_many(fps)
+        rsizes = np.asarray([fp.rsize for fp in fps.flat]).reshape(fps.shape + (2,))
+        return cls(parent, rtls[..., 0], rtls[..., 1], rsizes[..., 0], rsizes[..., 1])
+
+    # Accessors ********************************************************************************* **
+    @property
+    def parent(self):
+        """The Footprint of reference of the pixel offsets"""
+        return self._parent
+
+    @property
+    def shape(self):
+        return self._rx.shape
+
+    @property
+    def ndim(self):
+        return self._rx.ndim
+
+    @property
+    def size(self):
+        return self._rx.size
+
+    def __len__(self):
+        return len(self._rx)
+
+    @property
+    def rx(self):
+        """Pixel offsets of the left of the tiles in `parent`"""
+        return self._rx
+
+    @property
+    def ry(self):
+        """Pixel offsets of the top of the tiles in `parent`"""
+        return self._ry
+
+    @property
+    def rw(self):
+        """Widths of the tiles in pixel"""
+        return self._rw
+
+    @property
+    def rh(self):
+        """Heights of the tiles in pixel"""
+        return self._rh
+
+    @property
+    def rtl(self):
+        """Pixel offsets of the top left of the tiles in `parent`, of shape (..., 2)"""
+        return np.stack([self._rx, self._ry], axis=-1)
+
+    @property
+    def rbr(self):
+        """Pixel offsets of the bottom right of the tiles in `parent`, of shape (..., 2)"""
+        return np.stack([self._rx + self._rw, self._ry + self._rh], axis=-1)
+
+    @property
+    def rsize(self):
+        """Sizes of the tiles in pixel, of shape (..., 2)"""
+        return np.stack([self._rw, self._rh], axis=-1)
+
+    @property
+    def rarea(self):
+        """Pixel counts of the tiles"""
+        return self._rw * self._rh
+
+    # Footprint materialization ***************************************************************** **
+    def __getitem__(self, key):
+        """Index like a numpy array, returns a Footprint if a single tile is selected, a
+        FootprintGrid otherwise"""
+        rx = self._rx[key]
+        if rx.ndim == 0:
+            return self._footprint(rx, self._ry[key], self._rw[key], self._rh[key])
+        return self.__class__(self._parent, rx, self._ry[key], self._rw[key], self._rh[key])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def flat(self):
+        """Flat iterator over the tiles, as Footprints. Supports `len` and integer indexing."""
+        return _FlatIter(self)
+
+    def to_ndarray(self):
+        """Materialize all the tiles, returns an array of Footprint with the same shape as self
+        (like `Footprint.tile`)"""
+        arr = np.empty(self.shape, dtype=object)
+        for i, fp in enumerate(self.flat):
+            arr.flat[i] = fp
+        return arr
+
+    def _footprint(self, x, y, w, h):
+        return self._parent._footprint_of_raster_rect(x, y, w, h)
+
+    # Queries *********************************************************************************** **
+    def rebase(self, parent):
+        """Express the same tiles relatively to another `parent` on the same grid"""
+        if not self._parent.same_grid(parent):
+            raise ValueError('`parent` should be on the same grid as the current parent')
+        dx, dy = parent.spatial_to_raster(self._parent.tl)
+        return self.__class__(parent, self._rx + dx, self._ry + dy, self._rw, self._rh)
+
+    def _rect_of(self, fp):
+        """Pixel rectangle (x0, y0, x1, y1) of `fp` in `parent`, as floats if not on the grid"""
+        if self._parent.same_grid(fp):
+            x0, y0 = self._parent.spatial_to_raster(fp.tl)
+            x1, y1 = np.asarray([x0, y0]) + fp.rsize
+            return x0, y0, x1, y1
+        corners = self._parent.spatial_to_raster(fp.coords, dtype='float64')
+        (x0, y0), (x1, y1) = corners.min(axis=0), corners.max(axis=0)
+        return x0, y0, x1, y1
+
+    def share_area(self, other):
+        """Vectorized `Footprint.share_area`, returns an array of bool with the same shape as self
+
+        Parameters
+        ----------
+        other: Footprint
+        """
+        x0, y0, x1, y1 = self._rect_of(other)
+        mask = (
+            (self._rx < x1) & (x0 < self._rx + self._rw) &
+            (self._ry < y1) & (y0 < self._ry + self._rh)
+        )
+        if not self._parent.same_grid(other):
+            # The test above is only exact between rectangles on the same grid
+            for i in np.flatnonzero(mask):
+                mask.flat[i] = self.flat[i].share_area(other)
+        return mask
+
+    def intersecting(self, other):
+        """Indices of the tiles sharing area with `other`, like `numpy.nonzero`"""
+        return np.nonzero(self.share_area(other))
+
+    def slice_in(self, other, clip=False):
+        """Vectorized `Footprint.slice_in`, `other` should be on the same grid as `parent`.
+
+        Returns
+        -------
+        (starty, endy, startx, endx): (ndarray, ndarray, ndarray, ndarray)
+            Arrays of int with the same shape as self, `tiles[i].slice_in(other)` being
+            `(slice(starty[i], endy[i]), slice(startx[i], endx[i]))`
+        """
+        if not self._parent.same_grid(other):
+            raise ValueError('`other` should be on the same grid as `parent`')
+        dx, dy = other.spatial_to_raster(self._parent.tl)
+        startx, starty = self._rx + dx, self._ry + dy
+        endx, endy = startx + self._rw, starty + self._rh
+        if clip:
+            startx = startx.clip(0, other.rsizex)
+            endx = endx.clip(0, other.rsizex)
+            starty = starty.clip(0, other.rsizey)
+            endy = endy.clip(0, other.rsizey)
+        return starty, endy, startx, endx
+
+    def __repr__(self):
+        return 'FootprintGrid(shape={}, parent={!r})'.format(self.shape, self._parent)
+
+class _FlatIter(object):
+    def __init__(self, grid):
+        self._grid = grid
+
+    def __len__(self):
+        return self._grid.size
+
+    def __iter__(self):
+        g = self._grid
+        for x, y, w, h in zip(g.rx.flat, g.ry.flat, g.rw.flat, g.rh.flat):
+            yield g._footprint(x, y, w, h)
+
+    def __getitem__(self, i):
+        g = self._grid
+        return g._footprint(g.rx.flat[i], g.ry.flat[i], g.rw.flat[i], g.rh.flat[i])
@@ -0,0 +1,290 @@
+""">>> help(FootprintIndex)"""
+
+import numpy as np
+import rtree.index
+import shapely.geometry as sg
+
+from buzzard._footprint import Footprint
+from buzzard._footprint_grid import FootprintGrid
+
+class FootprintIndex(object):
+    """Immutable spatial index over an array of Footprints, to find the ones that share area with a
+    Footprint or a shapely geometry, or that contain points.
+
+    The strategy is chosen at construction:
+
+    - 'grid': The Footprints lie on the same grid and form a regular tiling, like the outputs of
+      `Footprint.tile` and `Footprint.tile_grid`. The queries are answered with arithmetic on the
+      pixel bounds of the rows and columns, without any tree.
+    - 'aligned': The Footprints lie on the same grid. An rtree in pixel coordinates is used.
+    - 'rtree': An rtree over the spatial bounds of the Footprints is used, the candidates are then
+      checked exactly.
+
+    The results are flat indices in the array of Footprints, use `np.unravel_index(indices,
+    index.shape)` to get the indices in the array.
+
+    >>> tiles = fp.tile_grid((512, 512))
+    >>> index = buzz.FootprintIndex(tiles)
+    >>> index.query(aoi) # Flat indices of the tiles sharing area with `aoi`
+    >>> index.query_bulk(tiles2) # Pairs of indices (in `tiles2`, in `tiles`)
+    >>> index.query_points(xy) # Pairs of indices (in `xy`, in `tiles`)
+
+    Parameters
+    ----------
+    fps: FootprintGrid or array_like of Footprint
+        The Footprints to index, of any shape
+    """
+
+    def __init__(self, fps):
+        if isinstance(fps, FootprintGrid):
+            grid = fps
+            fps = None
+        else:
+            fps = np.asarray(fps, dtype=object)
+            for fp in fps.flat:
+                if not isinstance(fp, Footprint):
+                    raise TypeError('`fps` should only contain Footprints')
+            grid = None
+            if fps.size and all(fps.flat[0].same_grid(fp) for fp in fps.flat):
+                grid = FootprintGrid.of_footprints(fps.flat[0], fps)
+
+        self._grid = grid
+        self._fps = fps
+        self._shape = grid.shape if grid is not None else fps.shape
+        self._axes = None
+        self._rtree = None
+
+        if grid is not None:
+            self._axes = _axes_of_grid(grid)
+            if self._axes is not None:
+                self._mode = 'grid'
+            else:
+                self._mode = 'aligned'
+                self._rtree = _build_rtree(np.c_[
+                    grid.rx.ravel(), grid.ry.ravel(),
+                    (grid.rx + grid.rw).ravel(), (grid.ry + grid.rh).ravel(),
+                ])
+        else:
+            self._mode = 'rtree'
+            self._rtree = _build_rtree(np.asarray([fp.bounds for fp in fps.flat]).reshape(-1, 4))
+
+    # Accessors ********************************************************************************* **
+    @property
+    def shape(self):
+        """Shape of the array of Footprints indexed"""
+        return self._shape
+
+    @property
+    def size(self):
+        """Number of Footprints indexed"""
+        return int(np.prod(self._shape))
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def mode(self):
+        """Strategy used, one of {'grid', 'aligned', 'rtree'}"""
+        return self._mode
+
+    def footprint(self, i):
+        """Footprint at the flat index `i`"""
+        if self._fps is not None:
+            return self._fps.flat[i]
+        return self._grid.flat[i]
+
+    # Queries *********************************************************************************** **
+    def query(self, obj):
+        """Find the Footprints sharing area with `obj`
+
+        Parameters
+        ----------
+        obj: Footprint or shapely geometry
+
+        Returns
+        -------
+        np.ndarray of int
+            Sorted flat indices of the Footprints
+        """
+        if isinstance(obj, Footprint):
+            if self._grid is not None and self._grid.parent.same_grid(obj):
+                return self._query_rect(*self._grid._rect_of(obj))
+            poly = obj.poly
+        elif isinstance(obj, sg.base.BaseGeometry):
+            poly = obj
+        else:
+            raise TypeError('`obj` should be a Footprint or a shapely geometry')
+
+        if poly.is_empty:
+            return np.empty(0, int)
+        minx, miny, maxx, maxy = poly.bounds
+        corners = np.asarray([[minx, miny], [minx, maxy], [maxx, maxy], [maxx, miny]])
+        if self._grid is not None:
+            # Bounding box of the envelope in pixel coordinates
+            corners = self._grid.parent.spatial_to_raster(corners, dtype='float64')
+            (x0, y0), (x1, y1) = corners.min(axis=0), corners.max(axis=0)
+            candidates = self._query_rect(x0, y0, x1, y1)
+        else:
+            candidates = self._rtree_candidates((minx, miny, maxx, maxy))
+        keep = [
+            _share_area(self.footprint(i).poly, poly)
+            for i in candidates
+        ]
+        return candidates[np.asarray(keep, dtype=bool)]
+
+    def query_bulk(self, objs):
+        """Vectorized `query`
+
+        Parameters
+        ----------
+        objs: FootprintGrid or array_like of Footprint or shapely geometry
+
+        Returns
+        -------
+        np.ndarray of int of shape (2, n)
+            Pairs of flat indices, in `objs` and in the Footprints indexed
+        """
+        if isinstance(objs, FootprintGrid):
+            if self._mode == 'grid' and self._grid.parent.same_grid(objs.parent):
+                # Fully vectorized path
+                objs = objs.rebase(self._grid.parent)
+                return self._query_rects(
+                    objs.rx.ravel(), objs.ry.ravel(),
+                    (objs.rx + objs.rw).ravel(), (objs.ry + objs.rh).ravel(),
+                )
+            objs = list(objs.flat)
+        elif isinstance(objs, np.ndarray):
+            if self._mode == 'grid':
+                try:
+                    grid = FootprintGrid.of_footprints(self._grid.parent, objs)
+                except (TypeError, ValueError):
+                    pass
+                else:
+                    return self.query_bulk(grid)
+            objs = list(objs.flat)
+        else:
+            objs = list(objs)
+        pairs = [
+            np.stack([np.full(len(indices), i), indices])
+            for i, indices in enumerate(map(self.query, objs))
+        ]
+        if not pairs:
+            return np.empty((2, 0), int)
+        return np.concatenate(pairs, axis=1)
+
+    def query_points(self, xy):
+        """Find the Footprints containing points. A point on an edge between two Footprints
+        belongs to the right/bottom one, like in `Footprint.spatial_to_raster`.
+
+        Parameters
+        ----------
+        xy: sequence of numbers of shape (..., 2)
+            Spatial coordinates
+
+        Returns
+        -------
+        np.ndarray of int of shape (2, n)
+            Pairs of flat indices, in `xy.reshape(-1, 2)` and in the Footprints indexed
+        """
+        xy = np.asarray(xy, dtype='float64').reshape(-1, 2)
+        if self._mode == 'grid':
+            pxy = self._grid.parent.spatial_to_raster(xy, dtype='float64')
+            (xstarts, xends), (ystarts, yends) = self._axes
+            xlo = np.searchsorted(xends, pxy[:, 0], 'right')
+            xhi = np.searchsorted(xstarts, pxy[:, 0], 'right')
+            ylo = np.searchsorted(yends, pxy[:, 1], 'right')
+            yhi = np.searchsorted(ystarts, pxy[:, 1], 'right')
+            return _expand_ranges(xlo, xhi, ylo, yhi, self._shape)
+
+        pairs = []
+        for i, pt in enumerate(xy):
+            if self._mode == 'aligned':
+                pxy = self._grid.parent.spatial_to_raster(pt, dtype='float64')
+                candidates = self._rtree_candidates(tuple(pxy) * 2)
+                rx, ry = self._grid.rx.flat[candidates], self._grid.ry.flat[candidates]
+                rw, rh = self._grid.rw.flat[candidates], self._grid.rh.flat[candidates]
+                keep = (rx <= pxy[0]) & (pxy[0] < rx + rw) & (ry <= pxy[1]) & (pxy[1] < ry + rh)
+            else:
+                candidates = self._rtree_candidates(tuple(pt) * 2)
+                keep = np.asarray([
+                    _contains_point(self.footprint(j), pt)
+                    for j in candidates
+                ], dtype=bool)
+            candidates = candidates[keep]
+            pairs.append(np.stack([np.full(len(candidates), i), candidates]))
+        if not pairs:
+            return np.empty((2, 0), int)
+        return np.concatenate(pairs, axis=1)
+
+    def _query_rect(self, x0, y0, x1, y1):
+        """Flat indices of the Footprints sharing area with a rectangle in pixel coordinates"""
+        if self._mode == 'grid':
+            return self._query_rects(*[np.asarray([v], dtype='float64') for v in [x0, y0, x1, y1]])[1]
+        candidates = self._rtree_candidates((x0, y0, x1, y1))
+        g = self._grid
+        rx, ry = g.rx.flat[candidates], g.ry.flat[candidates]
+        rw, rh = g.rw.flat[candidates], g.rh.flat[candidates]
+        keep = (rx < x1) & (x0 < rx + rw) & (ry < y1) & (y0 < ry + rh)
+        return candidates[keep]
+
+    def _query_rects(self, x0, y0, x1, y1):
+        """Grid arithmetic: A row/column shares area with [start, end) if `start < end_i` and
+        `end > start_i`, the starts and the ends of the rows/columns being sorted"""
+        (xstarts, xends), (ystarts, yends) = self._axes
+        xlo = np.searchsorted(xends, x0, 'right')
+        xhi = np.searchsorted(xstarts, x1, 'left')
+        ylo = np.searchsorted(yends, y0, 'right')
+        yhi = np.searchsorted(ystarts, y1, 'left')
+        return _expand_ranges(xlo, xhi, ylo, yhi, self._shape)
+
+    def _rtree_candidates(self, bounds):
+        candidates = np.fromiter(self._rtree.intersection(tuple(bounds)), dtype=int)
+        candidates.sort()
+        return candidates
+
+    def __repr__(self):
+        return 'FootprintIndex(shape={}, mode={!r})'.format(self._shape, self._mode)
+
+def _axes_of_grid(grid):
+    """Sorted pixel bounds of the columns and rows of a 2d grid forming a regular tiling, or None"""
+    if grid.ndim != 2 or grid.size == 0:
+        return None
+    rx, ry, rw, rh = grid.rx, grid.ry, grid.rw, grid.rh
+    if not ((rx == rx[:1]).all() and (rw == rw[:1]).all() and
+            (ry == ry[:, :1]).all() and (rh == rh[:, :1]).all()):
+        return None
+    xstarts, xends = rx[0], rx[0] + rw[0]
+    ystarts, yends = ry[:, 0], ry[:, 0] + rh[:, 0]
+    for a in [xstarts, xends, ystarts, yends]:
+        if (np.diff(a) < 0).any():
+            return None
+    return (xstarts, xends), (ystarts, yends)
+
+def _expand_ranges(xlo, xhi, ylo, yhi, shape):
+    """Convert ranges of columns and rows, one per query, to pairs of (query index, flat index)"""
+    xcount = (xhi - xlo).clip(0, None)
+    ycount = (yhi - ylo).clip(0, None)
+    counts = xcount * ycount
+    total = int(counts.sum())
+    query = np.repeat(np.arange(len(counts)), counts)
+    rank = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    xcount_q = xcount[query]
+    cols = xlo[query] + rank % np.maximum(xcount_q, 1)
+    rows = ylo[query] + rank // np.maximum(xcount_q, 1)
+    return np.stack([query, rows * shape[1] + cols]).astype(int)
+
+def _build_rtree(bounds):
+    if len(bounds) == 0:
+        return rtree.index.Index()
+    # Bulk loading is much faster than inserting the Footprints one by one
+    return rtree.index.Index(
+        (i, tuple(b), None)
+        for i, b in enumerate(bounds.tolist())
+    )
+
+def _share_area(a, b):
+    return not a.disjoint(b) and not a.touches(b)
+
+def _contains_point(fp, xy):
+    pxy = fp.spatial_to_raster(xy, dtype='float64')
+    return bool(((0 <= pxy) & (pxy < fp.rsize)).all())
@@ -173,10 +173,7 @@ class IntersectionMixin(object):
             rsize = rsize.clip(1, np.iinfo(int).max)
 
         assert (rsize > 0).all()
-        return self.__class__(
-            gt=aff.to_gdal(),
-            rsize=rsize,
-        )
+        return self._of_affine(aff, rsize)
 
 def _exterior_coords_iterator(geom):
     if isinstance(geom, sg.Point):
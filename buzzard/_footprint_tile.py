@@ -1,5 +1,6 @@
 """>>> help(TileMixin)"""
 
+import affine
 import numpy as np
 
 class TileMixin(object):
@@ -123,7 +124,7 @@ class TileMixin(object):
             if gap != 0:
                 yield self.rsizey - gap - overlapy, gap + overlapy
 
-    def _tile_unsafe(self, size, overlapx, overlapy, boundary_effect, boundary_effect_locus):
+    def _tile_gens(self, size, overlapx, overlapy, boundary_effect):
         if boundary_effect == 'extend':
             gen_xinfo = self._tile_extend_deltax_gen(size[0], overlapx)
             gen_yinfo = self._tile_extend_deltay_gen(size[1], overlapy)
@@ -141,6 +142,36 @@ class TileMixin(object):
             gen_yinfo = self._tile_raise_deltay_gen(size[1], overlapy)
         else:
             assert False # pragma: no cover
+        return gen_xinfo, gen_yinfo
+
+    def _tile_axes_unsafe(self, size, overlapx, overlapy, boundary_effect, boundary_effect_locus):
+        """Compute the pixel offsets and sizes of the columns and the rows of a tiling, in the
+        same order as `_tile_unsafe`, without creating any Footprint"""
+        gen_xinfo, gen_yinfo = self._tile_gens(size, overlapx, overlapy, boundary_effect)
+        xinfos = np.asarray(list(gen_xinfo), dtype='int64').reshape(-1, 2)
+        yinfos = np.asarray(list(gen_yinfo), dtype='int64').reshape(-1, 2)
+
+        # Mirror the axes on which the tiling starts from the bottom/right
+        if boundary_effect_locus in {'tl', 'bl'}:
+            xinfos[:, 0] = self.rsizex - xinfos[:, 0] - xinfos[:, 1]
+            xinfos = xinfos[::-1]
+        if boundary_effect_locus in {'tl', 'tr'}:
+            yinfos[:, 0] = self.rsizey - yinfos[:, 0] - yinfos[:, 1]
+            yinfos = yinfos[::-1]
+        return xinfos[:, 0], xinfos[:, 1], yinfos[:, 0], yinfos[:, 1]
+
+    def _footprint_of_raster_rect(self, x, y, w, h):
+        """Create the Footprint of the `w x h` pixels at `x, y` in self, pixels outside of self
+        allowed"""
+        tl = self.pxlrvec * int(x) + self.pxtbvec * int(y) + self.tl
+        a, b, _, d, e, _ = self._aff[:6]
+        return self._of_affine(
+            affine.Affine(a, b, tl[0], d, e, tl[1]),
+            (int(w), int(h)),
+        )
+
+    def _tile_unsafe(self, size, overlapx, overlapy, boundary_effect, boundary_effect_locus):
+        gen_xinfo, gen_yinfo = self._tile_gens(size, overlapx, overlapy, boundary_effect)
 
         if boundary_effect_locus == 'br':
             origin = self.tl
@@ -167,9 +198,9 @@ class TileMixin(object):
             tl -= rsize * (direction == -1) * (1, -1) # I don't get this line :'(
             gt[0] = tl[0]
             gt[3] = tl[1]
-            return self.__class__(
-                gt=gt,
-                rsize=rsize,
+            return self._of_affine(
+                affine.Affine.from_gdal(*gt),
+                rsize,
             )
 
         infoxs = list(gen_xinfo)
@@ -196,3 +227,97 @@ class TileMixin(object):
         if direction[1] == -1:
             tiles = np.flipud(tiles)
         return tiles
+
+class TileIterable(object):
+    """Lazy sequence of the tiles of a Footprint, returned by `Footprint.iter_tiles`.
+
+    Only the offsets of the rows and columns of the tiling are kept in memory, the tiles are
+    created while iterating. `len` and `shape` are available without iterating.
+    """
+
+    _ORDERS = {'row', 'column', 'zorder', 'hilbert'}
+
+    def __init__(self, fp, xs, widths, ys, heights, order):
+        self._fp = fp
+        self._xs, self._widths, self._ys, self._heights = xs, widths, ys, heights
+        self._order = order
+
+    @property
+    def shape(self):
+        """Shape of the tiling, as returned by `Footprint.tile`"""
+        return len(self._ys), len(self._xs)
+
+    @property
+    def order(self):
+        return self._order
+
+    def __len__(self):
+        return len(self._ys) * len(self._xs)
+
+    def indices(self):
+        """Generate the (row, column) indices of the tiles, in iteration order"""
+        nrows, ncols = self.shape
+        if self._order == 'row':
+            return ((i, j) for i in range(nrows) for j in range(ncols))
+        elif self._order == 'column':
+            return ((i, j) for j in range(ncols) for i in range(nrows))
+        elif self._order == 'zorder':
+            return _zorder_indices(nrows, ncols)
+        elif self._order == 'hilbert':
+            return _hilbert_indices(nrows, ncols)
+        else:
+            assert False # pragma: no cover
+
+    def __iter__(self):
+        fp = self._fp
+        xs, widths, ys, heights = self._xs, self._widths, self._ys, self._heights
+        for i, j in self.indices():
+            yield fp._footprint_of_raster_rect(xs[j], ys[i], widths[j], heights[i])
+
+    def __repr__(self):
+        return 'TileIterable(shape={}, order={!r})'.format(self.shape, self._order)
+
+def _zorder_indices(nrows, ncols):
+    """Generate the (row, col) indices of a `nrows x ncols` matrix following a Z-order curve"""
+    side = 1
+    while side < max(nrows, ncols):
+        side *= 2
+    stack = [(0, 0, side)]
+    while stack:
+        x0, y0, side = stack.pop()
+        if x0 >= ncols or y0 >= nrows:
+            continue
+        if side == 1:
+            yield y0, x0
+            continue
+        half = side // 2
+        stack.extend([
+            (x0 + half, y0 + half, half),
+            (x0, y0 + half, half),
+            (x0 + half, y0, half),
+            (x0, y0, half),
+        ])
+
+def _hilbert_indices(nrows, ncols):
+    """Generate the (row, col) indices of a `nrows x ncols` matrix following a Hilbert curve"""
+    side = 1
+    while side < max(nrows, ncols):
+        side *= 2
+    # A node is a square defined by a corner and two vectors: (x0, y0, xi, xj, yi, yj)
+    stack = [(0, 0, side, 0, 0, side)]
+    while stack:
+        x0, y0, xi, xj, yi, yj = stack.pop()
+        minx = min(x0, x0 + xi + yi)
+        miny = min(y0, y0 + xj + yj)
+        if minx >= ncols or miny >= nrows:
+            continue
+        if abs(xi + xj) == 1:
+            yield miny, minx
+            continue
+        hxi, hxj, hyi, hyj = [int(v / 2) for v in (xi, xj, yi, yj)]
+        stack.extend([
+            (x0 + hxi + yi, y0 + hxj + yj, -hyi, -hyj, -hxi, -hxj),
+            (x0 + hxi + hyi, y0 + hxj + hyj, hxi, hxj, hyi, hyj),
+            (x0 + hxi, y0 + hxj, hxi, hxj, hyi, hyj),
+            (x0, y0, hyi, hyj, hxi, hxj),
+        ])
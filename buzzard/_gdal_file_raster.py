@@ -1,12 +1,16 @@
 import uuid
 import contextlib
+import threading
 
+import numpy as np
 from osgeo import gdal
 
 from buzzard._a_pooled_emissary_raster import APooledEmissaryRaster, ABackPooledEmissaryRaster
 from buzzard._a_gdal_raster import ABackGDALRaster
 from buzzard._tools import conv, GDALErrorCatcher
+from buzzard import _tools
 from buzzard._footprint import Footprint
+from buzzard._write_behind import WriteBehind
 
 class GDALFileRaster(APooledEmissaryRaster):
     """Concrete class defining the behavior of a GDAL raster using a file.
@@ -16,48 +20,114 @@ class GDALFileRaster(APooledEmissaryRaster):
 
     Features Defined
     ----------------
-    None
+    - Has an `io_pool` property, the pool used to parallelize the reads of large windows
+    - Has a `block_size` property, the size in pixel of the blocks of the file
+    - Has a `flush` method that waits for the asynchronous writes (see `async_writes` parameter)
+    - Its `set_data` and `fill` methods are thread-safe
     """
 
-    def __init__(self, ds, allocator, open_options, mode):
+    def __init__(self, ds, allocator, open_options, mode, io_pool=None, header=None,
+                 async_writes=None):
         back = BackGDALFileRaster(
-            ds._back, allocator, open_options, mode,
+            ds._back, allocator, open_options, mode, io_pool, header, async_writes,
         )
         super(GDALFileRaster, self).__init__(ds=ds, back=back)
 
+    @property
+    def io_pool(self):
+        """Thread pool used to read large windows in parallel, or None"""
+        return self._back.io_pool
+
+    @property
+    def block_size(self):
+        """Size in pixels of the blocks of the file, as (width, height)"""
+        return self._back.block_size
+
+    @property
+    def async_writes(self):
+        """Maximum number of bytes of pending asynchronous writes, or None if `set_data` is
+        synchronous"""
+        return self._back.async_writes
+
+    def flush(self):
+        """Wait until all the pending asynchronous writes are performed.
+
+        If one of the asynchronous writes failed, a `RuntimeError` is raised here (or in the next
+        call to `set_data`). Does nothing if `async_writes` is disabled.
+
+        `close`, `delete`, `deactivate`, `get_data` and `fill` flush the pending writes first.
+        """
+        self._back.flush()
+
 class BackGDALFileRaster(ABackPooledEmissaryRaster, ABackGDALRaster):
     """Implementation of GDALFileRaster"""
 
-    def __init__(self, back_ds, allocator, open_options, mode):
+    # Minimum number of pixels (per channel) of a window to split a read between several driver
+    # objects. Below that, the overhead of the scheduling outweighs the gain.
+    _PARALLEL_READ_MIN_AREA = 2 ** 20
+
+    def __init__(self, back_ds, allocator, open_options, mode, io_pool=None, header=None,
+                 async_writes=None):
         uid = uuid.uuid4()
 
-        with back_ds.acquire_driver_object(uid, allocator) as gdal_ds:
-            path = gdal_ds.GetDescription()
-            driver = gdal_ds.GetDriver().ShortName
-            fp_stored = Footprint(
-                gt=gdal_ds.GetGeoTransform(),
-                rsize=(gdal_ds.RasterXSize, gdal_ds.RasterYSize),
-            )
-            channels_schema = self._channels_schema_of_gdal_ds(gdal_ds)
-            dtype = conv.dtype_of_gdt_downcast(gdal_ds.GetRasterBand(1).DataType)
-            sr = gdal_ds.GetProjection()
-            if sr == '':
-                wkt_stored = None
-            else:
-                wkt_stored = sr
+        if header is None:
+            with back_ds.acquire_driver_object(uid, allocator) as gdal_ds:
+                header = self.header_of_driver(gdal_ds)
 
         super(BackGDALFileRaster, self).__init__(
             back_ds=back_ds,
-            wkt_stored=wkt_stored,
-            channels_schema=channels_schema,
-            dtype=dtype,
-            fp_stored=fp_stored,
+            wkt_stored=header['wkt_stored'],
+            channels_schema=header['channels_schema'],
+            dtype=np.dtype(header['dtype']),
+            fp_stored=Footprint(gt=header['gt'], rsize=header['rsize']),
             mode=mode,
-            driver=driver,
+            driver=header['driver'],
             open_options=open_options,
-            path=path,
+            path=header['path'],
             uid=uid,
         )
+        self.io_pool = io_pool
+        self.block_size = tuple(header['block_size'])
+        self.async_writes = async_writes
+        if async_writes is None:
+            self._write_behind = None
+        else:
+            self._write_behind = WriteBehind(
+                self._set_data, self.fp, io_pool, async_writes,
+            )
+
+        # Concurrent writes: The remapping is performed in parallel, the writes of two
+        # `set_data` touching the same blocks are performed one after the other, and all the
+        # calls to GDAL are serialized on a single driver object.
+        self._block_locks = _tools.BlockLocks(self.block_size)
+        self._writer_lock = threading.Lock()
+
+    @staticmethod
+    def header_of_driver(gdal_ds):
+        """Read the metadata of a raster, as a json serializable dict"""
+        sr = gdal_ds.GetProjection()
+        if sr == '':
+            wkt_stored = None
+        else:
+            wkt_stored = sr
+        band = gdal_ds.GetRasterBand(1)
+        return {
+            'path': gdal_ds.GetDescription(),
+            'driver': gdal_ds.GetDriver().ShortName,
+            'gt': list(gdal_ds.GetGeoTransform()),
+            'rsize': [gdal_ds.RasterXSize, gdal_ds.RasterYSize],
+            'channels_schema': ABackGDALRaster._channels_schema_of_gdal_ds(gdal_ds),
+            'dtype': str(conv.dtype_of_gdt_downcast(band.DataType)),
+            'wkt_stored': wkt_stored,
+            'block_size': [int(v) for v in band.GetBlockSize()],
+        }
+
+    @classmethod
+    def read_header(cls, path, driver, options):
+        """Open a raster just the time to read its metadata. Can be called from any thread or
+        process."""
+        gdal_ds = cls.open_file(path, driver, options, 'r')
+        return cls.header_of_driver(gdal_ds)
 
     @contextlib.contextmanager
     def acquire_driver_object(self):
@@ -67,7 +137,109 @@ class BackGDALFileRaster(ABackPooledEmissaryRaster, ABackGDALRaster):
         ) as gdal_ds:
             yield gdal_ds
 
+    # get_data implementation ******************************************************************* **
+    def get_data(self, fp, channel_ids, dst_nodata, interpolation):
+        self.flush()
+        return super(BackGDALFileRaster, self).get_data(fp, channel_ids, dst_nodata, interpolation)
+
+    def sample_bands(self, fp, channel_ids):
+        if (self.io_pool is None or fp.rarea < self._PARALLEL_READ_MIN_AREA or
+                _tools.is_pool_worker_thread(self.io_pool)):
+            return super(BackGDALFileRaster, self).sample_bands(fp, channel_ids)
+        parts = self._block_aligned_parts(fp)
+        if len(parts) == 1:
+            return super(BackGDALFileRaster, self).sample_bands(fp, channel_ids)
+
+        # Each part is read with its own driver object, directly in the final array
+        dstarray = np.empty(np.r_[fp.shape, len(channel_ids)], self.dtype)
+
+        def _read_part(slices):
+            slicey, slicex = slices
+            subfp = fp.clip(slicex.start, slicey.start, slicex.stop, slicey.stop)
+            with self.acquire_driver_object() as gdal_ds:
+                self.sample_bands_driver(
+                    subfp, channel_ids, gdal_ds, dstarray=dstarray[slicey, slicex],
+                )
+
+        futures = [
+            self.io_pool.apply_async(_read_part, (slices,))
+            for slices in parts
+        ]
+        for future in futures:
+            future.get()
+        return dstarray
+
+    def _block_aligned_parts(self, fp):
+        """Split `fp` into parts that are aligned with the blocks of the file, each covering at
+        least `_PARALLEL_READ_MIN_AREA` pixels when possible.
+
+        Returns a list of `(slice, slice)` indexing `fp`
+        """
+        rtlx, rtly = self.fp.spatial_to_raster(fp.tl)
+        blockx, blocky = self.block_size
+        if fp.rsizex * blocky >= self._PARALLEL_READ_MIN_AREA:
+            # Strips of 1 block row, split along the block columns
+            stepy = blocky
+            stepx = blockx * int(np.ceil(self._PARALLEL_READ_MIN_AREA / (blockx * blocky)))
+        else:
+            # Strips of several block rows, covering the full width
+            stepy = blocky * int(np.ceil(self._PARALLEL_READ_MIN_AREA / (fp.rsizex * blocky)))
+            stepx = fp.rsizex
+        return [
+            (slicey, slicex)
+            for slicey in _aligned_slices(rtly, fp.rsizey, blocky, stepy)
+            for slicex in _aligned_slices(rtlx, fp.rsizex, blockx, stepx)
+        ]
+
+    # set_data implementation ******************************************************************* **
+    def set_data(self, array, fp, channel_ids, interpolation, mask):
+        if self._write_behind is None:
+            self._set_data(array, fp, channel_ids, interpolation, mask)
+        else:
+            self._write_behind.put(array, fp, channel_ids, interpolation, mask)
+
+    def _set_data(self, array, fp, channel_ids, interpolation, mask):
+        ret = self.remap_for_write(array, fp, interpolation, mask)
+        if ret is None:
+            return
+        array, fp, mask = ret
+
+        rtlx, rtly = self.fp.spatial_to_raster(fp.tl)
+        with self._block_locks.locked(rtlx, rtly, fp.rsizex, fp.rsizey):
+            for i, channel_id in enumerate(channel_ids):
+                # GDAL does not support concurrent writes to the same file, even through several
+                # driver objects. The writer lock is released between channels to let the
+                # `set_data` on other blocks progress.
+                with self._writer_lock, self.acquire_driver_object() as gdal_ds:
+                    self.write_channel_driver(array[:, :, i], fp, channel_id, mask, gdal_ds)
+
+    def fill(self, value, channel_ids):
+        self.flush()
+        with self._block_locks.locked(0, 0, self.fp.rsizex, self.fp.rsizey):
+            with self._writer_lock:
+                super(BackGDALFileRaster, self).fill(value, channel_ids)
+
+    def flush(self):
+        if self._write_behind is not None:
+            self._write_behind.flush()
+
+    # Misc ************************************************************************************** **
+    def deactivate(self):
+        self.flush()
+        super(BackGDALFileRaster, self).deactivate()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            super(BackGDALFileRaster, self).close()
+
     def delete(self):
+        # The pending writes are performed before removing the file, their errors don't matter
+        try:
+            self.flush()
+        except RuntimeError: # pragma: no cover
+            pass
         super(BackGDALFileRaster, self).delete()
 
         success, payload = GDALErrorCatcher(gdal.GetDriverByName, none_is_error=True)(self.driver)
@@ -103,3 +275,23 @@ class BackGDALFileRaster(ABackPooledEmissaryRaster, ABackGDALRaster):
         gdal_ds = payload
 
         return gdal_ds
+
+def _aligned_slices(start, size, block, step):
+    """Split the `size` pixels starting at `start` in chunks of length `step`, the boundaries
+    between chunks are aligned on multiples of `block` (`step` being a multiple of `block`).
+    The returned slices are relative to `start`.
+    """
+    if step >= size:
+        return [slice(0, size)]
+    stop = start + size
+    bounds = [start]
+    first = (start // block + 1) * block
+    if first - start < step:
+        # Do not create a thin first chunk if the window does not start on a block boundary
+        first += step - block
+    bounds += list(range(int(first), int(stop), int(step)))
+    bounds.append(stop)
+    return [
+        slice(int(a - start), int(b - start))
+        for a, b in zip(bounds[:-1], bounds[1:])
+    ]
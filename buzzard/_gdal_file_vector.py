@@ -1,8 +1,14 @@
+import os
 import uuid
+import threading
 import contextlib
+import functools
+import multiprocessing as mp
+import multiprocessing.pool
 
-from osgeo import gdal
+from osgeo import gdal, ogr
 import numpy as np
+import rtree.index
 
 from buzzard._a_pooled_emissary_vector import APooledEmissaryVector, ABackPooledEmissaryVector
 from buzzard._a_gdal_vector import ABackGDALVector
@@ -16,54 +22,105 @@ class GDALFileVector(APooledEmissaryVector):
 
     Features Defined
     ----------------
-    None
+    - Has a `build_spatial_index` method
     """
 
-    def __init__(self, ds, allocator, open_options, mode):
+    def __init__(self, ds, allocator, open_options, mode, header=None):
         back = BackGDALFileVector(
-            ds._back, allocator, open_options, mode,
+            ds._back, allocator, open_options, mode, header,
         )
         super(GDALFileVector, self).__init__(ds=ds, back=back)
 
+    def build_spatial_index(self):
+        """Build a spatial index to speed up the reads using a `mask`
+
+        - With the `ESRI Shapefile` driver, a `.qix` file is created next to the `.shp` file using
+          the `CREATE SPATIAL INDEX` statement of OGR SQL. It is then used by the driver itself.
+        - With the drivers that can't filter the features efficiently by themselves, and if the
+          vector is opened in read mode, an rtree index of the bounding boxes of the features is
+          written next to the file (`<path>.<layer>.idx` and `<path>.<layer>.dat`). It is used by
+          buzzard to read the candidate features by FID, and is ignored when a `where` filter is
+          given or when the file was modified after the index was built.
+        - With the other drivers (`GPKG`, `PostgreSQL`, ...) this method does nothing.
+
+        The index can also be built automatically on the first read using a `mask`, with the
+        `auto_spatial_index` parameter of the Dataset constructor.
+
+        Example
+        -------
+        >>> ds.open_vector('roads', 'roads.geojson')
+        ... ds.roads.build_spatial_index()
+        ... geoms = ds.roads.get_table(None, mask=fp)
+
+        """
+        self._back.build_spatial_index()
+
 class BackGDALFileVector(ABackPooledEmissaryVector, ABackGDALVector):
     """Implementation of GDALFileVector"""
 
-    def __init__(self, back_ds, allocator, open_options, mode):
+    def __init__(self, back_ds, allocator, open_options, mode, header=None):
         uid = uuid.uuid4()
 
-        with back_ds.acquire_driver_object(uid, allocator) as (gdal_ds, lyr):
-            rect = None
-            if lyr is not None:
-                rect = lyr.GetExtent()
-            path = gdal_ds.GetDescription()
-            driver = gdal_ds.GetDriver().ShortName
-            sr = lyr.GetSpatialRef()
-            if sr is None:
-                wkt_stored = None
-            else:
-                wkt_stored = sr.ExportToWkt()
-            fields = BackGDALFileVector._fields_of_lyr(lyr)
-            type = conv.str_of_wkbgeom(lyr.GetGeomType())
-            layer = lyr.GetName()
+        if header is None:
+            with back_ds.acquire_driver_object(uid, allocator) as (gdal_ds, lyr):
+                header = self.header_of_driver(gdal_ds, lyr)
+
+        rect = header['rect']
+        if rect is not None:
+            rect = tuple(rect)
 
         super(BackGDALFileVector, self).__init__(
             back_ds=back_ds,
-            wkt_stored=wkt_stored,
+            wkt_stored=header['wkt_stored'],
             mode=mode,
-            driver=driver,
+            driver=header['driver'],
             open_options=open_options,
-            path=path,
+            path=header['path'],
             uid=uid,
-            layer=layer,
-            fields=fields,
+            layer=header['layer'],
+            fields=header['fields'],
             rect=rect,
-            type=type
+            type=header['type'],
         )
 
         self._type_of_field_index = [
             conv.type_of_oftstr(field['type'])
             for field in self.fields
         ]
+        self._sidecar_lock = threading.Lock()
+        self._sidecar_checked = False
+        self._sidecar = None
+
+    @classmethod
+    def header_of_driver(cls, gdal_ds, lyr):
+        """Read the metadata of a vector, as a json serializable dict"""
+        rect = None
+        if lyr is not None:
+            rect = lyr.GetExtent()
+        sr = lyr.GetSpatialRef()
+        if sr is None:
+            wkt_stored = None
+        else:
+            wkt_stored = sr.ExportToWkt()
+        return {
+            'path': gdal_ds.GetDescription(),
+            'driver': gdal_ds.GetDriver().ShortName,
+            'rect': None if rect is None else list(rect),
+            'wkt_stored': wkt_stored,
+            'fields': cls._fields_of_lyr(lyr),
+            'type': conv.str_of_wkbgeom(lyr.GetGeomType()),
+            'layer': lyr.GetName(),
+        }
+
+    @classmethod
+    def read_header(cls, path, layer, driver, options):
+        """Open a vector just the time to read its metadata. Can be called from any thread or
+        process."""
+        gdal_ds, lyr = cls.open_file(path, layer, driver, options, 'r')
+        header = cls.header_of_driver(gdal_ds, lyr)
+        del lyr # Necessary to prevent the old swig bug
+        del gdal_ds
+        return header
 
     def allocator(self):
         return self.open_file(self.path, self.layer, self.driver, self.open_options, self.mode)
@@ -112,8 +169,162 @@ class BackGDALFileVector(ABackPooledEmissaryVector, ABackGDALVector):
         ) as gdal_objs:
             yield gdal_objs
 
+    def partition_reader(self, pool):
+        if isinstance(pool, mp.pool.ThreadPool):
+            # Each thread acquires its own driver object from the activation pool
+            return self._read_partition
+        back_ds = self.back_ds
+        return functools.partial(
+            _read_partition_in_process,
+            (self.path, self.layer, self.driver, self.open_options),
+            dict(
+                sr_work=back_ds.wkt_work,
+                sr_fallback=back_ds.wkt_fallback,
+                sr_forced=back_ds.wkt_forced,
+                analyse_transformation=back_ds.analyse_transformations,
+                allow_none_geometry=back_ds.allow_none_geometry,
+                auto_spatial_index=back_ds.auto_spatial_index,
+            ),
+        )
+
+    def _read_partition(self, args, slicing):
+        geom_type, field_indices, mask_poly, mask_rect, clip, where, simplify_tolerance = args
+        return list(self.iter_data(
+            geom_type, field_indices, slicing, mask_poly, mask_rect, clip, where,
+            simplify_tolerance,
+        ))
+
+    # Spatial index *************************************************************************** **
+    def build_spatial_index(self):
+        with self.acquire_driver_object() as (_, lyr):
+            indexed = bool(lyr.TestCapability(ogr.OLCFastSpatialFilter))
+            random_read = bool(lyr.TestCapability(ogr.OLCRandomRead))
+            del lyr # Necessary to prevent the old swig bug
+
+        with self._sidecar_lock:
+            if indexed:
+                pass
+            elif self.driver == 'ESRI Shapefile':
+                self._create_qix()
+            elif self.mode == 'r' and random_read and os.path.isfile(self.path):
+                self._create_sidecar()
+            # The sidecar is loaded again on the next read using a mask
+            self._close_sidecar()
+
+    def _create_qix(self):
+        """Create the `.qix` file of a shapefile, the driver needs an update access to do so"""
+        # The features written by the active driver objects are flushed, and the driver objects
+        # activated afterward see the new index
+        self._try_deactivate()
+        gdal_ds, lyr = self.open_file(self.path, self.layer, self.driver, self.open_options, 'w')
+        sql = 'CREATE SPATIAL INDEX ON "{}"'.format(lyr.GetName())
+        del lyr # Necessary to prevent the old swig bug
+        success, payload = GDALErrorCatcher(gdal_ds.ExecuteSQL)(sql)
+        if not success: # pragma: no cover
+            raise RuntimeError('Could not create the spatial index of `{}` (gdal error: `{}`)'.format(
+                self.path, payload[1]
+            ))
+        if payload is not None: # pragma: no cover
+            gdal_ds.ReleaseResultSet(payload)
+        del gdal_ds
+        self._try_deactivate()
+
+    def _try_deactivate(self):
+        try:
+            self.back_ds.deactivate(self.uid)
+        except RuntimeError: # pragma: no cover
+            # Some driver objects are being used, they will keep working without the index
+            pass
+
+    @property
+    def _sidecar_path(self):
+        """Path of the rtree files without their `.idx` and `.dat` extensions"""
+        return '{}.{}'.format(self.path, self.layer)
+
+    def _create_sidecar(self):
+        """Write the bounding boxes of all the features to an rtree index next to the file"""
+        items = []
+        with self.acquire_driver_object() as (_, lyr):
+            filters = self._layer_filters(lyr, None, None, None, [], True)
+            ftr = None # Necessary to prevent the old swig bug
+            geom = None # Necessary to prevent the old swig bug
+            for ftr in self.iter_features_driver(slice(0, None, 1), filters, lyr):
+                geom = ftr.GetGeometryRef()
+                if geom is None or geom.IsEmpty():
+                    continue
+                minx, maxx, miny, maxy = geom.GetEnvelope()
+                items.append((ftr.GetFID(), (minx, miny, maxx, maxy), None))
+
+            # Necessary to prevent the old swig bug
+            # https://trac.osgeo.org/gdal/ticket/6749
+            del geom
+            del ftr
+            del filters
+            del lyr
+
+        props = rtree.index.Property()
+        props.overwrite = True
+        if items:
+            index = rtree.index.Index(self._sidecar_path, iter(items), properties=props)
+        else:
+            index = rtree.index.Index(self._sidecar_path, properties=props)
+        index.close()
+
+    def _sidecar_is_fresh(self):
+        """Is there an rtree index of this file, built after its last modification"""
+        idx_path = self._sidecar_path + '.idx'
+        if self.mode != 'r' or not os.path.isfile(idx_path) or not os.path.isfile(self.path):
+            return False
+        return os.path.getmtime(idx_path) >= os.path.getmtime(self.path)
+
+    def _open_sidecar(self):
+        """Open the rtree index of this file, returns None if there is none or if it is outdated"""
+        if not self._sidecar_is_fresh():
+            return None
+        return rtree.index.Index(self._sidecar_path)
+
+    def _close_sidecar(self):
+        if self._sidecar is not None:
+            self._sidecar.close()
+        self._sidecar = None
+        self._sidecar_checked = False
+
+    def _spatial_index_fids(self, mask_poly, mask_rect, where):
+        if mask_poly is None and mask_rect is None:
+            return None
+        if not self._sidecar_checked:
+            if self.back_ds.auto_spatial_index and not self._sidecar_is_fresh():
+                # Does nothing if the driver already has a spatial index
+                try:
+                    self.build_spatial_index()
+                except (RuntimeError, OSError, rtree.index.RTreeError):
+                    # The index is only an optimization (the file may be read-only)
+                    pass
+            with self._sidecar_lock:
+                if not self._sidecar_checked:
+                    self._sidecar = self._open_sidecar()
+                    self._sidecar_checked = True
+        if where is not None:
+            # The attribute filter is more efficiently performed by the driver
+            return None
+        with self._sidecar_lock:
+            if self._sidecar is None:
+                return None
+            bounds = mask_rect if mask_poly is None else mask_poly.bounds
+            return sorted(self._sidecar.intersection(bounds))
+
+    def close(self):
+        with self._sidecar_lock:
+            self._close_sidecar()
+        super(BackGDALFileVector, self).close()
+
     def delete(self):
+        with self._sidecar_lock:
+            self._close_sidecar()
         super(BackGDALFileVector, self).delete()
+        for ext in ['.idx', '.dat']:
+            if os.path.isfile(self._sidecar_path + ext):
+                os.remove(self._sidecar_path + ext)
 
         success, payload = GDALErrorCatcher(gdal.GetDriverByName, none_is_error=True)(self.driver)
         if not success: # pragma: no cover
@@ -127,3 +338,13 @@ class BackGDALFileVector(ABackPooledEmissaryVector, ABackGDALVector):
             raise RuntimeError('Could not delete `{}` using driver `{}` (gdal error: `{}`)'.format(
                 self.path, dr.ShortName, payload[1]
             ))
+
+def _read_partition_in_process(open_args, ds_kwargs, args, slicing):
+    """Read a partition of the features of a vector file from another process, by opening it in
+    a new Dataset configured like the original one"""
+    from buzzard._dataset import Dataset
+
+    path, layer, driver, options = open_args
+    with Dataset(**ds_kwargs).close as ds:
+        with ds.aopen_vector(path, layer, driver, options).close as v:
+            return v._back._read_partition(args, slicing)
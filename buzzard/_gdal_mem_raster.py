@@ -1,4 +1,5 @@
 import contextlib
+import threading
 
 from buzzard._a_emissary_raster import AEmissaryRaster, ABackEmissaryRaster
 from buzzard._a_gdal_raster import ABackGDALRaster
@@ -30,6 +31,8 @@ class BackGDALMemRaster(ABackEmissaryRaster, ABackGDALRaster):
             '', fp, dtype, channel_count, channels_schema, 'MEM', open_options, sr, False
         )
         self._gdal_ds = gdal_ds
+        # A single driver object exists, it can't be used by several threads at once
+        self._gdal_ds_lock = threading.RLock()
 
         path = gdal_ds.GetDescription()
         driver = gdal_ds.GetDriver().ShortName
@@ -59,7 +62,8 @@ class BackGDALMemRaster(ABackEmissaryRaster, ABackGDALRaster):
 
     @contextlib.contextmanager
     def acquire_driver_object(self):
-        yield self._gdal_ds
+        with self._gdal_ds_lock:
+            yield self._gdal_ds
 
     def delete(self): # pragma: no cover
         raise NotImplementedError('GDAL MEM driver does no allow deletion, use `close`')
@@ -0,0 +1,195 @@
+import numpy as np
+import rtree.index
+
+from buzzard._a_source_raster import ASourceRaster, ABackSourceRaster
+from buzzard._gdal_file_raster import BackGDALFileRaster
+from buzzard import _tools
+
+class GDALMosaicRaster(ASourceRaster):
+    """Concrete class defining the behavior of a read-only raster made of many GDAL raster files
+    lying on the same grid.
+
+    >>> help(Dataset.open_raster_mosaic)
+
+    Features Defined
+    ----------------
+    - Has a `paths` property, the list of files of the mosaic
+    - Has a `fps` property, the list of Footprints of the files of the mosaic
+    - Has an `io_pool` property, the pool used to read the files in parallel
+    """
+
+    def __init__(self, ds, headers, open_options, io_pool):
+        back = BackGDALMosaicRaster(
+            ds._back, headers, open_options, io_pool,
+        )
+        super(GDALMosaicRaster, self).__init__(ds=ds, back=back)
+
+    @property
+    def paths(self):
+        """Paths of the files of the mosaic"""
+        return [member.path for member in self._back.members]
+
+    @property
+    def fps(self):
+        """Footprints of the files of the mosaic, in the same order as `paths`"""
+        return [member.fp for member in self._back.members]
+
+    @property
+    def io_pool(self):
+        """Thread pool used to read the files in parallel, or None"""
+        return self._back.io_pool
+
+class BackGDALMosaicRaster(ABackSourceRaster):
+    """Implementation of GDALMosaicRaster"""
+
+    def __init__(self, back_ds, headers, open_options, io_pool):
+        members = []
+        try:
+            for header in headers:
+                path, driver = header['path'], header['driver']
+                allocator = (
+                    lambda path=path, driver=driver:
+                    BackGDALFileRaster.open_file(path, driver, open_options, 'r')
+                )
+                members.append(BackGDALFileRaster(
+                    back_ds, allocator, open_options, 'r', None, header,
+                ))
+            fp_stored = self._check_members(members)
+        except:
+            for member in members:
+                member.close()
+            raise
+
+        first = members[0]
+        super(BackGDALMosaicRaster, self).__init__(
+            back_ds=back_ds,
+            wkt_stored=first.wkt_stored,
+            channels_schema=first.channels_schema,
+            dtype=first.dtype,
+            fp_stored=fp_stored,
+        )
+        self.members = members
+        self.io_pool = io_pool
+        self._members_index = self._build_members_index(members)
+
+    @staticmethod
+    def _check_members(members):
+        """Check that all files can be stitched together, return the stored Footprint of the
+        mosaic"""
+        first = members[0]
+        for member in members[1:]:
+            if member.wkt_stored != first.wkt_stored:
+                raise ValueError('`{}` and `{}` do not have the same spatial reference'.format(
+                    first.path, member.path
+                ))
+            if member.dtype != first.dtype:
+                raise ValueError('`{}` and `{}` do not have the same dtype ({} and {})'.format(
+                    first.path, member.path, first.dtype, member.dtype
+                ))
+            if len(member) != len(first):
+                raise ValueError('`{}` and `{}` do not have the same number of channels'.format(
+                    first.path, member.path
+                ))
+            if not member.fp_stored.same_grid(first.fp_stored):
+                raise ValueError('`{}` and `{}` are not on the same grid'.format(
+                    first.path, member.path
+                ))
+
+        # Envelope of all files, computed in the raster space of the first one
+        rtls = np.asarray([
+            first.fp_stored.spatial_to_raster(member.fp_stored.tl)
+            for member in members
+        ])
+        rbrs = rtls + [member.fp_stored.rsize for member in members]
+        left, top = -rtls.min(axis=0)
+        right, bottom = rbrs.max(axis=0) - first.fp_stored.rsize
+        return first.fp_stored.dilate(left, right, top, bottom)
+
+    def _build_members_index(self, members):
+        idx = rtree.index.Index()
+        bounds_inset = np.asarray([
+            + 1 / 4,
+            + 1 / 4,
+            - 1 / 4,
+            - 1 / 4,
+        ])
+        for i, member in enumerate(members):
+            rtl = self.fp.spatial_to_raster(member.fp.tl, dtype=float)
+            bounds = np.r_[rtl, rtl + member.fp.rsize] + bounds_inset
+            idx.insert(i, bounds)
+        return idx
+
+    def members_of_fp(self, fp):
+        """Indices of the files intersecting `fp` (a Footprint on the same grid as self), sorted"""
+        rtl = self.fp.spatial_to_raster(fp.tl, dtype=float)
+        bounds = np.r_[rtl, rtl + fp.rsize]
+        return sorted(self._members_index.intersection(bounds))
+
+    # get_data implementation ******************************************************************* **
+    def get_data(self, fp, channel_ids, dst_nodata, interpolation):
+        samplefp = self.build_sampling_footprint(fp, interpolation)
+        if samplefp is None:
+            return np.full(
+                np.r_[fp.shape, len(channel_ids)],
+                dst_nodata,
+                self.dtype
+            )
+        array = self.sample_bands(samplefp, channel_ids)
+        array = self.remap(
+            samplefp,
+            fp,
+            array=array,
+            mask=None,
+            src_nodata=self.nodata,
+            dst_nodata=dst_nodata,
+            mask_mode='erode',
+            interpolation=interpolation,
+        )
+        array = array.astype(self.dtype, copy=False)
+        return array
+
+    def sample_bands(self, fp, channel_ids):
+        """Read the pixels of `fp` (a Footprint on the same grid as self, contained in self) from
+        all the intersecting files. Where several files overlap, the last one in `paths` wins."""
+        dstarray = np.empty(np.r_[fp.shape, len(channel_ids)], self.dtype)
+        for i, channel_id in enumerate(channel_ids):
+            nodata = self.get_nodata(channel_id)
+            dstarray[..., i] = 0 if nodata is None else nodata
+
+        members = [self.members[i] for i in self.members_of_fp(fp)]
+        parts = [member.fp.intersection(fp) for member in members]
+
+        if (self.io_pool is None or len(members) <= 1 or
+                _tools.is_pool_worker_thread(self.io_pool)):
+            arrays = [
+                self._read_member(member, part, channel_ids)
+                for member, part in zip(members, parts)
+            ]
+        else:
+            futures = [
+                self.io_pool.apply_async(self._read_member, (member, part, channel_ids))
+                for member, part in zip(members, parts)
+            ]
+            arrays = [future.get() for future in futures]
+
+        for part, array in zip(parts, arrays):
+            dstarray[part.slice_in(fp)] = array
+        return dstarray
+
+    def _read_member(self, member, fp, channel_ids):
+        array = member.sample_bands(fp, channel_ids)
+
+        # Convert the nodata values of that file to the ones of the mosaic
+        for i, channel_id in enumerate(channel_ids):
+            src_nodata = member.get_nodata(channel_id)
+            dst_nodata = self.get_nodata(channel_id)
+            if src_nodata is None or dst_nodata is None or src_nodata == dst_nodata:
+                continue
+            a = array[..., i]
+            a[a == src_nodata] = dst_nodata
+        return array
+
+    def close(self):
+        for member in self.members:
+            member.close()
+        super(BackGDALMosaicRaster, self).close()
@@ -0,0 +1,77 @@
+"""Private module for the cache of the files' headers used by the lazy opening of sources"""
+
+import json
+import os
+import threading
+import uuid
+
+class HeadersCache(object):
+    """Thread-safe mapping from a file identity to the header of that file, optionally persisted
+    to a json file.
+
+    A file is identified by its absolute path, size and modification time, plus the parameters
+    used to open it. A modified file is thus never matched with an outdated header.
+    """
+
+    _VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._headers = {}
+        self._dirty = False
+        if path is not None and os.path.isfile(path):
+            self._load()
+
+    @staticmethod
+    def key_of_file(kind, path, driver, options, layer=None):
+        """Compute the key of a file, or None if the file can't be identified (i.e. not on the
+        local file system)"""
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        return json.dumps([
+            kind, os.path.abspath(path), st.st_size, st.st_mtime_ns, driver, list(options), layer,
+        ])
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            return self._headers.get(key)
+
+    def put(self, key, header):
+        if key is None:
+            return
+        with self._lock:
+            self._headers[key] = header
+            self._dirty = True
+
+    def save(self):
+        """Write the headers to `path` if some were added since the last save"""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            headers = dict(self._headers)
+            self._dirty = False
+
+        # Write to a temporary file first to never leave a half written cache
+        tmppath = '{}.{}.tmp'.format(self.path, uuid.uuid4())
+        with open(tmppath, 'w') as stream:
+            json.dump({'version': self._VERSION, 'headers': headers}, stream)
+        os.replace(tmppath, self.path)
+
+    def _load(self):
+        with open(self.path, 'r') as stream:
+            try:
+                content = json.load(stream)
+            except ValueError as e:
+                raise ValueError('Could not parse the headers cache `{}` ({})'.format(
+                    self.path, e
+                ))
+        if content.get('version') != self._VERSION: # pragma: no cover
+            return
+        self._headers = content['headers']
@@ -0,0 +1,294 @@
+import multiprocessing as mp
+import multiprocessing.pool
+
+import numpy as np
+import shapely.geometry as sg
+
+from buzzard._a_stored_vector import AStoredVector, ABackStoredVector
+from buzzard import _tools
+from buzzard._tools import conv
+
+class MemoryVector(AStoredVector):
+    """Concrete class defining the behavior of a vector stored in memory as numpy arrays, without
+    any driver
+
+    >>> help(Dataset.create_memory_vector)
+
+    Features Defined
+    ----------------
+    - The geometries are stored in an array of shapely objects, and the fields in one numpy array
+      per field.
+    - The spatial filters use an STRtree built on the first read following a modification.
+    - The `where` filters are not supported.
+    """
+
+    def __init__(self, ds, type, fields, wkt):
+        back = BackMemoryVector(ds._back, type, fields, wkt)
+        super(MemoryVector, self).__init__(ds=ds, back=back)
+
+class BackMemoryVector(ABackStoredVector):
+    """Implementation of MemoryVector"""
+
+    def __init__(self, back_ds, type, fields, wkt):
+        fields = [self._field_of_defn(defn) for defn in fields]
+        super(BackMemoryVector, self).__init__(
+            back_ds=back_ds,
+            wkt_stored=wkt,
+            rect=None,
+            mode='w',
+            type=type,
+            fields=fields,
+        )
+        self._len = 0
+        self.geoms = np.empty(0, dtype=object)
+        # One array of values per field, the numeric ones being paired with an array of null flags
+        self._columns = [
+            np.asarray(_tools.column_of_values([], field['type'], True))
+            for field in self.fields
+        ]
+        self._nulls = [
+            np.empty(0, dtype=bool) if col.dtype != object else None
+            for col in self._columns
+        ]
+        self._index = None
+        self._extent = None
+
+    @staticmethod
+    def _field_of_defn(defn):
+        """Used on creation, convert a definition of `_tools.normalize_fields_defn`"""
+        oftstr = conv.str_of_oft(defn['type'])
+        type_ = conv.type_of_oftstr(oftstr)
+        return {
+            'name': defn['name'],
+            'precision': defn['precision'] or 0,
+            'width': defn['width'] or 0,
+            'nullable': True if defn['nullable'] is None else bool(defn['nullable']),
+            'default': None if defn['default'] is None else type_(defn['default']),
+            'type': oftstr,
+        }
+
+    # extent/len implementation ***************************************************************** **
+    @property
+    def extent(self):
+        extent = self.extent_stored
+        if self.to_work:
+            xa, xb, ya, yb = extent
+            extent = self.to_work([[xa, ya], [xb, yb]])
+            extent = np.asarray(extent)[:, :2]
+            extent = extent[0, 0], extent[1, 0], extent[0, 1], extent[1, 1]
+        return np.asarray(extent)
+
+    @property
+    def extent_stored(self):
+        if self._extent is None:
+            geoms = [
+                geom
+                for geom in self.geoms[:self._len]
+                if geom is not None
+            ]
+            if not geoms:
+                self._extent = np.zeros(4)
+            else:
+                bounds = np.asarray([geom.bounds for geom in geoms])
+                self._extent = np.asarray([
+                    bounds[:, 0].min(), bounds[:, 2].max(), bounds[:, 1].min(), bounds[:, 3].max(),
+                ])
+        return self._extent.copy()
+
+    def __len__(self):
+        """Return the number of features in vector"""
+        return self._len
+
+    def feature_count(self, mask_poly, mask_rect, where):
+        return len(self._filtered_indices(mask_poly, mask_rect, where))
+
+    # iter_data implementation ****************************************************************** **
+    def iter_data(self, geom_type, field_indices, slicing, mask_poly, mask_rect, clip,
+                  where, simplify_tolerance):
+        clip_poly = None
+        if clip:
+            clip_poly = mask_poly if mask_poly is not None else sg.box(*mask_rect)
+
+        indices = self._filtered_indices(mask_poly, mask_rect, where)[slicing]
+
+        # The geometries are converted and reprojected by chunks, with a single call to `to_work`
+        # per chunk
+        for i in range(0, len(indices), self._ITER_DATA_CHUNK_SIZE):
+            chunk = indices[i:i + self._ITER_DATA_CHUNK_SIZE]
+            columns = [self._values_of_field(j, chunk) for j in field_indices]
+            if geom_type is None:
+                yield from zip(*columns)
+                continue
+            geoms = self._read_geoms(chunk, 'shapely', clip_poly, simplify_tolerance)
+            if geom_type != 'shapely':
+                geoms = [
+                    None if geom is None else
+                    sg.mapping(geom)['coordinates'] if geom_type == 'coordinates' else
+                    sg.mapping(geom)
+                    for geom in geoms
+                ]
+            yield from zip(geoms, *columns)
+
+    _ITER_DATA_CHUNK_SIZE = 256
+
+    def partition_reader(self, pool):
+        if isinstance(pool, mp.pool.ThreadPool):
+            # The arrays are only read, they can be shared between threads
+            return self._read_partition
+        return None
+
+    def _read_partition(self, args, slicing):
+        geom_type, field_indices, mask_poly, mask_rect, clip, where, simplify_tolerance = args
+        return list(self.iter_data(
+            geom_type, field_indices, slicing, mask_poly, mask_rect, clip, where,
+            simplify_tolerance,
+        ))
+
+    # iter_batches implementation *************************************************************** **
+    def iter_batches(self, batch_size, geom_type, field_indices, mask_poly, mask_rect,
+                     where, simplify_tolerance):
+        indices = self._filtered_indices(mask_poly, mask_rect, where)
+        for i in range(0, len(indices), batch_size):
+            chunk = indices[i:i + batch_size]
+            columns = tuple(self._column_of_field(j, chunk) for j in field_indices)
+            if geom_type is None:
+                yield columns
+            else:
+                yield (self._read_geoms(chunk, geom_type, None, simplify_tolerance),) + columns
+
+    # Reading tools ***************************************************************************** **
+    def _filtered_indices(self, mask_poly, mask_rect, where):
+        """Indices of the features not disjoint with the mask, using the spatial index"""
+        if where is not None: # pragma: no cover
+            raise ValueError('The `where` filter is not supported by memory vectors')
+        if mask_poly is None and mask_rect is None:
+            return np.arange(self._len)
+        if mask_poly is None:
+            mask_poly = sg.box(*mask_rect)
+        if self._index is None:
+            self._index = _tools.GeometryIndex(self.geoms[:self._len])
+        query = np.empty(1, dtype=object)
+        query[0] = mask_poly
+        return self._index.query(query, 'intersects')[1]
+
+    def _read_geoms(self, indices, geom_type, clip_poly, simplify_tolerance):
+        """Read the geometries at `indices`, as an array of geometries in work spatial reference"""
+        geoms = self.geoms[indices]
+        if not self.back_ds.allow_none_geometry and any(geom is None for geom in geoms): # pragma: no cover
+            raise Exception(
+                'None geometry in feature '
+                '(Set `allow_none_geometry=True` in Dataset constructor to silence)'
+            )
+        if clip_poly is not None:
+            geoms[:] = [
+                None if geom is None else geom.intersection(clip_poly)
+                for geom in geoms
+            ]
+        if self.to_work:
+            geoms = _tools.transform_geometries(geoms, self.to_work)
+        if simplify_tolerance is not None:
+            geoms = _tools.simplify_geometries(geoms, simplify_tolerance)
+        if geom_type == 'wkb':
+            geoms = _tools.wkbs_of_shapely(geoms)
+        return geoms
+
+    def _values_of_field(self, index, indices):
+        """Read the values of a field at `indices`, as a list of python objects (or None)"""
+        values = self._columns[index][indices].tolist()
+        nulls = self._nulls[index]
+        if nulls is not None:
+            values = [
+                None if null else v
+                for v, null in zip(values, nulls[indices].tolist())
+            ]
+        return values
+
+    def _column_of_field(self, index, indices):
+        """Read the values of a field at `indices`, as a column of `_tools.column_of_values`"""
+        arr = self._columns[index][indices]
+        if self._nulls[index] is not None and self.fields[index]['nullable']:
+            arr = np.ma.MaskedArray(arr, self._nulls[index][indices])
+        return arr
+
+    # insert_data implementation **************************************************************** **
+    def insert_data(self, geom, geom_type, fields, index):
+        self.insert_many([(geom, geom_type, fields)], True)
+        if index >= 0 and index < self._len - 1:
+            # Move the feature from the end to `index`
+            order = np.r_[:index, self._len - 1, index:self._len - 1]
+            self.geoms[:self._len] = self.geoms[order]
+            for col, nulls in zip(self._columns, self._nulls):
+                col[:self._len] = col[order]
+                if nulls is not None:
+                    nulls[:self._len] = nulls[order]
+
+    # insert_many implementation **************************************************************** **
+    def insert_many(self, batch, validate):
+        geoms = self._geoms_of_batch([geom for geom, _, _ in batch], [t for _, t, _ in batch])
+        columns = []
+        for i, field in enumerate(self.fields):
+            values = [
+                field['default'] if fields[i] is None else fields[i]
+                for _, _, fields in batch
+            ]
+            # Raises if a non-nullable field is null
+            col = _tools.column_of_values(values, field['type'], field['nullable'])
+            columns.append(col)
+
+        count = len(batch)
+        self._reserve(self._len + count)
+        sl = slice(self._len, self._len + count)
+        self.geoms[sl] = geoms
+        for col, nulls, values in zip(self._columns, self._nulls, columns):
+            if nulls is None:
+                col[sl] = values
+            else:
+                col[sl] = np.ma.getdata(values)
+                nulls[sl] = np.ma.getmaskarray(values)
+        self._len += count
+
+        # The spatial index and the extent are computed again on the next read
+        self._index = None
+        self._extent = None
+
+    def _geoms_of_batch(self, geoms, geom_types):
+        """Convert a batch of geometries to insert to shapely geometries in virtual spatial
+        reference, the empty geometries being stored as None"""
+        arr = np.empty(len(geoms), dtype=object)
+        arr[:] = [
+            sg.shape({'type': self.type, 'coordinates': geom})
+            if geom_type == 'coordinates' else
+            geom
+            for geom, geom_type in zip(geoms, geom_types)
+        ]
+        if self.to_virtual:
+            arr = _tools.transform_geometries(arr, self.to_virtual)
+        arr[:] = [
+            None if geom is None or geom.is_empty else geom
+            for geom in arr
+        ]
+        return arr
+
+    def _reserve(self, capacity):
+        """Grow the arrays to fit at least `capacity` features, doubling their size"""
+        if capacity <= len(self.geoms):
+            return
+        capacity = max(capacity, 2 * len(self.geoms), 16)
+        self.geoms = _resized(self.geoms, self._len, capacity)
+        self._columns = [_resized(col, self._len, capacity) for col in self._columns]
+        self._nulls = [
+            None if nulls is None else _resized(nulls, self._len, capacity)
+            for nulls in self._nulls
+        ]
+
+    def close(self):
+        super(BackMemoryVector, self).close()
+        del self.geoms
+        del self._columns
+        del self._nulls
+        del self._index
+
+def _resized(arr, count, capacity):
+    res = np.empty(capacity, dtype=arr.dtype)
+    res[:count] = arr[:count]
+    return res
@@ -7,3 +7,8 @@ from .helper_classes import *
 from .rect import *
 from .multi_ordered_dict import *
 from .slices_of_matrix import *
+from .pools import *
+from .block_locks import *
+from .scanline import *
+from .skeleton import *
+from .geometry_arrays import *
@@ -0,0 +1,42 @@
+"""Tools to lock regions of a raster"""
+
+import contextlib
+import threading
+
+class BlockLocks(object):
+    """Exclusive locks on the blocks of a raster.
+
+    A region is locked by locking all the blocks it touches, at once, so that two threads locking
+    overlapping regions never deadlock and two threads locking disjoint regions never wait.
+    """
+
+    def __init__(self, block_size):
+        self._block_size = tuple(int(v) for v in block_size)
+        self._cond = threading.Condition(threading.Lock())
+        self._held = []
+
+    def blocks_of_region(self, x, y, w, h):
+        """Range of blocks touched by a region of the raster, as (x0, y0, x1, y1) (exclusive)"""
+        bx, by = self._block_size
+        return (
+            int(x // bx), int(y // by),
+            int((x + w - 1) // bx + 1), int((y + h - 1) // by + 1),
+        )
+
+    @contextlib.contextmanager
+    def locked(self, x, y, w, h):
+        """Context manager locking the blocks touched by a region of the raster"""
+        blocks = self.blocks_of_region(x, y, w, h)
+        with self._cond:
+            while any(_overlap(blocks, other) for other in self._held):
+                self._cond.wait()
+            self._held.append(blocks)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._held.remove(blocks)
+                self._cond.notify_all()
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
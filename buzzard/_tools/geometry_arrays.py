@@ -0,0 +1,228 @@
+"""Tools to work with arrays of geometries and with columns of field values"""
+
+import numpy as np
+import rtree.index
+import shapely
+import shapely.ops
+import shapely.wkb
+
+_DTYPE_OF_OFTSTR = {
+    'integer': np.dtype('int32'),
+    'integer64': np.dtype('int64'),
+    'real': np.dtype('float64'),
+}
+
+def shapely_of_wkbs(wkbs):
+    """Convert a sequence of WKB (or None) to an array of shapely geometries (or None)"""
+    if hasattr(shapely, 'from_wkb'):
+        # shapely>=2, vectorized conversion
+        return shapely.from_wkb(np.asarray(wkbs, dtype=object))
+    geoms = np.empty(len(wkbs), dtype=object)
+    geoms[:] = [
+        None if wkb is None else shapely.wkb.loads(bytes(wkb))
+        for wkb in wkbs
+    ]
+    return geoms
+
+def wkbs_of_shapely(geoms):
+    """Convert a sequence of shapely geometries (or None) to an array of WKB (or None)"""
+    if hasattr(shapely, 'to_wkb'):
+        # shapely>=2, vectorized conversion
+        return shapely.to_wkb(np.asarray(geoms, dtype=object))
+    wkbs = np.empty(len(geoms), dtype=object)
+    wkbs[:] = [
+        None if geom is None else geom.wkb
+        for geom in geoms
+    ]
+    return wkbs
+
+def transform_geometries(geoms, fn):
+    """Apply a coordinates transformation to an array of shapely geometries (or None). The
+    coordinates of all the geometries are packed in a single array, to call `fn` only once.
+
+    Parameters
+    ----------
+    geoms: np.ndarray of object
+    fn: callable
+        Takes and returns an array of coordinates of shape (N, 2) or (N, 3)
+    """
+    if len(geoms) == 0:
+        return geoms
+    if hasattr(shapely, 'transform'):
+        # shapely>=2, vectorized packing and rebuilding
+        return shapely.transform(geoms, fn)
+
+    arrays = [
+        arr
+        for geom in geoms
+        if geom is not None
+        for arr in _coords_arrays_of_geom(geom)
+    ]
+    res = np.empty(len(geoms), dtype=object)
+    if len({arr.shape[1] for arr in arrays}) > 1:
+        # Mixed 2d and 3d geometries, can't be packed together
+        res[:] = [
+            None if geom is None else shapely.ops.transform(fn, geom)
+            for geom in geoms
+        ]
+        return res
+    if arrays:
+        lengths = [len(arr) for arr in arrays]
+        packed = np.asarray(fn(np.concatenate(arrays)))
+        arrays = iter(np.split(packed, np.cumsum(lengths)[:-1]))
+    res[:] = [
+        None if geom is None else _geom_of_coords_arrays(geom, arrays)
+        for geom in geoms
+    ]
+    return res
+
+def simplify_geometries(geoms, tolerance):
+    """Simplify an array of shapely geometries (or None), preserving their topology"""
+    if hasattr(shapely, 'simplify'):
+        # shapely>=2, vectorized simplification
+        return shapely.simplify(geoms, tolerance, preserve_topology=True)
+    res = np.empty(len(geoms), dtype=object)
+    res[:] = [
+        None if geom is None else geom.simplify(tolerance, preserve_topology=True)
+        for geom in geoms
+    ]
+    return res
+
+def query_geometries(tree_geoms, query_geoms, predicate='intersects'):
+    """Find the pairs of geometries satisfying a predicate, using a spatial index built over
+    `tree_geoms`. The None geometries never match.
+
+    Parameters
+    ----------
+    tree_geoms: np.ndarray of object
+    query_geoms: np.ndarray of object
+    predicate: str
+        Name of a binary predicate of shapely, evaluated as `predicate(query_geom, tree_geom)`
+
+    Returns
+    -------
+    np.ndarray of int of shape (2, n)
+        Pairs of indices (in `query_geoms`, in `tree_geoms`), sorted
+    """
+    if len(tree_geoms) == 0 or len(query_geoms) == 0:
+        return np.empty((2, 0), int)
+    return GeometryIndex(tree_geoms).query(query_geoms, predicate)
+
+class GeometryIndex(object):
+    """Spatial index over an array of shapely geometries (or None), to be queried many times.
+
+    It is a shapely STRtree with shapely>=2, and a bulk loaded rtree over the bounds otherwise.
+    The index is immutable, it should be built again if the geometries change.
+    """
+
+    def __init__(self, geoms):
+        self._geoms = geoms
+        if hasattr(shapely, 'STRtree') and hasattr(shapely, 'from_wkb'):
+            self._tree = shapely.STRtree(geoms)
+            self._rtree = None
+        else:
+            self._tree = None
+            items = [
+                (i, geom.bounds, None)
+                for i, geom in enumerate(geoms)
+                if geom is not None and not geom.is_empty
+            ]
+            self._rtree = rtree.index.Index(items) if items else None
+
+    def query(self, query_geoms, predicate='intersects'):
+        """Find the pairs of geometries satisfying a predicate. The None geometries never match.
+
+        Parameters
+        ----------
+        query_geoms: np.ndarray of object
+        predicate: str
+            Name of a binary predicate of shapely, evaluated as `predicate(query_geom, tree_geom)`
+
+        Returns
+        -------
+        np.ndarray of int of shape (2, n)
+            Pairs of indices (in `query_geoms`, in the indexed geometries), sorted
+        """
+        if self._tree is not None:
+            # shapely>=2, vectorized STRtree query
+            pairs = self._tree.query(query_geoms, predicate=predicate)
+        elif self._rtree is None:
+            pairs = np.empty((2, 0), int)
+        else:
+            # The candidates are checked one by one
+            pairs = [
+                (i, j)
+                for i, geom in enumerate(query_geoms)
+                if geom is not None and not geom.is_empty
+                for j in self._rtree.intersection(geom.bounds)
+                if getattr(geom, predicate)(self._geoms[j])
+            ]
+            pairs = np.asarray(pairs, dtype=int).reshape(-1, 2).T
+        order = np.lexsort((pairs[1], pairs[0]))
+        return pairs[:, order].astype(int)
+
+def _coords_arrays_of_geom(geom):
+    """Arrays of coordinates of the simple parts of a shapely geometry, in a stable order"""
+    if geom.is_empty:
+        return []
+    if geom.geom_type == 'Polygon':
+        return [
+            np.asarray(ring.coords, dtype='float64')
+            for ring in [geom.exterior] + list(geom.interiors)
+        ]
+    if hasattr(geom, 'geoms'):
+        return [arr for part in geom.geoms for arr in _coords_arrays_of_geom(part)]
+    return [np.asarray(geom.coords, dtype='float64')]
+
+def _geom_of_coords_arrays(geom, arrays):
+    """Rebuild a shapely geometry like `geom`, consuming the arrays of `_coords_arrays_of_geom`"""
+    if geom.is_empty:
+        return geom
+    if geom.geom_type == 'Polygon':
+        exterior = next(arrays)
+        return type(geom)(exterior, [next(arrays) for _ in geom.interiors])
+    if hasattr(geom, 'geoms'):
+        return type(geom)([_geom_of_coords_arrays(part, arrays) for part in geom.geoms])
+    return type(geom)(next(arrays))
+
+def column_of_values(values, oftstr, nullable):
+    """Build a numpy column from the values of a field, as returned by OGR (with None for null)
+
+    - The numeric fields are converted to an array of int32/int64/float64. If the field is
+      nullable the array is a `np.ma.MaskedArray`, the null values being masked.
+    - The other fields are converted to an array of objects, with None for null.
+    """
+    dtype = _DTYPE_OF_OFTSTR.get(oftstr)
+    if dtype is None:
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        return arr
+    mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    if mask.any():
+        if not nullable: # pragma: no cover
+            raise ValueError('Null value in a non-nullable field')
+        values = [0 if v is None else v for v in values]
+    arr = np.asarray(values, dtype=dtype).reshape(len(values))
+    if nullable:
+        arr = np.ma.MaskedArray(arr, mask)
+    return arr
+
+def column_of_array(arr, oftstr, nullable):
+    """Build a column like `column_of_values` from a numpy array of the values of a numeric field,
+    with the null values masked. The array is copied."""
+    dtype = _DTYPE_OF_OFTSTR[oftstr]
+    mask = np.array(np.ma.getmaskarray(arr), dtype=bool)
+    arr = np.array(np.ma.getdata(arr), dtype=dtype)
+    if mask.any():
+        if not nullable: # pragma: no cover
+            raise ValueError('Null value in a non-nullable field')
+        arr[mask] = 0
+    if nullable:
+        arr = np.ma.MaskedArray(arr, mask)
+    return arr
+
+def concatenate_columns(columns):
+    """Concatenate the columns of several batches, built by `column_of_values`"""
+    if any(isinstance(col, np.ma.MaskedArray) for col in columns):
+        return np.ma.concatenate(columns)
+    return np.concatenate(columns)
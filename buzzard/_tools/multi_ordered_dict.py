@@ -7,7 +7,7 @@ class MultiOrderedDict(object):
     def __init__(self):
         self._od = collections.OrderedDict()
         self._key_of_ukey = {}
-        self._ukeys_of_key = collections.defaultdict(list)
+        self._ukeys_of_key = collections.defaultdict(collections.deque)
         self._i = 0
 
     def __str__(self): # pragma: no cover
@@ -41,7 +41,7 @@ class MultiOrderedDict(object):
         ukey_list = self._ukeys_of_key[key]
         assert len(ukey_list) > 0
         assert ukey_list[-1] == ukey
-        ukey_list.pop(-1)
+        ukey_list.pop()
 
         del self._key_of_ukey[ukey]
         if len(ukey_list) == 0:
@@ -52,7 +52,7 @@ class MultiOrderedDict(object):
     def push_front(self, key, value):
         ukey = self._i
         self._i += 1
-        self._ukeys_of_key[key].insert(0, ukey)
+        self._ukeys_of_key[key].appendleft(ukey)
         self._key_of_ukey[ukey] = key
         self._od[ukey] = value
 
@@ -62,7 +62,7 @@ class MultiOrderedDict(object):
 
         ukey_list = self._ukeys_of_key[key]
         assert len(ukey_list) > 0
-        ukey = ukey_list.pop(0)
+        ukey = ukey_list.popleft()
 
         value = self._od[ukey]
 
@@ -79,7 +79,7 @@ class MultiOrderedDict(object):
 
         ukey_list = self._ukeys_of_key[key]
         assert len(ukey_list) > 0
-        ukey = ukey_list.pop(-1)
+        ukey = ukey_list.pop()
 
         value = self._od[ukey]
 
@@ -496,7 +496,7 @@ def shatter_queue_data_method(met, name):
 
 # Tiling checks ********************************************************************************* **
 def is_tiling_covering_fp(tiling, fp, allow_outer_pixels, allow_overlapping_pixels):
-    """Is the `tiling` object, an output of `fp.tile` or `fp.tile.count`?
+    """Is the `tiling` object, an output of `fp.tile`, `fp.tile_count` or `fp.tile_grid`?
 
     if `allow_outer_pixels`
         Some pixels of `tiling` may be outside of `fp`
@@ -523,27 +523,37 @@ def is_tiling_covering_fp(tiling, fp, allow_outer_pixels, allow_overlapping_pixe
     global Footprint
     if Footprint is None:
         from buzzard._footprint import Footprint
+    from buzzard._footprint_grid import FootprintGrid
 
-    # Type checking ****************************************
-    if not isinstance(tiling, np.ndarray):
-        return False
-    if tiling.ndim != 2:
-        return False
-    for tile in tiling.flat:
-        if not isinstance(tile, Footprint):
+    if isinstance(tiling, FootprintGrid):
+        # Type checking ************************************
+        if tiling.ndim != 2:
             return False
-        if not fp.same_grid(tile):
+        if not fp.same_grid(tiling.parent):
             return False
 
-    # Pixel indices extraction *****************************
-    rtls = np.asarray([
-        fp.spatial_to_raster(tile.tl)
-        for tile in tiling.flat
-    ]).reshape(tiling.shape[0], tiling.shape[1], 2)
-    rbrs = np.asarray([
-        fp.spatial_to_raster(tile.br)
-        for tile in tiling.flat
-    ]).reshape(tiling.shape[0], tiling.shape[1], 2)
+        # Pixel indices extraction *************************
+        tiling = tiling.rebase(fp)
+        rtls = tiling.rtl
+        rbrs = tiling.rbr
+    else:
+        # Type checking ************************************
+        if not isinstance(tiling, np.ndarray):
+            return False
+        if tiling.ndim != 2:
+            return False
+        for tile in tiling.flat:
+            if not isinstance(tile, Footprint):
+                return False
+            if not fp.same_grid(tile):
+                return False
+
+        # Pixel indices extraction *************************
+        rtls = fp.spatial_to_raster_many(tiling)
+        rbrs = rtls + np.asarray([
+            tile.rsize
+            for tile in tiling.flat
+        ]).reshape(tiling.shape[0], tiling.shape[1], 2)
 
     # is tiling ********************************************
     # All line's tly equal
@@ -0,0 +1,17 @@
+"""Tools to work with the pools of the `multiprocessing` library"""
+
+import threading
+import multiprocessing as mp
+import multiprocessing.pool
+
+def is_pool_worker_thread(pool):
+    """Is the current thread one of the workers of `pool` (a ThreadPool)
+
+    Used to avoid submitting tasks to a pool from within one of its tasks and waiting for them,
+    all the workers might end up waiting for each other.
+    """
+    if not isinstance(pool, mp.pool.ThreadPool):
+        return False
+    # `_pool` is the list of worker threads, private but stable across python versions
+    workers = getattr(pool, '_pool', ())
+    return threading.current_thread() in list(workers)
@@ -0,0 +1,119 @@
+"""Tools to rasterize polygons with numpy, following the rules of GDAL's `gdal.RasterizeLayer`
+(without `ALL_TOUCHED`): A pixel is burnt if its center is inside the polygon."""
+
+import numpy as np
+import shapely
+
+def rings_of_polygons(polys):
+    """Extract the rings of shapely polygons as a single array of coordinates.
+
+    Returns
+    -------
+    xy: np.ndarray of float64 of shape (N, 2)
+        The concatenated coordinates of all the rings, each ring being closed
+    ring_lengths: np.ndarray of int of shape (R,)
+        The number of points of each ring in `xy`
+    ring_labels: np.ndarray of int of shape (R,)
+        The index of the polygon of each ring, starting from 1
+    """
+    if hasattr(shapely, 'get_rings'):
+        # shapely>=2, vectorized extraction
+        arr = np.empty(len(polys), dtype=object)
+        arr[:] = polys
+        rings, poly_idx = shapely.get_rings(arr, return_index=True)
+        xy, ring_idx = shapely.get_coordinates(rings, return_index=True)
+        ring_lengths = np.bincount(ring_idx, minlength=len(rings))
+        return xy, ring_lengths, poly_idx + 1
+
+    arrays = []
+    labels = []
+    for i, poly in enumerate(polys, 1):
+        if poly.is_empty:
+            continue
+        for ring in [poly.exterior] + list(poly.interiors):
+            arrays.append(np.asarray(ring.coords, dtype='float64')[:, :2])
+            labels.append(i)
+    if not arrays:
+        return np.empty((0, 2), 'float64'), np.empty(0, int), np.empty(0, int)
+    ring_lengths = np.asarray([len(a) for a in arrays])
+    return np.concatenate(arrays), ring_lengths, np.asarray(labels)
+
+def spans_of_rings(xy, ring_lengths, ring_labels, shape):
+    """Compute the horizontal spans of pixels whose centers are inside the rings. The rings sharing
+    the same label are filled together with the even-odd rule, holes included.
+
+    Parameters
+    ----------
+    xy: np.ndarray of float64 of shape (N, 2)
+        The concatenated coordinates of the closed rings, in pixel (x, y)
+    ring_lengths: np.ndarray of int of shape (R,)
+    ring_labels: np.ndarray of int of shape (R,)
+    shape: (int, int)
+        Shape of the raster (height, width)
+
+    Returns
+    -------
+    (rows, starts, ends, labels): 4 np.ndarray of int of shape (S,)
+        The spans `out[rows[i], starts[i]:ends[i]] = labels[i]`, sorted by label
+    """
+    height, width = shape
+
+    # Edges extraction *********************************
+    ring_ends = np.cumsum(ring_lengths)
+    is_edge = np.ones(len(xy), bool)
+    is_edge[ring_ends - 1] = False
+    i0 = np.flatnonzero(is_edge)
+    x0, y0 = xy[i0, 0], xy[i0, 1]
+    x1, y1 = xy[i0 + 1, 0], xy[i0 + 1, 1]
+    edge_labels = np.repeat(ring_labels, ring_lengths)[i0]
+
+    # Horizontal edges never cross the centers of a row
+    keep = y0 != y1
+    x0, y0, x1, y1, edge_labels = x0[keep], y0[keep], x1[keep], y1[keep], edge_labels[keep]
+
+    # Crossings with the rows' centers *****************
+    # An edge crosses the center of row `r` if `ylo <= r + 0.5 < yhi`
+    ylo, yhi = np.minimum(y0, y1), np.maximum(y0, y1)
+    r0 = np.ceil(ylo - 0.5).clip(0, height).astype(int)
+    r1 = np.ceil(yhi - 0.5).clip(0, height).astype(int)
+    counts = (r1 - r0).clip(0, None)
+    total = int(counts.sum())
+    edge_idx = np.repeat(np.arange(len(counts)), counts)
+    rows = r0[edge_idx] + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+    cy = rows + 0.5
+    xs = (cy - y0[edge_idx]) * (x1[edge_idx] - x0[edge_idx]) / (y1[edge_idx] - y0[edge_idx])
+    xs += x0[edge_idx]
+    labels = edge_labels[edge_idx]
+
+    # Pairing of the crossings *************************
+    # A closed ring crosses a row an even number of times, the crossings of a (label, row) are
+    # paired from left to right.
+    order = np.lexsort((xs, rows, labels))
+    xs, rows, labels = xs[order], rows[order], labels[order]
+    starts = np.floor(xs[0::2] + 0.5).clip(0, width).astype(int)
+    ends = np.floor(xs[1::2] + 0.5).clip(0, width).astype(int)
+    rows, labels = rows[0::2], labels[0::2]
+    keep = ends > starts
+    return rows[keep], starts[keep], ends[keep], labels[keep]
+
+def burn_spans(out, rows, starts, ends, labels=None):
+    """Burn spans in `out`, in place. If `labels` is None, burn `True`, else burn the labels, the
+    greatest label winning where spans overlap."""
+    height, width = out.shape
+    if labels is None:
+        diff = np.zeros((height, width + 1), 'int32')
+        np.add.at(diff, (rows, starts), 1)
+        np.add.at(diff, (rows, ends), -1)
+        out[np.cumsum(diff, axis=1)[:, :width] > 0] = True
+        return out
+
+    lengths = ends - starts
+    total = int(lengths.sum())
+    idx = np.repeat(rows * width + starts, lengths)
+    idx += np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    burnt = np.zeros(height * width, labels.dtype)
+    np.maximum.at(burnt, idx, np.repeat(labels, lengths))
+    burnt = burnt.reshape(height, width)
+    mask = burnt > 0
+    out[mask] = burnt[mask]
+    return out
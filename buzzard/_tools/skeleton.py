@@ -0,0 +1,140 @@
+"""Tools to convert a skeleton (a thinned mask) to polylines with array operations only"""
+
+import numpy as np
+import scipy.ndimage as ndi
+
+def graph_of_skeleton(arr):
+    """Build the graph of the pixels of a skeleton.
+
+    The pixels are linked to their 4-neighbors, and to their diagonal neighbors when those are not
+    already linked through a 4-neighbor. The 2x2 squares of pixels are collapsed to their top left
+    pixel.
+
+    Parameters
+    ----------
+    arr: np.ndarray of uint8 of shape (Y, X)
+        A thinned mask
+
+    Returns
+    -------
+    yx: np.ndarray of int of shape (N, 2)
+        Indices of the pixels of the skeleton
+    edges: np.ndarray of int of shape (M, 2)
+        Unique undirected edges, as pairs of indices in `yx`
+    """
+    # Pixel indices ************************************
+    yx = np.stack(arr.nonzero(), -1)
+    index = np.full(arr.shape, -1, dtype=int)
+    index[arr != 0] = np.arange(len(yx))
+
+    # Neighbors ****************************************
+    convolve = lambda arr, kernel: ndi.convolve(arr, kernel, mode='constant', cval=0)
+    has_top = convolve(arr, [[0, 0, 0], [0, 0, 0], [0, 1, 0]]) * arr
+    has_right = convolve(arr, [[0, 0, 0], [1, 0, 0], [0, 0, 0]]) * arr
+    has_left = convolve(arr, [[0, 0, 0], [0, 0, 1], [0, 0, 0]]) * arr
+    has_topright = convolve(arr, [[0, 0, 0], [0, 0, 0], [1, 0, 0]]) * arr
+    has_topleft = convolve(arr, [[0, 0, 0], [0, 0, 0], [0, 0, 1]]) * arr
+    has_topright = (has_topright.astype('i1') - has_right - has_top).clip(0, 1)
+    has_topleft = (has_topleft.astype('i1') - has_left - has_top).clip(0, 1)
+
+    def _neighbors_in_direction(mask, yx_vector):
+        has_indices = mask[yx[:, 0], yx[:, 1]].nonzero()[0]
+        neig_yx = yx[has_indices] + yx_vector
+        return np.c_[index[neig_yx[:, 0], neig_yx[:, 1]], has_indices]
+
+    edges = np.vstack([
+        _neighbors_in_direction(has_top, (-1, 0)),
+        _neighbors_in_direction(has_right, (0, 1)),
+        _neighbors_in_direction(has_topright, (-1, 1)),
+        _neighbors_in_direction(has_topleft, (-1, -1)),
+    ])
+
+    # 2x2 squares collapse *****************************
+    # The segments inside a square are dropped, the pixels of a square are linked to its top left
+    square_tl = convolve(arr, [[1, 1, 0], [1, 1, 0], [0, 0, 0]]) == 4
+    tly, tlx = square_tl.nonzero()
+    rep = np.full(len(yx), -1, dtype=int)
+    for dy in range(2):
+        for dx in range(2):
+            rep[index[tly + dy, tlx + dx]] = index[tly, tlx]
+    in_square = rep != -1
+    edges = edges[~(in_square[edges[:, 0]] & in_square[edges[:, 1]])]
+    members = np.unique(edges.ravel())
+    members = members[in_square[members] & (rep[members] != members)]
+    edges = np.r_[edges, np.c_[members, rep[members]]]
+
+    edges.sort(axis=1)
+    edges = np.unique(edges.reshape(-1, 2), axis=0)
+    return yx, edges
+
+def chains_of_graph(node_count, edges):
+    """Split a graph in maximal chains going through the nodes of degree 2, like
+    `shapely.ops.linemerge`. The cycles made of nodes of degree 2 only are returned as closed
+    chains.
+
+    The chains are computed with pointer jumping on the directed half-edges, in O(log(M)) numpy
+    passes.
+
+    Parameters
+    ----------
+    node_count: int
+    edges: np.ndarray of int of shape (M, 2)
+        Unique undirected edges without self-loops
+
+    Returns
+    -------
+    nodes: np.ndarray of int of shape (K,)
+        The concatenated nodes of all the chains
+    lengths: np.ndarray of int of shape (C,)
+        The number of nodes of each chain
+    """
+    m = len(edges)
+    if m == 0:
+        return np.empty(0, int), np.empty(0, int)
+
+    # Half-edges ***************************************
+    src = np.r_[edges[:, 0], edges[:, 1]]
+    dst = np.r_[edges[:, 1], edges[:, 0]]
+    hids = np.arange(2 * m)
+    rev = (hids + m) % (2 * m)
+    degree = np.bincount(src, minlength=node_count)
+
+    # Successor of a half-edge going through a node of degree 2
+    by_src = np.argsort(src, kind='stable')
+    offsets = np.r_[0, np.cumsum(degree)[:-1]]
+    first_out = by_src[offsets[dst]]
+    second_out = by_src[(offsets[dst] + 1).clip(None, 2 * m - 1)]
+    succ = np.where(first_out == rev, second_out, first_out)
+    succ[degree[dst] != 2] = -1
+
+    steps = int(np.ceil(np.log2(2 * m))) + 1
+
+    # Cycles detection and cut at their smallest half-edge
+    nxt = np.where(succ == -1, hids, succ)
+    smallest = hids.copy()
+    for _ in range(steps):
+        smallest = np.minimum(smallest, smallest[nxt])
+        nxt = nxt[nxt]
+    is_cycle = succ[nxt] != -1
+    succ[is_cycle & (succ == smallest)] = -1
+
+    # List ranking *************************************
+    nxt = np.where(succ == -1, hids, succ)
+    dist = (succ != -1).astype(int)
+    for _ in range(steps):
+        dist = dist + dist[nxt]
+        nxt = nxt[nxt]
+    tail = nxt
+
+    # Each chain is found in both directions, keep one of them
+    keep = tail < tail[rev]
+    hids, tail, dist = hids[keep], tail[keep], dist[keep]
+    order = np.lexsort((-dist, tail))
+    hids, tail = hids[order], tail[order]
+
+    # Nodes of the chains ******************************
+    is_last = np.r_[tail[1:] != tail[:-1], True]
+    last_pos = np.flatnonzero(is_last)
+    nodes = np.insert(src[hids], last_pos + 1, dst[hids[last_pos]])
+    lengths = np.diff(np.r_[-1, last_pos]) + 1
+    return nodes, lengths
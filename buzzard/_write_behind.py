@@ -0,0 +1,155 @@
+"""Private module for the asynchronous writes of the file rasters (`async_writes` parameter)"""
+
+import collections
+import threading
+
+import numpy as np
+
+_Write = collections.namedtuple('_Write', 'array fp channel_ids interpolation mask nbytes')
+
+class WriteBehind(object):
+    """Queue of pending `set_data` calls of one raster, written in a pool by a single drainer at
+    a time to preserve the order of the writes.
+
+    - `put` returns as soon as the write is queued, it blocks while more than `max_bytes` are
+      pending (backpressure)
+    - Two queued writes that are adjacent on the grid of the raster are merged into a single one
+    - `flush` waits until all the queued writes are performed
+    - An exception raised by a write is stored and re-raised by the next `put` or `flush`, the
+      writes queued after it are discarded
+
+    When the calling thread has to wait and no drainer is running (for example because the pool
+    is busy, or because the caller is itself a worker of the pool), the calling thread performs
+    the writes.
+    """
+
+    def __init__(self, write, fp, pool, max_bytes):
+        self._write = write
+        self._fp = fp
+        self._pool = pool
+        self._max_bytes = max_bytes
+        self._max_merge_bytes = max(1, max_bytes // 4)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._queue = collections.deque()
+        self._pending_bytes = 0
+        self._draining = False
+        self._scheduled = False
+        self._error = None
+
+    @property
+    def pending_bytes(self):
+        """Number of bytes queued or being written"""
+        with self._cond:
+            return self._pending_bytes
+
+    def put(self, array, fp, channel_ids, interpolation, mask):
+        """Queue a write, the inputs are copied"""
+        array = np.array(array, copy=True)
+        if mask is not None:
+            mask = np.array(mask, copy=True)
+        w = _Write(array, fp, channel_ids, interpolation, mask, array.nbytes)
+
+        with self._cond:
+            self._raise_error()
+            self._wait_for(
+                lambda: self._pending_bytes == 0 or
+                self._pending_bytes + w.nbytes <= self._max_bytes
+            )
+            self._raise_error()
+            self._pending_bytes += w.nbytes
+            if self._queue:
+                merged = self._merge(self._queue[-1], w)
+                if merged is not None:
+                    self._queue[-1] = merged
+                    w = None
+            if w is not None:
+                self._queue.append(w)
+            if not self._draining and not self._scheduled:
+                self._scheduled = True
+                self._pool.apply_async(self._scheduled_drain)
+
+    def flush(self):
+        """Wait until all the queued writes are performed"""
+        with self._cond:
+            self._wait_for(lambda: not self._queue and not self._draining)
+            self._raise_error()
+
+    # Private ******************************************************************************** **
+    def _wait_for(self, predicate):
+        """Wait for `predicate`, drain the queue on the calling thread if nobody is doing it.
+        Called with the lock held."""
+        while not predicate():
+            if self._queue and not self._draining:
+                self._drain()
+            else:
+                self._cond.wait()
+
+    def _scheduled_drain(self):
+        with self._cond:
+            self._scheduled = False
+            if self._queue and not self._draining:
+                self._drain()
+
+    def _drain(self):
+        """Perform the queued writes. Called with the lock held, releases it during the writes."""
+        self._draining = True
+        try:
+            while self._queue:
+                w = self._queue.popleft()
+                self._cond.release()
+                try:
+                    self._write(w.array, w.fp, w.channel_ids, w.interpolation, w.mask)
+                except Exception as e:
+                    error = e
+                else:
+                    error = None
+                finally:
+                    self._cond.acquire()
+                self._pending_bytes -= w.nbytes
+                if error is not None:
+                    if self._error is None:
+                        self._error = error
+                    self._queue.clear()
+                    self._pending_bytes = 0
+                self._cond.notify_all()
+        finally:
+            self._draining = False
+            self._cond.notify_all()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise RuntimeError('An asynchronous write to the raster failed: {}'.format(
+                error
+            )) from error
+
+    def _merge(self, a, b):
+        """Merge two writes if `b` is just right or just below `a` on the grid of the raster,
+        return None otherwise"""
+        if a.mask is not None or b.mask is not None:
+            return None
+        if a.channel_ids != b.channel_ids or a.array.dtype != b.array.dtype:
+            return None
+        if a.nbytes + b.nbytes > self._max_merge_bytes:
+            return None
+        if not a.fp.same_grid(self._fp) or not b.fp.same_grid(self._fp):
+            return None
+        ax, ay = self._fp.spatial_to_raster(a.fp.tl)
+        bx, by = self._fp.spatial_to_raster(b.fp.tl)
+        aw, ah = a.fp.rsize
+        bw, bh = b.fp.rsize
+        if min(ax, ay, bx, by) < 0:
+            return None
+        if max(ax + aw, bx + bw) > self._fp.rsizex or max(ay + ah, by + bh) > self._fp.rsizey:
+            return None
+        if ay == by and ah == bh and ax + aw == bx:
+            array = np.concatenate([a.array, b.array], axis=1)
+            fp = self._fp.clip(ax, ay, bx + bw, ay + ah)
+        elif ax == bx and aw == bw and ay + ah == by:
+            array = np.concatenate([a.array, b.array], axis=0)
+            fp = self._fp.clip(ax, ay, ax + aw, by + bh)
+        else:
+            return None
+        return _Write(array, fp, a.channel_ids, a.interpolation, None, a.nbytes + b.nbytes)
@@ -15,26 +15,51 @@ class Analysis(object):
         self.angles_valid = None
         self.ratio_valid = None
 
-        if isinstance(rect, Footprint):
-            self._run_rect_analysis(transformation, inverse, _tools.Rect(*rect.coords))
-        elif np.asarray(rect).shape == (4,):
-            minx, maxx, miny, maxy = rect
-            rect = _tools.Rect(
-                (minx, maxy),
-                (minx, miny),
-                (maxx, miny),
-                (maxx, maxy),
-            )
-            self._run_rect_analysis(transformation, inverse, rect)
+        rect1 = _rect_of_any(rect)
+        if rect1 is not None:
+            coords2 = np.asarray(transformation(rect1.coords))[:, :2]
+            coords3 = None
+            if np.isfinite(coords2).all():
+                coords3 = np.asarray(inverse(coords2))[:, :2]
+            self._run_rect_analysis(rect1, coords2, coords3)
+
+    @classmethod
+    def many(cls, transformation, inverse, rects):
+        """Analyse a transformation on many rectangles, with a single call to `transformation` and
+        a single call to `inverse`. Returns a list of `Analysis`."""
+        rects1 = [_rect_of_any(rect) for rect in rects]
+        indices = [i for i, rect1 in enumerate(rects1) if rect1 is not None]
+        coords2 = [None] * len(rects1)
+        coords3 = [None] * len(rects1)
+        if indices:
+            coords1 = np.concatenate([rects1[i].coords for i in indices])
+            arr2 = np.asarray(transformation(coords1))[:, :2]
+            # The inverse transformation is only run on the rectangles with finite coordinates
+            finite = np.repeat(np.isfinite(arr2).reshape(-1, 8).all(axis=1), 4)
+            arr3 = np.full_like(arr2, np.nan)
+            if finite.any():
+                arr3[finite] = np.asarray(inverse(arr2[finite]))[:, :2]
+            for j, i in enumerate(indices):
+                coords2[i] = arr2[j * 4:j * 4 + 4]
+                if finite[j * 4]:
+                    coords3[i] = arr3[j * 4:j * 4 + 4]
 
-    def _run_rect_analysis(self, transformation, inverse, rect1):
+        res = []
+        for rect1, c2, c3 in zip(rects1, coords2, coords3):
+            an = cls(transformation, inverse, None)
+            if rect1 is not None:
+                an._run_rect_analysis(rect1, c2, c3)
+            res.append(an)
+        return res
+
+    def _run_rect_analysis(self, rect1, coords2, coords3):
         # *************************************************************************************** **
         self.conversions_finite = False
-        rect2 = _tools.Rect(*np.asarray(transformation(rect1.coords))[:, :2])
+        rect2 = _tools.Rect(*coords2)
         if not np.isfinite(rect2.coords).all():
             self.messages.append('forward transformation yielded an infite or nan value')
             return
-        rect3 = _tools.Rect(*np.asarray(inverse(rect2.coords))[:, :2])
+        rect3 = _tools.Rect(*coords3)
         if not np.isfinite(rect3.coords).all():
             self.messages.append('inverse transformation yielded an infite or nan value')
             return
@@ -104,3 +129,17 @@ class Analysis(object):
             return
         self.ratio_valid = True
         # *************************************************************************************** **
+
+def _rect_of_any(rect):
+    """Convert a Footprint or an extent to a `_tools.Rect`, returns None otherwise"""
+    if isinstance(rect, Footprint):
+        return _tools.Rect(*rect.coords)
+    if np.asarray(rect).shape == (4,):
+        minx, maxx, miny, maxy = rect
+        return _tools.Rect(
+            (minx, maxy),
+            (minx, miny),
+            (maxx, miny),
+            (maxx, maxy),
+        )
+    return None
@@ -5,6 +5,7 @@ from __future__ import division, print_function
 import uuid
 import os
 import sys
+import threading
 import multiprocessing as mp
 import multiprocessing.pool
 
@@ -138,6 +139,50 @@ def test_vector_concurrent():
 
     p.terminate()
 
+def test_vector_concurrent_wait():
+
+    def _work(i):
+        point, = r1.iter_data(None)
+        assert ds._back.used_count(r1._back.uid) <= 2
+        return point
+
+    ds = buzz.Dataset(max_active=3, max_active_per_source=2, active_timeout=None)
+    meta = dict(
+        type='point',
+    )
+
+    p = mp.pool.ThreadPool(4)
+    with ds.acreate_vector('/tmp/v1.shp', **meta).delete as r1:
+        pt = sg.Point([42, 45])
+        r1.insert_data(pt)
+        r1.deactivate()
+
+        points = list(p.map(_work, range(1000)))
+        assert all(p == pt for p in points)
+        assert (ds._back.idle_count(), ds._back.used_count(), ds.active_count) == (2, 0, 2)
+
+        stats = ds.activation_stats
+        assert stats['idle'] == 2
+        assert stats['used'] == 0
+        assert stats['allocations'] >= 2
+        assert stats['hits'] + stats['allocations'] >= 1001
+
+    p.terminate()
+
+def test_timeout():
+    ds = buzz.Dataset(max_active=1, active_timeout=0.1)
+    meta = dict(
+        type='point',
+    )
+    with ds.acreate_vector('/tmp/v1.shp', **meta).delete as r1:
+        r1.insert_data([0, 0])
+        it = r1.iter_data()
+        next(it)
+        with pytest.raises(RuntimeError, match='simultaneous'):
+            next(r1.iter_data())
+        assert ds.activation_stats['waits'] == 1
+        del it
+
 def test_raster():
     ds = buzz.DataSource(max_activated=2) # Test deprecated name
     meta = dict(
@@ -208,3 +253,32 @@ def test_raster():
             return
 
     assert (ds._back.idle_count(), ds._back.used_count(), ds.active_count) == (0, 0, 0)
+
+def test_deactivate_during_allocation():
+    back_ds = buzz.Dataset()._back
+    uid = uuid.uuid4()
+    started, release = threading.Event(), threading.Event()
+
+    def allocator():
+        started.set()
+        release.wait()
+        return object()
+
+    def use():
+        with back_ds.acquire_driver_object(uid, allocator):
+            pass
+
+    t = threading.Thread(target=use)
+    t.start()
+    started.wait()
+    # The driver object being allocated counts as used
+    with pytest.raises(RuntimeError, match='deactivate'):
+        back_ds.deactivate(uid)
+    with pytest.raises(RuntimeError, match='deactivate'):
+        back_ds.deactivate_many({uid})
+    release.set()
+    t.join()
+
+    assert back_ds.idle_count(uid) == 1
+    back_ds.deactivate(uid)
+    assert back_ds.active_count(uid) == 0
@@ -0,0 +1,127 @@
+"""Tests for the lazy opening of GDALFileRaster and GDALFileVector (`lazy` parameter)"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import os
+import tempfile
+import uuid
+
+import pytest
+import shapely.geometry as sg
+
+import buzzard as buzz
+from buzzard import Footprint
+from buzzard._gdal_file_raster import BackGDALFileRaster
+from buzzard._gdal_file_vector import BackGDALFileVector
+from buzzard.test.tools import fpeq
+
+@pytest.fixture()
+def paths():
+    d = tempfile.gettempdir()
+    rasters = ['{}/{}.tif'.format(d, uuid.uuid4()) for _ in range(3)]
+    vector = '{}/{}.shp'.format(d, uuid.uuid4())
+    cache = '{}/{}.json'.format(d, uuid.uuid4())
+
+    ds = buzz.Dataset()
+    for i, path in enumerate(rasters):
+        fp = Footprint(tl=(i * 10, 0), size=(10, 10), rsize=(10, 10))
+        with ds.acreate_raster(path, fp, 'uint8', 1, {'nodata': 0}, sr='EPSG:2154').close as r:
+            r.fill(i + 1)
+    with ds.acreate_vector(vector, 'polygon', [{'name': 'id', 'type': int}]).close as v:
+        v.insert_data(sg.box(0, 0, 1, 1), [42])
+
+    yield rasters, vector, cache
+
+    for path in rasters:
+        os.remove(path)
+    buzz.Dataset().aopen_vector(vector).delete()
+    if os.path.isfile(cache):
+        os.remove(cache)
+
+def test_lazy_raster(paths):
+    rasters, _, _ = paths
+    ds = buzz.Dataset()
+    eager = ds.aopen_raster(rasters[1])
+    lazy = ds.aopen_raster(rasters[1], lazy=True)
+    assert eager.active
+    assert not lazy.active
+    assert fpeq(eager.fp, lazy.fp)
+    assert eager.dtype == lazy.dtype
+    assert eager.channels_schema == lazy.channels_schema
+    assert eager.wkt_stored == lazy.wkt_stored
+    assert lazy.block_size == eager.block_size
+    assert (lazy.get_data() == 2).all()
+    assert lazy.active
+    ds.close()
+
+def test_lazy_vector(paths):
+    _, vector, _ = paths
+    ds = buzz.Dataset()
+    eager = ds.aopen_vector(vector)
+    lazy = ds.aopen_vector(vector, lazy=True)
+    assert eager.active
+    assert not lazy.active
+    assert eager.fields == lazy.fields
+    assert eager.type == lazy.type
+    assert eager.layer == lazy.layer
+    assert len(lazy) == 1
+    assert lazy.active
+    ds.close()
+
+def test_headers_cache(paths, monkeypatch):
+    rasters, vector, cache = paths
+
+    ds = buzz.Dataset(headers_cache=cache)
+    ds.preload_raster_headers(rasters)
+    ds.preload_vector_headers([vector])
+    assert os.path.isfile(cache)
+    ds.close()
+
+    def _fail(*_):
+        assert False, 'headers should be read from the cache'
+    monkeypatch.setattr(BackGDALFileRaster, 'read_header', _fail)
+    monkeypatch.setattr(BackGDALFileVector, 'read_header', _fail)
+
+    ds = buzz.Dataset(headers_cache=cache)
+    rs = [ds.aopen_raster(path, lazy=True) for path in rasters]
+    v = ds.aopen_vector(vector, lazy=True)
+    assert ds.active_count == 0
+    for i, r in enumerate(rs):
+        assert (r.get_data() == i + 1).all()
+    (geom, value), = v.iter_data('id')
+    assert geom.equals(sg.box(0, 0, 1, 1))
+    assert value == 42
+    ds.close()
+
+    # A modified file is not matched with its old header
+    os.utime(rasters[0], (0, 0))
+    ds = buzz.Dataset(headers_cache=cache)
+    with pytest.raises(AssertionError, match='cache'):
+        ds.aopen_raster(rasters[0], lazy=True)
+    ds.close()
+
+def test_headers_cache_relative_path(paths, monkeypatch):
+    rasters, vector, cache = paths
+    d, name = os.path.split(rasters[0])
+    vname = os.path.basename(vector)
+
+    # Cached through relative paths from one directory, reused from another one
+    monkeypatch.chdir(d)
+    ds = buzz.Dataset(headers_cache=cache)
+    ds.preload_raster_headers([name])
+    ds.preload_vector_headers([vname])
+    ds.open_raster_mosaic('mosaic', [name])
+    ds.close()
+
+    monkeypatch.chdir(os.path.dirname(d))
+    rel = os.path.join(os.path.basename(d), name)
+    vrel = os.path.join(os.path.basename(d), vname)
+    ds = buzz.Dataset(headers_cache=cache)
+    r = ds.aopen_raster(rel, lazy=True)
+    v = ds.aopen_vector(vrel, lazy=True)
+    assert r.path == rel
+    assert (r.get_data() == 1).all()
+    assert len(v) == 1
+    assert (ds.aopen_raster_mosaic([rel]).get_data() == 1).all()
+    ds.close()
@@ -626,3 +626,29 @@ def test_mode4(fps, shp1_path, tif1_path, shp2_path, tif2_path, shp3_path, tif3_
         raster3_poly = shapely.ops.transform(f, shp3)
 
         assert (shp3 ^ raster3_poly).is_empty
+
+def test_transforms_memoized(fps, shp1_path, tif1_path, env):
+    ds = buzz.Dataset(sr_work=SR2['wkt'])
+    ds.open_raster('a', tif1_path)
+    ds.open_raster('b', tif1_path)
+    ds.open_vector('c', shp1_path)
+    assert ds.a._back.to_work is ds.b._back.to_work is ds.c._back.to_work
+    analyses = dict(ds._back._analyses)
+    assert len(analyses) == 2
+
+    ds.open_raster('d', tif1_path)
+    assert ds._back._analyses == analyses
+    with buzz.Env(significant=7):
+        ds.open_raster('e', tif1_path)
+    assert len(ds._back._analyses) == 3
+
+    # Batch analysis, same results as one by one
+    letters = string.ascii_uppercase[:9]
+    ds.preload_raster_headers([tif1_path])
+    to_work, to_virtual = ds.a._back.to_work, ds.a._back.to_virtual
+    rects = [fps[letter] for letter in letters] + [fps[letter].extent for letter in letters] + [None]
+    for an0, an1 in zip(buzz.srs.Analysis.many(to_work, to_virtual, rects), [
+            buzz.srs.Analysis(to_work, to_virtual, rect)
+            for rect in rects
+    ]):
+        assert an0.__dict__ == an1.__dict__
@@ -0,0 +1,85 @@
+"""Tests for the Footprints derived from other Footprints and for the cached attributes"""
+
+# pylint: disable=redefined-outer-name
+
+import pickle
+
+import numpy as np
+import pytest
+
+import buzzard as buzz
+from buzzard import Footprint
+
+@pytest.fixture(params=['north_up', 'rotated'])
+def fp(request):
+    if request.param == 'north_up':
+        yield Footprint(tl=(672939.369686, 6876118.107215), size=(24.02, 24.02), rsize=(1201, 1201))
+    else:
+        with buzz.Env(allow_complex_footprint=True):
+            yield Footprint(gt=(100, 0.5, 0.1, 200, 0.2, -0.5), rsize=(60, 40))
+
+def _assert_same(a, b):
+    assert type(a) is type(b)
+    assert a.gt.tolist() == b.gt.tolist()
+    assert a.rsize.tolist() == b.rsize.tolist()
+    assert a.rsize.dtype == b.rsize.dtype
+    assert a.coords.tolist() == b.coords.tolist()
+    assert a._significant_min == pytest.approx(b._significant_min, abs=1e-6)
+    assert a == b
+    assert hash(a) == hash(b)
+
+def test_derived_same_as_constructed(fp):
+    derived = [
+        fp.clip(10, 5, 30, 25),
+        fp.clip(-20, -15, None, None),
+        fp.dilate(3),
+        fp.erode(2),
+        fp.intersection(fp.clip(10, 5, 30, 25)),
+    ]
+    derived += list(fp.tile((16, 16), boundary_effect='shrink').flat)
+    derived += list(fp.tile_grid((16, 16), boundary_effect='shrink').flat)
+    derived += list(fp.tile((16, 16), boundary_effect='exclude', boundary_effect_locus='tl').flat)
+    for dfp in derived:
+        _assert_same(dfp, Footprint(gt=dfp.gt, rsize=dfp.rsize))
+        _assert_same(dfp, pickle.loads(pickle.dumps(dfp)))
+
+def test_derived_errors(fp):
+    with pytest.raises(ValueError):
+        fp.clip(10, 10, 10, 20)
+    with pytest.raises(ValueError):
+        fp.erode(fp.rsizex)
+
+def test_cached_attributes(fp):
+    coords = fp.coords
+    coords[0] = 42
+    assert (fp.coords != 42).all()
+    assert (fp.tl != 42).all()
+    tl = fp.tl
+    tl[:] = 42
+    assert (fp.tl != 42).all()
+
+    assert fp.poly is fp.poly
+    assert np.allclose(np.asarray(fp.poly.exterior.coords)[:-1], fp.coords)
+    assert hash(fp) == hash(Footprint(gt=fp.gt, rsize=fp.rsize))
+    assert {fp: 1}[fp.clip(0, 0, None, None)] == 1
+
+def test_spatial_to_raster_many(fp):
+    tiles = fp.tile((16, 16), boundary_effect='shrink')
+    expected = np.asarray([fp.spatial_to_raster(t.tl) for t in tiles.flat]).reshape(tiles.shape + (2,))
+    assert (fp.spatial_to_raster_many(tiles) == expected).all()
+    assert (fp.spatial_to_raster_many(list(tiles.flat)) == expected.reshape(-1, 2)).all()
+    assert (fp.spatial_to_raster_many(fp.tile_grid((16, 16), boundary_effect='shrink')) == expected).all()
+
+    big = fp.dilate(5)
+    assert (big.spatial_to_raster_many(fp.tile_grid((16, 16), boundary_effect='shrink')) == expected + 5).all()
+    assert big.spatial_to_raster_many(tiles, dtype=float).dtype == np.float64
+    assert fp.spatial_to_raster_many([]).shape == (0, 2)
+
+def test_spatial_to_raster_constants_follow_env(fp):
+    xy = fp.raster_to_spatial([[1.5, 2.5]])
+    with buzz.Env(significant=12):
+        assert (fp.spatial_to_raster(xy) == [[1, 2]]).all()
+    with buzz.Env(significant=int(fp._significant_min)):
+        with pytest.raises(RuntimeError):
+            fp.spatial_to_raster(xy)
+    assert (fp.spatial_to_raster(xy) == [[1, 2]]).all()
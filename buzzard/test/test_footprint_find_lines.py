@@ -0,0 +1,68 @@
+"""Tests for Footprint.find_lines"""
+
+# pylint: disable=redefined-outer-name
+
+import multiprocessing.pool
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+import shapely.ops
+
+import buzzard as buzz
+
+def _coords_set(lines):
+    return sorted(sorted([tuple(l.coords[0]), tuple(l.coords[-1])]) + [len(l.coords)] for l in lines)
+
+def test_simple():
+    a = np.asarray([
+        [0, 1, 1, 1, 0],
+        [0, 1, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 1, 0, 0, 0],
+        [0, 1, 1, 0, 0],
+    ])
+    fp = buzz.Footprint(tl=(0, 0), size=(5, 5), rsize=(5, 5))
+    lines = fp.find_lines(a, (0, 0))
+    assert sorted(l.length for l in lines) == [2, 3, 4]
+    degrees = {}
+    for l in lines:
+        for pt in [l.coords[0], l.coords[-1]]:
+            degrees[pt] = degrees.get(pt, 0) + 1
+    assert degrees == {(1, -2): 3, (3, -2): 1, (2, -4): 1, (3, 0): 1}
+
+    segments = fp.find_lines(a, (0, 0), merge=False)
+    assert len(segments) == 9
+    assert all(len(l.coords) == 2 for l in segments)
+    assert shapely.ops.unary_union(segments).equals(shapely.ops.unary_union(lines))
+
+    assert fp.find_lines(np.zeros(fp.shape, bool)) == []
+
+def test_cycle():
+    a = np.zeros((7, 7), bool)
+    a[1, 1:6] = 1
+    a[5, 1:6] = 1
+    a[1:6, 1] = 1
+    a[1:6, 5] = 1
+    fp = buzz.Footprint(tl=(0, 0), size=(7, 7), rsize=(7, 7))
+    lines = fp.find_lines(a, (0, 0))
+    assert len(lines) == 1
+    assert lines[0].is_ring
+    assert lines[0].length == 16
+
+@pytest.mark.parametrize('tile_size', [(16, 16), (25, 40)])
+def test_tiled(tile_size):
+    rng = np.random.RandomState(42)
+    fp = buzz.Footprint(tl=(100, 200), size=(100, 80), rsize=(100, 80))
+    roads = [
+        sg.LineString(fp.raster_to_spatial(rng.uniform(0, 80, (4, 2))))
+        for _ in range(6)
+    ]
+    mask = fp.burn_polygons([l.buffer(1.5) for l in roads])
+
+    ref = fp.find_lines(mask)
+    pool = multiprocessing.pool.ThreadPool(2)
+    for p in [None, pool]:
+        lines = fp.find_lines(mask, tile_size=tile_size, pool=p)
+        assert _coords_set(lines) == _coords_set(ref)
+    pool.terminate()
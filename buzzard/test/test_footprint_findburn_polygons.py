@@ -100,3 +100,73 @@ def test_find(fullfp, geometries, truth):
     geometries_test = fullfp.find_polygons(truth)
     multipoly_test = sg.MultiPolygon(geometries_test)
     assert (multipoly_ref ^ multipoly_test).is_empty
+
+def test_burn_random_polygons():
+    rng = npr.RandomState(42)
+    fp = buzz.Footprint(tl=(100, 200), size=(50, 40), rsize=(100, 80))
+    polys = []
+    for _ in range(30):
+        center = fp.raster_to_spatial(rng.uniform(-10, 110, 2))
+        poly = sg.Polygon(center + rng.uniform(-8, 8, (6, 2))).buffer(0)
+        if rng.rand() < 0.5:
+            poly = poly.difference(sg.Point(center).buffer(1.5))
+        polys.append(poly)
+    polys = [p for p in polys if not p.is_empty]
+
+    # Reference: a pixel is burnt if its center is inside a polygon, the last polygon winning
+    centers = [sg.Point(xy) for xy in fp.raster_to_spatial(np.dstack(fp.meshgrid_raster) + 0.5).reshape(-1, 2)]
+    ref = np.zeros(fp.shape, 'uint8')
+    for i, poly in enumerate(_iter_polys(polys), 1):
+        ref.flat[np.asarray([poly.contains(pt) for pt in centers])] = i
+
+    assert (fp.burn_polygons(polys) == (ref > 0)).all()
+    labels = fp.burn_polygons(polys, labelize=True)
+    assert labels.dtype == np.uint8
+    assert (labels == ref).all()
+
+    # Burning in an existing array
+    out = np.full(fp.shape, 250, 'uint16')
+    assert fp.burn_polygons(polys, labelize=True, out=out) is out
+    assert (out == np.where(ref > 0, ref, 250)).all()
+    out = np.zeros(fp.shape, bool)
+    fp.burn_polygons(polys[:5], out=out)
+    fp.burn_polygons(polys[5:], out=out)
+    assert (out == (ref > 0)).all()
+
+    touched = fp.burn_polygons(polys, all_touched=True)
+    assert (touched >= (ref > 0)).all()
+    assert (fp.burn_polygons(polys, all_touched=True, labelize=True) > 0).sum() == touched.sum()
+
+    with pytest.raises(ValueError):
+        fp.burn_polygons(polys, out=np.zeros((3, 3), bool))
+    with pytest.raises(ValueError):
+        fp.burn_polygons(polys, labelize=True, out=np.zeros(fp.shape, bool))
+
+def _iter_polys(polys):
+    for poly in polys:
+        if isinstance(poly, sg.MultiPolygon):
+            yield from poly.geoms
+        else:
+            yield poly
+
+@pytest.mark.parametrize('tile_size', [(4, 4), (5, 3), (100, 100)])
+def test_find_tiled(fullfp, geometries, truth, tile_size):
+    import multiprocessing.pool
+    multipoly_ref = sg.MultiPolygon(geometries)
+    count_ref = len(fullfp.find_polygons(truth))
+
+    geometries_test = fullfp.find_polygons(truth, tile_size=tile_size)
+    assert len(geometries_test) == count_ref
+    assert (multipoly_ref ^ sg.MultiPolygon(geometries_test)).is_empty
+
+    pool = multiprocessing.pool.ThreadPool(3)
+    geometries_test = fullfp.find_polygons(truth, tile_size=tile_size, pool=pool)
+    pool.terminate()
+    assert len(geometries_test) == count_ref
+    assert (multipoly_ref ^ sg.MultiPolygon(geometries_test)).is_empty
+
+    ds = buzz.Dataset()
+    with ds.awrap_numpy_raster(fullfp, truth.astype('uint8')).close as r:
+        geometries_test = fullfp.find_polygons(r, tile_size=tile_size)
+    assert len(geometries_test) == count_ref
+    assert (multipoly_ref ^ sg.MultiPolygon(geometries_test)).is_empty
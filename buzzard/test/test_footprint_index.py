@@ -0,0 +1,82 @@
+"""Tests for FootprintIndex"""
+
+# pylint: disable=redefined-outer-name
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+
+from buzzard import Footprint, FootprintIndex
+
+@pytest.fixture(scope='module')
+def fp():
+    return Footprint(tl=(100, 200), size=(100, 70), rsize=(100, 70))
+
+def _brute_force(fps, obj):
+    poly = obj.poly if isinstance(obj, Footprint) else obj
+    return np.asarray([
+        i for i, tile in enumerate(fps.flat)
+        if not tile.poly.disjoint(poly) and not tile.poly.touches(poly)
+    ], dtype=int)
+
+def _queries(fp):
+    return [
+        fp.clip(10, 10, 45, 25),
+        fp.clip(30, 20, 60, 40),
+        fp.clip(0, 0, 1, 1),
+        fp.dilate(10),
+        fp.dilate(10).clip(0, 0, 5, 5),
+        Footprint(tl=(110.1, 190.1), size=(5, 5), rsize=(3, 3)),
+        sg.Point(150.5, 160.5).buffer(12),
+        sg.LineString([(100, 200), (200, 130)]),
+        sg.Point(130, 170),
+    ]
+
+@pytest.mark.parametrize('mode', ['grid', 'aligned', 'rtree'])
+def test_query(fp, mode):
+    if mode == 'grid':
+        tiles = fp.tile((30, 20), 5, 5, boundary_effect='shrink')
+    elif mode == 'aligned':
+        tiles = np.asarray([fp.clip(0, 0, 20, 20), fp.clip(50, 10, 90, 35), fp.clip(15, 15, 60, 70)], dtype=object)
+    else:
+        tiles = np.asarray([fp.clip(0, 0, 20, 20), Footprint(tl=(140.5, 180.5), size=(20, 20), rsize=(7, 7))], dtype=object)
+    index = FootprintIndex(tiles)
+    assert index.mode == mode
+    assert index.shape == tiles.shape
+    assert len(index) == tiles.size
+
+    queries = _queries(fp)
+    for obj in queries:
+        assert (index.query(obj) == _brute_force(tiles, obj)).all(), obj
+
+    pairs = index.query_bulk(queries)
+    for i, obj in enumerate(queries):
+        assert (pairs[1, pairs[0] == i] == _brute_force(tiles, obj)).all()
+
+    xy = np.random.RandomState(42).uniform([90, 120], [210, 210], (100, 2))
+    xy = np.r_[xy, fp.raster_to_spatial([[30, 20], [0, 0], [100, 70]])]
+    pairs = index.query_points(xy)
+    for i, pt in enumerate(xy):
+        expected = [
+            j for j, tile in enumerate(tiles.flat)
+            if ((0 <= tile.spatial_to_raster(pt, dtype=float)) & (tile.spatial_to_raster(pt, dtype=float) < tile.rsize)).all()
+        ]
+        assert pairs[1, pairs[0] == i].tolist() == expected
+
+def test_grid(fp):
+    grid = fp.tile_grid((10, 10))
+    index = FootprintIndex(grid)
+    assert index.mode == 'grid'
+    assert index.footprint(13) == grid.flat[13]
+    assert index.query(fp.clip(15, 15, 25, 25)).tolist() == [11, 12, 21, 22]
+
+    # Bulk query between two tilings
+    other = fp.tile_grid((25, 25), boundary_effect='shrink')
+    pairs = index.query_bulk(other)
+    for i, tile in enumerate(other.flat):
+        assert (pairs[1, pairs[0] == i] == index.query(tile)).all()
+    assert (index.query_bulk(other.to_ndarray()) == pairs).all()
+
+    assert index.query_bulk([]).shape == (2, 0)
+    with pytest.raises(TypeError):
+        index.query(42)
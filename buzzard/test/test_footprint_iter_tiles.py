@@ -0,0 +1,70 @@
+"""Tests for Footprint.iter_tiles"""
+
+# pylint: disable=redefined-outer-name
+
+import itertools
+
+import numpy as np
+import pytest
+
+from buzzard import Footprint
+from buzzard.test.tools import assert_tiles_eq
+
+@pytest.fixture(scope='module')
+def fp():
+    return Footprint(tl=(100, 200), size=(100, 70), rsize=(100, 70))
+
+@pytest.mark.parametrize('boundary_effect,locus', itertools.product(
+    ['extend', 'exclude', 'shrink'],
+    ['br', 'tr', 'tl', 'bl'],
+))
+@pytest.mark.parametrize('order', ['row', 'column', 'zorder', 'hilbert'])
+def test_same_tiles_as_tile(fp, boundary_effect, locus, order):
+    tiles = fp.tile((30, 20), 5, 3, boundary_effect=boundary_effect, boundary_effect_locus=locus)
+    it = fp.iter_tiles(
+        (30, 20), 5, 3, boundary_effect=boundary_effect, boundary_effect_locus=locus, order=order,
+    )
+    assert len(it) == tiles.size
+    assert it.shape == tiles.shape
+
+    indices = list(it.indices())
+    assert sorted(indices) == sorted(np.ndindex(*tiles.shape))
+    assert_tiles_eq(list(it), [tiles[idx] for idx in indices])
+    if order == 'row':
+        assert_tiles_eq(list(it), tiles.flatten())
+    elif order == 'column':
+        assert_tiles_eq(list(it), tiles.T.flatten())
+
+def test_curves():
+    fp = Footprint(tl=(0, 0), size=(64, 64), rsize=(64, 64))
+
+    it = fp.iter_tiles((4, 4), order='zorder')
+    assert list(it.indices())[:8] == [
+        (0, 0), (0, 1), (1, 0), (1, 1), (0, 2), (0, 3), (1, 2), (1, 3),
+    ]
+
+    # On a square of side a power of two, the hilbert curve only moves to neighbors
+    it = fp.iter_tiles((4, 4), order='hilbert')
+    indices = np.asarray(list(it.indices()))
+    assert len(indices) == 256
+    assert (np.abs(np.diff(indices, axis=0)).sum(axis=1) == 1).all()
+
+    # Any shape is supported
+    for shape in [(1, 1000), (13, 29), (5, 1)]:
+        fp = Footprint(tl=(0, 0), size=shape[::-1], rsize=shape[::-1])
+        for order in ['zorder', 'hilbert']:
+            indices = list(fp.iter_tiles((1, 1), order=order).indices())
+            assert sorted(indices) == sorted(np.ndindex(*shape))
+
+def test_lazy():
+    fp = Footprint(tl=(0, 0), size=(1e7, 1e7), rsize=(10000000, 10000000))
+    it = fp.iter_tiles((100, 100), order='hilbert')
+    assert len(it) == 10 ** 10
+    first = next(iter(it))
+    assert first == fp.clip(0, 0, 100, 100)
+
+def test_errors(fp):
+    with pytest.raises(ValueError, match='order'):
+        fp.iter_tiles((10, 10), order='spiral')
+    with pytest.raises(ValueError):
+        fp.iter_tiles((10, 10), 10)
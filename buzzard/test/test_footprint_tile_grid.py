@@ -0,0 +1,110 @@
+"""Tests for Footprint.tile_grid and FootprintGrid"""
+
+# pylint: disable=redefined-outer-name
+
+import itertools
+
+import numpy as np
+import pytest
+
+from buzzard import Footprint, FootprintGrid
+from buzzard.test.tools import assert_tiles_eq, fpeq
+
+@pytest.fixture(scope='module')
+def fp():
+    return Footprint(tl=(100, 200), size=(100, 70), rsize=(100, 70))
+
+@pytest.mark.parametrize('boundary_effect,locus', itertools.product(
+    ['extend', 'exclude', 'overlap', 'shrink'],
+    ['br', 'tr', 'tl', 'bl'],
+))
+@pytest.mark.parametrize('size,overlap', [
+    ((10, 10), (0, 0)),
+    ((30, 20), (5, 3)),
+    ((7, 100), (6, 0)),
+])
+def test_same_as_tile(fp, boundary_effect, locus, size, overlap):
+    if boundary_effect == 'overlap' and (np.asarray(size) > fp.rsize).any():
+        with pytest.raises(ValueError):
+            fp.tile_grid(size, *overlap, boundary_effect=boundary_effect)
+        return
+    tiles = fp.tile(size, *overlap, boundary_effect=boundary_effect, boundary_effect_locus=locus)
+    grid = fp.tile_grid(size, *overlap, boundary_effect=boundary_effect, boundary_effect_locus=locus)
+    assert isinstance(grid, FootprintGrid)
+    assert grid.shape == tiles.shape
+    assert_tiles_eq(grid.to_ndarray(), tiles)
+    assert_tiles_eq(list(grid.flat), tiles.flatten())
+
+def test_exact_equality_br(fp):
+    tiles = fp.tile((30, 20), 5, 3)
+    grid = fp.tile_grid((30, 20), 5, 3)
+    assert list(grid.flat) == list(tiles.flat)
+    assert set(grid.flat) == set(tiles.flat)
+
+def test_indexing(fp):
+    grid = fp.tile_grid((10, 10))
+    tiles = fp.tile((10, 10))
+    assert len(grid) == 7
+    assert grid.size == 70
+    assert grid[2, 3] == tiles[2, 3]
+    assert grid[-1, -1] == tiles[-1, -1]
+    assert isinstance(grid[1], FootprintGrid)
+    assert_tiles_eq(grid[1].to_ndarray(), tiles[1])
+    assert_tiles_eq(grid[1:3, ::2].to_ndarray(), tiles[1:3, ::2])
+    assert_tiles_eq([tile for row in grid for tile in row], tiles.flatten())
+    assert grid.flat[13] == tiles.flat[13]
+    assert len(grid.flat) == 70
+    assert (grid.rtl[2, 3] == [30, 20]).all()
+    assert (grid.rbr[2, 3] == [40, 30]).all()
+    assert (grid.rarea == 100).all()
+
+def test_queries(fp):
+    grid = fp.tile_grid((30, 20), boundary_effect='shrink')
+    tiles = fp.tile((30, 20), boundary_effect='shrink')
+
+    for aoi in [fp.clip(10, 10, 45, 25), fp.clip(30, 20, 60, 40), fp.dilate(10), fp.clip(0, 0, 1, 1)]:
+        expected = np.vectorize(lambda t: t.share_area(aoi), otypes=[bool])(tiles)
+        assert (grid.share_area(aoi) == expected).all()
+        assert np.array_equal(np.stack(grid.intersecting(aoi)), np.stack(np.nonzero(expected)))
+
+        starty, endy, startx, endx = grid.slice_in(aoi, clip=True)
+        for idx, tile in np.ndenumerate(tiles):
+            slicey, slicex = tile.slice_in(aoi, clip=True)
+            assert (starty[idx], endy[idx], startx[idx], endx[idx]) == (
+                slicey.start, slicey.stop, slicex.start, slicex.stop
+            )
+
+    # A Footprint not on the grid
+    aoi = Footprint(tl=(110.1, 190.1), size=(5, 5), rsize=(3, 3))
+    expected = np.vectorize(lambda t: t.share_area(aoi), otypes=[bool])(tiles)
+    assert (grid.share_area(aoi) == expected).all()
+
+def test_of_footprints_and_rebase(fp):
+    tiles = fp.tile((30, 20), boundary_effect='shrink')
+    grid = FootprintGrid.of_footprints(fp, tiles)
+    assert_tiles_eq(grid.to_ndarray(), tiles)
+
+    big = fp.dilate(5)
+    rebased = grid.rebase(big)
+    assert rebased.parent is big
+    assert (rebased.rx == grid.rx + 5).all()
+    assert_tiles_eq(rebased.to_ndarray(), tiles)
+
+    with pytest.raises(ValueError):
+        FootprintGrid.of_footprints(fp, [Footprint(tl=(100.25, 200), size=(5, 5), rsize=(5, 5))])
+
+def test_is_tiling_covering_fp(fp):
+    from buzzard._tools import is_tiling_covering_fp
+    grid = fp.tile_grid((30, 20), boundary_effect='shrink')
+    assert is_tiling_covering_fp(grid, fp, False, False)
+    assert not is_tiling_covering_fp(grid[:-1], fp, False, False)
+    grid = fp.tile_grid((30, 20), 5, 5, boundary_effect='shrink')
+    assert not is_tiling_covering_fp(grid, fp, False, False)
+    assert is_tiling_covering_fp(grid, fp, True, True)
+
+def test_large_tiling():
+    fp = Footprint(tl=(0, 0), size=(1e6, 1e6), rsize=(1000000, 1000000))
+    grid = fp.tile_grid((1000, 1000))
+    assert grid.size == 1000000
+    assert fpeq(grid[999, 999], fp.clip(999000, 999000, None, None))
+    assert grid.share_area(fp.clip(500, 500, 1500, 1500)).sum() == 4
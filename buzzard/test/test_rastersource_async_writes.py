@@ -0,0 +1,78 @@
+"""Tests for the `async_writes` parameter of GDALFileRaster"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+import buzzard as buzz
+from buzzard import Footprint
+
+@pytest.fixture()
+def path():
+    return '{}/{}.tif'.format(tempfile.gettempdir(), uuid.uuid4())
+
+@pytest.mark.parametrize('async_writes', [True, 3 * 32 * 32 * 2])
+def test_async_writes(path, async_writes):
+    ds = buzz.Dataset()
+    fp = Footprint(tl=(0, 0), size=(128, 96), rsize=(128, 96))
+    r = ds.acreate_raster(
+        path, fp, 'int16', 2, {'nodata': -1},
+        options=['TILED=YES', 'BLOCKXSIZE=32', 'BLOCKYSIZE=32'],
+        io_pool='io', async_writes=async_writes,
+    )
+    assert r.async_writes is not None
+
+    expected = np.full(np.r_[fp.shape, 2], -1, 'int16')
+    tiles = fp.tile((32, 32))
+    arr = np.empty((32, 32, 2), 'int16')
+    for i, tile in enumerate(tiles.flat):
+        # The buffer is reused, the queued writes should not see the modifications
+        arr[...] = i
+        r.set_data(arr, tile, channels=[0, 1])
+        expected[tile.slice_in(fp)] = i
+
+    # Overlapping writes are performed in order, with a mask
+    sub = fp.clip(10, 10, 50, 20)
+    mask = np.zeros(sub.shape, bool)
+    mask[:, ::2] = True
+    r.set_data(np.full(sub.shape, 100, 'int16'), sub, channels=1, mask=mask)
+    expected[sub.slice_in(fp) + (1,)][mask] = 100
+
+    r.flush()
+    assert (r.get_data(channels=[0, 1]) == expected).all()
+
+    r.set_data(np.full(sub.shape, 200, 'int16'), sub, channels=0)
+    expected[sub.slice_in(fp) + (0,)] = 200
+    assert (r.get_data(channels=[0, 1]) == expected).all()
+
+    r.set_data(np.full(fp.shape, 7, 'int16'), channels=0)
+    r.close()
+    with ds.aopen_raster(path).delete as r:
+        assert (r.get_data(channels=0) == 7).all()
+        assert (r.get_data(channels=1) == expected[..., 1]).all()
+    ds.close()
+
+def test_async_writes_errors(path):
+    ds = buzz.Dataset()
+    fp = Footprint(tl=(0, 0), size=(10, 10), rsize=(10, 10))
+    with pytest.raises(ValueError, match='io_pool'):
+        ds.acreate_raster(path, fp, 'uint8', 1, async_writes=True)
+
+    r = ds.acreate_raster(path, fp, 'uint8', 1, io_pool='io', async_writes=True, ow=True)
+
+    def _fail(*_):
+        raise IOError('disk full')
+    r._back._write_behind._write = _fail
+    r.set_data(np.ones(fp.shape, 'uint8'))
+    with pytest.raises(RuntimeError, match='disk full'):
+        r.flush()
+
+    # The error is reported once
+    r.flush()
+    r.delete()
+    ds.close()
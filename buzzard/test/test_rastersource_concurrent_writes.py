@@ -0,0 +1,62 @@
+"""Tests for the concurrent calls to GDALFileRaster.set_data"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import multiprocessing as mp
+import multiprocessing.pool
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+import buzzard as buzz
+from buzzard import Footprint
+from buzzard._tools import BlockLocks
+
+@pytest.fixture(scope='module')
+def pool():
+    p = mp.pool.ThreadPool(8)
+    yield p
+    p.terminate()
+
+def test_block_locks():
+    bl = BlockLocks((32, 16))
+    assert bl.blocks_of_region(0, 0, 32, 16) == (0, 0, 1, 1)
+    assert bl.blocks_of_region(31, 15, 2, 2) == (0, 0, 2, 2)
+    assert bl.blocks_of_region(40, 40, 100, 1) == (1, 2, 5, 3)
+    with bl.locked(0, 0, 32, 16):
+        with bl.locked(32, 0, 32, 16):
+            pass
+
+def test_concurrent_set_data(pool):
+    ds = buzz.Dataset(max_active=4, active_timeout=None)
+    path = '{}/{}.tif'.format(tempfile.gettempdir(), uuid.uuid4())
+    fp = Footprint(tl=(0, 0), size=(256, 256), rsize=(256, 256))
+    r = ds.acreate_raster(
+        path, fp, 'int32', 3,
+        options=['TILED=YES', 'BLOCKXSIZE=32', 'BLOCKYSIZE=32'],
+    )
+
+    # Disjoint writes
+    tiles = list(fp.tile((32, 32)).flat)
+    def _write(i):
+        r.set_data(np.full(np.r_[tiles[i].shape, 3], i, 'int32'), tiles[i])
+    pool.map(_write, range(len(tiles)))
+    arr = r.get_data()
+    for i, tile in enumerate(tiles):
+        assert (arr[tile.slice_in(fp)] == i).all()
+
+    # Overlapping writes are not interleaved: All the channels of a pixel come from the same write
+    big_tiles = list(fp.tile((96, 96), 64, 64, boundary_effect='shrink').flat)
+    def _write_big(i):
+        r.set_data(np.full(np.r_[big_tiles[i].shape, 3], i, 'int32'), big_tiles[i])
+    pool.map(_write_big, list(range(len(big_tiles))) * 3)
+    arr = r.get_data()
+    assert set(np.unique(arr)) <= set(range(len(big_tiles)))
+    for c in range(1, 3):
+        assert (arr[..., c] == arr[..., 0]).all()
+
+    r.delete()
+    ds.close()
@@ -0,0 +1,74 @@
+"""Tests for AStoredRaster.iter_data"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import multiprocessing as mp
+import multiprocessing.pool
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+import buzzard as buzz
+from buzzard import Footprint
+
+@pytest.fixture(scope='module')
+def pool():
+    p = mp.pool.ThreadPool(3)
+    yield p
+    p.terminate()
+
+@pytest.fixture(params=['GTiff', 'MEM', 'numpy'])
+def rast(request):
+    ds = buzz.Dataset()
+    fp = Footprint(tl=(0, 0), size=(100, 80), rsize=(100, 80))
+    driver = request.param
+    if driver == 'numpy':
+        rast = ds.awrap_numpy_raster(fp, np.zeros(np.r_[fp.shape, 2], 'float32'))
+    elif driver == 'MEM':
+        rast = ds.acreate_raster('', fp, 'float32', 2, driver='MEM')
+    else:
+        path = '{}/{}.tif'.format(tempfile.gettempdir(), uuid.uuid4())
+        rast = ds.acreate_raster(path, fp, 'float32', 2, options=['TILED=YES', 'BLOCKXSIZE=32', 'BLOCKYSIZE=32'])
+    arr = np.dstack([
+        np.add(*fp.meshgrid_raster) * (i + 1)
+        for i in range(2)
+    ]).astype('float32')
+    rast.set_data(arr, channels=[0, 1])
+    yield rast
+    if driver == 'GTiff':
+        rast.delete()
+    ds.close()
+
+@pytest.mark.parametrize('use_pool', [False, True])
+@pytest.mark.parametrize('max_queue_size', [1, 2, 5])
+def test_iter_data(rast, pool, use_pool, max_queue_size):
+    fps = list(rast.fp.tile((30, 20), boundary_effect='shrink').flat[::-1])
+    fps += [rast.fp.dilate(5), rast.fp.clip(10, 10, 11, 11)]
+
+    io_pool = pool if use_pool else None
+    it = rast.iter_data(fps, channels=[1, 0], max_queue_size=max_queue_size, io_pool=io_pool)
+    arrs = list(it)
+    assert len(arrs) == len(fps)
+    for fp, arr in zip(fps, arrs):
+        assert (arr == rast.get_data(fp, channels=[1, 0])).all()
+
+    arrs = list(rast.iter_data(fps, channels=0, io_pool=io_pool, dst_nodata=-1))
+    for fp, arr in zip(fps, arrs):
+        assert arr.shape == tuple(fp.shape)
+        assert (arr == rast.get_data(fp, channels=0, dst_nodata=-1)).all()
+
+def test_iter_data_raster_pool(pool):
+    ds = buzz.Dataset()
+    path = '{}/{}.tif'.format(tempfile.gettempdir(), uuid.uuid4())
+    fp = Footprint(tl=(0, 0), size=(64, 64), rsize=(64, 64))
+    with ds.acreate_raster(path, fp, 'uint8', 1, io_pool=pool).delete as r:
+        r.fill(42)
+        fps = list(fp.tile((16, 16)).flat)
+        it = r.iter_data(fps)
+        first = next(it)
+        assert (first == 42).all()
+        assert sum(1 for _ in it) == len(fps) - 1
+    ds.close()
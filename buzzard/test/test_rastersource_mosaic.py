@@ -0,0 +1,92 @@
+"""Tests for Dataset.open_raster_mosaic"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import os
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+import buzzard as buzz
+from buzzard import Footprint
+from buzzard.test.tools import fpeq
+
+@pytest.fixture(scope='module')
+def fp():
+    return Footprint(tl=(100, 200), size=(30, 20), rsize=(30, 20))
+
+@pytest.fixture(scope='module')
+def array(fp):
+    return np.dstack([
+        np.add(*fp.meshgrid_raster) + 1,
+        np.add(*fp.meshgrid_raster) * 2 + 1,
+    ]).astype('int16')
+
+@pytest.fixture(scope='module')
+def tiles_dir(fp, array):
+    """3x2 tiles covering `fp`, the last one missing"""
+    d = os.path.join(tempfile.gettempdir(), str(uuid.uuid4()))
+    os.mkdir(d)
+    ds = buzz.Dataset()
+    tiles = fp.tile((10, 10))
+    for i, tile in enumerate(tiles.flat[:-1]):
+        path = os.path.join(d, 'tile{}.tif'.format(i))
+        nodata = -1 if i == 0 else -2
+        with ds.acreate_raster(path, tile, 'int16', 2, {'nodata': nodata}).close as r:
+            r.set_data(array[tile.slice_in(fp)], channels=[0, 1])
+    yield d
+    shutil.rmtree(d)
+
+@pytest.mark.parametrize('io_pool', [None, 'io'])
+def test_mosaic(fp, array, tiles_dir, io_pool):
+    ds = buzz.Dataset()
+    m = ds.aopen_raster_mosaic(os.path.join(tiles_dir, '*.tif'), io_pool=io_pool)
+    assert fpeq(m.fp, fp)
+    assert len(m.paths) == 5
+    assert len(m) == 2
+    assert m.dtype == np.int16
+    assert m.nodata == -1
+    assert ds.active_count == 0
+
+    expected = array.copy()
+    expected[10:, 20:] = -1
+
+    assert (m.get_data(channels=[0, 1]) == expected).all()
+    assert (m.get_data(channels=1) == expected[..., 1]).all()
+    assert (m.get_data(fp.clip(5, 5, 25, 15), channels=[0, 1]) == expected[5:15, 5:25]).all()
+    assert (m.get_data(fp.clip(12, 2, 18, 8), channels=[0, 1]) == expected[2:8, 12:18]).all()
+
+    big = fp.dilate(3)
+    arr = m.get_data(big, channels=[0, 1], dst_nodata=-3)
+    assert (arr[3:-3, 3:-3] == np.where(expected == -1, -3, expected)).all()
+    assert (arr[:3] == -3).all()
+
+    # Only the intersecting files are read
+    assert m._back.members_of_fp(fp.clip(0, 0, 5, 5)) == [0]
+    ds.close()
+
+def test_mosaic_paths_order(fp, array, tiles_dir):
+    ds = buzz.Dataset()
+    paths = [os.path.join(tiles_dir, 'tile{}.tif'.format(i)) for i in [4, 0]]
+    m = ds.aopen_raster_mosaic(paths, io_pool=None)
+    assert m.paths == paths
+    assert m.nodata == -2
+    assert fpeq(m.fp, fp.clip(0, 0, 20, 20))
+    ds.close()
+
+def test_mosaic_errors(fp, tiles_dir):
+    ds = buzz.Dataset()
+    with pytest.raises(ValueError, match='No file'):
+        ds.aopen_raster_mosaic(os.path.join(tiles_dir, '*.jp2'))
+
+    path = os.path.join(tiles_dir, 'other.tif')
+    other_fp = Footprint(tl=(100.5, 200), size=(10, 10), rsize=(10, 10))
+    with ds.acreate_raster(path, other_fp, 'int16', 2).delete:
+        with pytest.raises(ValueError, match='same grid'):
+            ds.aopen_raster_mosaic([os.path.join(tiles_dir, 'tile0.tif'), path])
+    assert ds.active_count == 0
+    ds.close()
@@ -0,0 +1,69 @@
+"""Tests for the parallel reads of GDALFileRaster (`io_pool` parameter)"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import multiprocessing as mp
+import multiprocessing.pool
+import os
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+import buzzard as buzz
+from buzzard import Footprint
+
+@pytest.fixture(scope='module')
+def pool():
+    p = mp.pool.ThreadPool(4)
+    yield p
+    p.terminate()
+
+@pytest.fixture(scope='module')
+def path():
+    path = '{}/{}.tif'.format(tempfile.gettempdir(), uuid.uuid4())
+    fp = Footprint(tl=(0, 0), size=(1000, 700), rsize=(1000, 700))
+    with buzz.Dataset().acreate_raster(path, fp, 'float32', 2, options=['TILED=YES']).close as r:
+        arr = np.dstack([
+            np.add(*r.fp.meshgrid_raster) * (i + 1)
+            for i in range(2)
+        ]).astype('float32')
+        r.set_data(arr, channels=[0, 1])
+    yield path
+    os.remove(path)
+
+def test_parallel_read(path, pool):
+    ds = buzz.Dataset()
+    serial = ds.aopen_raster(path)
+    parallel = ds.aopen_raster(path, io_pool=pool)
+    assert serial.io_pool is None
+    assert parallel.io_pool is pool
+    assert parallel.block_size == (256, 256)
+
+    # Lower the threshold to trigger the splitting on a small file
+    parallel._back._PARALLEL_READ_MIN_AREA = 256 * 256
+
+    fps = [
+        parallel.fp,
+        parallel.fp.clip(3, 5, 997, 650),
+        parallel.fp.clip(300, 0, 310, 700),
+        parallel.fp.clip(0, 400, 1000, 401),
+        parallel.fp.dilate(10),
+        parallel.fp.clip(13, 7, 600, 500).move((500, 400)),
+    ]
+    for fp in fps:
+        for channels in [None, 1, [1, 0]]:
+            assert np.all(
+                parallel.get_data(fp, channels=channels, dst_nodata=-1) ==
+                serial.get_data(fp, channels=channels, dst_nodata=-1)
+            )
+    ds.close()
+
+def test_parallel_read_alias(path):
+    ds = buzz.Dataset()
+    r = ds.aopen_raster(path, io_pool='io')
+    assert isinstance(r.io_pool, mp.pool.ThreadPool)
+    assert r.io_pool is ds.pools['io']
+    ds.close()
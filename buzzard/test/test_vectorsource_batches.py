@@ -0,0 +1,204 @@
+"""Tests for the reads and writes of vectors by batches, for the reprojection of geometries by
+batches and for the filters pushed down to the drivers"""
+
+# pylint: disable=redefined-outer-name
+
+import os
+import tempfile
+import threading
+import uuid
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+import shapely.wkb
+from osgeo import gdal
+
+import buzzard as buzz
+from .tools import SRS
+
+FIELDS = [
+    {'name': 'rarea', 'type': int},
+    {'name': 'fpname', 'type': str},
+    {'name': 'sqrtarea', 'type': float},
+]
+
+@pytest.fixture(params=[
+    ('ESRI Shapefile', '.shp'),
+    ('GPKG', '.gpkg'),
+    ('Memory', ''),
+])
+def path_driver(request):
+    driver, suffix = request.param
+    path = '{}/{}{}'.format(tempfile.gettempdir(), uuid.uuid4(), suffix)
+    yield path, driver
+    if driver != 'Memory' and os.path.isfile(path):
+        gdal.GetDriverByName(driver).Delete(path)
+
+@pytest.fixture()
+def features():
+    rng = np.random.RandomState(42)
+    fp = buzz.Footprint(tl=(SRS[0]['cx'], SRS[0]['cy']), size=(1000, 1000), rsize=(100, 100))
+    res = []
+    for i, tile in enumerate(fp.tile((5, 5), boundary_effect='shrink').flat):
+        fields = [tile.rarea, 'tile{}'.format(i), tile.area ** .5]
+        if rng.randint(4) == 0:
+            fields[rng.randint(3)] = None
+        res.append((tile.poly, fields))
+    return res
+
+def _create(ds, path, driver, features):
+    v = ds.acreate_vector(path, 'polygon', FIELDS, driver=driver, sr=SRS[0]['wkt'])
+    for geom, fields in features:
+        v.insert_data(geom, fields)
+    return v
+
+def test_batches_same_as_iter_data(path_driver, features):
+    path, driver = path_driver
+    ds = buzz.Dataset()
+    v = _create(ds, path, driver, features)
+    expected = list(v.iter_data(-1))
+    assert len(expected) == len(features)
+
+    geoms, rarea, fpname, sqrtarea = v.get_table()
+    assert len(geoms) == len(rarea) == len(fpname) == len(sqrtarea) == len(expected)
+    assert rarea.dtype == np.int64
+    assert sqrtarea.dtype == np.float64
+    assert fpname.dtype == object
+    for geom, exp in zip(geoms, expected):
+        assert geom.equals(exp[0])
+    assert list(zip(rarea.tolist(), fpname.tolist(), sqrtarea.tolist())) == [
+        tuple(exp[1:]) for exp in expected
+    ]
+
+    batches = list(v.iter_batches(10, 'fpname', geom_type='wkb'))
+    assert [len(b[0]) for b in batches[:-1]] == [10] * (len(batches) - 1)
+    assert sum(len(b[0]) for b in batches) == len(expected)
+    wkbs = np.concatenate([b[0] for b in batches])
+    assert all(
+        shapely.wkb.loads(wkb).equals(exp[0])
+        for wkb, exp in zip(wkbs, expected)
+    )
+    assert np.concatenate([b[1] for b in batches]).tolist() == [exp[2] for exp in expected]
+
+    # Flat results and spatial filter
+    mask = sg.box(*features[0][0].buffer(1).bounds)
+    geoms = v.get_table(None, mask=mask)
+    assert isinstance(geoms, np.ndarray)
+    assert sorted(g.wkt for g in geoms) == sorted(g.wkt for g in v.iter_data(None, mask=mask))
+    assert len(v.get_table([], mask=(0, 1, 0, 1))[0]) == 0
+    v.close()
+
+def test_insert_many(path_driver, features):
+    path, driver = path_driver
+    ds = buzz.Dataset(sr_work=SRS[1]['wkt'])
+    v = ds.acreate_vector(path, 'polygon', FIELDS, driver=driver, sr=SRS[0]['wkt'])
+    data = [
+        (sg.mapping(poly)['coordinates'] if i % 3 == 0 else poly, fields)
+        for i, (poly, fields) in enumerate(features)
+    ]
+    data[1] = features[1][0]
+    assert v.insert_many(data[:10], batch_size=3) == 10
+    assert v.insert_many(iter(data[10:]), batch_size=64, validate=True) == len(data) - 10
+    assert len(v) == len(features)
+
+    ref = ds.acreate_vector('', 'polygon', FIELDS, driver='Memory', sr=SRS[0]['wkt'])
+    for dat in data:
+        if isinstance(dat, tuple):
+            ref.insert_data(*dat)
+        else:
+            ref.insert_data(dat)
+    for a, b in zip(v.iter_data(-1), ref.iter_data(-1)):
+        assert a[0].hausdorff_distance(b[0]) < 1e-6
+        assert a[1:] == b[1:]
+    v.close()
+    ref.close()
+
+def test_get_table_reprojected(path_driver, features):
+    path, driver = path_driver
+    ds = buzz.Dataset(sr_work=SRS[1]['wkt'])
+    v = _create(ds, path, driver, features)
+    geoms, = v.get_table([])
+    for geom, exp in zip(geoms, v.iter_data(None)):
+        assert geom.equals_exact(exp, 1e-6)
+    v.close()
+
+def test_iter_data_reprojected(path_driver, features):
+    path, driver = path_driver
+    ds = buzz.Dataset(sr_work=SRS[1]['wkt'])
+    v = _create(ds, path, driver, features)
+    geoms = list(v.iter_data(None))
+    assert len(geoms) == len(features) > v._back._ITER_DATA_CHUNK_SIZE
+    for geom, (poly, _) in zip(geoms, features):
+        assert geom.hausdorff_distance(poly) < 1e-4
+    assert v.get_data(42, None).equals_exact(geoms[42], 1e-9)
+    coords = v.get_data(42, None, geom_type='coordinates')
+    assert np.allclose(coords[0], np.asarray(geoms[42].exterior.coords))
+    v.close()
+
+def test_shared_transformations():
+    ds = buzz.Dataset(sr_work=SRS[1]['wkt'])
+    back = ds._back
+    a = back._get_osr_transformation(SRS[0]['wkt'], SRS[1]['wkt'])
+    assert a is back._get_osr_transformation(SRS[0]['wkt'], SRS[1]['wkt'])
+    assert a is not back._get_osr_transformation(SRS[1]['wkt'], SRS[0]['wkt'])
+
+    # One object per thread
+    res = []
+    t = threading.Thread(
+        target=lambda: res.append(back._get_osr_transformation(SRS[0]['wkt'], SRS[1]['wkt']))
+    )
+    t.start()
+    t.join()
+    assert res[0] is not a
+
+def test_pushdown(path_driver, features):
+    path, driver = path_driver
+    ds = buzz.Dataset()
+    v = _create(ds, path, driver, features)
+    where = "fpname LIKE 'tile1%'"
+    expected = [
+        dat
+        for dat in v.iter_data(-1)
+        if dat[2] is not None and dat[2].startswith('tile1')
+    ]
+    assert 0 < len(expected) < len(features)
+
+    got = list(v.iter_data(-1, where=where))
+    assert [dat[1:] for dat in got] == [dat[1:] for dat in expected]
+    assert list(v.iter_data('fpname,rarea', None, where=where)) == [
+        (dat[2], dat[1]) for dat in expected
+    ]
+    fpname, = v.get_table('fpname', None, where=where)
+    assert fpname.tolist() == [dat[2] for dat in expected]
+    # The field of the filter is not read
+    rarea, = v.get_table('rarea', None, where=where)
+    assert rarea.tolist() == [dat[1] for dat in expected]
+    assert list(v.iter_data('rarea', None, where=where)) == [(dat[1],) for dat in expected]
+    assert v._back._identifiers_of_where('''"fp name" = 'a b' AND id > 1''') == {
+        'fp name', 'and', 'id',
+    }
+
+    # The geometries are not read but filtered
+    mask = features[42][0]
+    masked = [tuple(dat[1:3]) for dat in v.iter_data(-1, mask=mask)]
+    assert 1 < len(masked) < len(features)
+    assert list(v.iter_data('rarea,fpname', None, mask=mask)) == masked
+    assert [col.tolist() for col in v.get_table('rarea,fpname', None, mask=mask)] == [
+        [dat[0] for dat in masked], [dat[1] for dat in masked],
+    ]
+    assert len(list(v.iter_data(-1))) == len(features)
+
+    geoms = v.get_table(None, where=where, simplify_tolerance=1.)
+    assert len(geoms) == len(expected)
+    assert all(
+        geom.equals(dat[0].simplify(1., preserve_topology=True))
+        for geom, dat in zip(geoms, expected)
+    )
+    geoms = list(v.iter_data(None, where=where, simplify_tolerance=1.))
+    assert len(geoms) == len(expected)
+    assert all(
+        geom.equals(dat[0].simplify(1., preserve_topology=True))
+        for geom, dat in zip(geoms, expected)
+    )
+    v.close()
@@ -0,0 +1,108 @@
+"""Tests for the vectors stored in memory as numpy arrays (`MemoryVector`), compared with the
+vectors using the OGR `Memory` driver"""
+
+# pylint: disable=redefined-outer-name
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+
+import buzzard as buzz
+from .tools import SRS
+
+FIELDS = [
+    {'name': 'rarea', 'type': int},
+    {'name': 'fpname', 'type': str},
+    {'name': 'sqrtarea', 'type': float},
+]
+
+@pytest.fixture()
+def features():
+    rng = np.random.RandomState(42)
+    fp = buzz.Footprint(tl=(SRS[0]['cx'], SRS[0]['cy']), size=(1000, 1000), rsize=(100, 100))
+    res = []
+    for i, tile in enumerate(fp.tile((5, 5), boundary_effect='shrink').flat):
+        fields = [tile.rarea, 'tile{}'.format(i), tile.area ** .5]
+        if rng.randint(4) == 0:
+            fields[rng.randint(3)] = None
+        res.append((tile.poly.buffer(rng.uniform(0, 5)), fields))
+    return res
+
+@pytest.fixture(params=[0, 1])
+def vectors(request, features):
+    ds = buzz.Dataset(sr_work=SRS[request.param]['wkt'])
+    mem = ds.acreate_memory_vector('polygon', FIELDS, sr=SRS[0]['wkt'])
+    ogr = ds.acreate_vector('', 'polygon', FIELDS, driver='Memory', sr=SRS[0]['wkt'])
+    assert mem.insert_many(features[:-10], batch_size=100) == len(features) - 10
+    ogr.insert_many(features[:-10])
+    for geom, fields in features[-10:]:
+        mem.insert_data(geom, fields)
+        ogr.insert_data(geom, fields)
+    yield mem, ogr
+    mem.close()
+    ogr.close()
+
+def _assert_same_features(a, b):
+    a, b = list(a), list(b)
+    assert len(a) == len(b)
+    for dat0, dat1 in zip(a, b):
+        assert dat0[0].equals_exact(dat1[0], 1e-6)
+        assert dat0[1:] == dat1[1:]
+
+def test_same_as_ogr(vectors, features):
+    mem, ogr = vectors
+    assert isinstance(mem, buzz.MemoryVector)
+    assert len(mem) == len(ogr) == len(features)
+    assert mem.type == ogr.type
+    assert mem.fields == ogr.fields
+    assert np.allclose(mem.extent_stored, ogr.extent_stored)
+    assert np.allclose(mem.extent, ogr.extent)
+
+    _assert_same_features(mem.iter_data(-1), ogr.iter_data(-1))
+    _assert_same_features(
+        mem.iter_data(-1, slicing=slice(5, None, 3)),
+        ogr.iter_data(-1, slicing=slice(5, None, 3)),
+    )
+    assert list(mem.iter_data('fpname,rarea', None)) == list(ogr.iter_data('fpname,rarea', None))
+    assert mem.get_data(42, geom_type='coordinates')[1:] == ogr.get_data(42, geom_type='coordinates')[1:]
+
+    # Spatial filters
+    geom = features[123][0]
+    for mask in [geom, geom.bounds[::2] + geom.bounds[1::2]]:
+        _assert_same_features(mem.iter_data([], mask=mask), ogr.iter_data([], mask=mask))
+        assert len(list(mem.iter_data([], mask=mask))) > 1
+    _assert_same_features(
+        mem.iter_data([], mask=geom, clip=True),
+        ogr.iter_data([], mask=geom, clip=True),
+    )
+
+    # Batches
+    for dat0, dat1 in zip(mem.get_table(mask=geom), ogr.get_table(mask=geom)):
+        assert dat0.dtype == dat1.dtype
+        assert type(dat0) is type(dat1)
+        if dat0.dtype == object and isinstance(dat0[0], sg.base.BaseGeometry):
+            assert all(g0.equals_exact(g1, 1e-6) for g0, g1 in zip(dat0, dat1))
+        else:
+            assert dat0.tolist() == dat1.tolist()
+    assert [len(b) for b in mem.iter_batches(150, None)] == [150, 150, 100]
+
+def test_index_invalidation():
+    ds = buzz.Dataset()
+    v = ds.acreate_memory_vector('point', [{'name': 'i', 'type': int}])
+    mask = (9.5, 20.5, -1, 1)
+    assert list(v.iter_data(None, mask=mask)) == []
+    assert v.insert_many((sg.Point(x, 0), [x]) for x in range(10)) == 10
+    assert list(v.iter_data('i', None, mask=mask)) == []
+    v.insert_many((sg.Point(x, 0), [x]) for x in range(10, 100))
+    assert list(v.iter_data('i', None, mask=mask)) == [(x,) for x in range(10, 21)]
+    assert v.extent.tolist() == [0, 99, 0, 0]
+
+    # Insertion at an index
+    v.insert_data(sg.Point(15.5, 0), [-1], index=3)
+    assert v.get_data(3) == (sg.Point(15.5, 0), -1)
+    assert v.get_data(4) == (sg.Point(3, 0), 3)
+    assert [i for i, in v.iter_data('i', None, mask=mask)] == [-1] + list(range(10, 21))
+
+    with pytest.raises(ValueError):
+        list(v.iter_data(where='i > 3'))
+    v.close()
@@ -0,0 +1,77 @@
+"""Tests for the parallel reads of vectors (`pool` parameter of `iter_data`)"""
+
+# pylint: disable=redefined-outer-name
+
+from __future__ import division, print_function
+import multiprocessing as mp
+import multiprocessing.pool
+import tempfile
+import uuid
+
+import pytest
+import shapely.geometry as sg
+from osgeo import gdal
+
+import buzzard as buzz
+from buzzard import Footprint
+
+@pytest.fixture(scope='module')
+def pool():
+    p = mp.pool.ThreadPool(4)
+    yield p
+    p.terminate()
+
+@pytest.fixture(scope='module')
+def path():
+    path = '{}/{}.shp'.format(tempfile.gettempdir(), uuid.uuid4())
+    fp = Footprint(tl=(0, 0), size=(1000, 700), rsize=(100, 70))
+    fields = [{'name': 'name', 'type': str}, {'name': 'area', 'type': float}]
+    with buzz.Dataset().acreate_vector(path, 'polygon', fields).close as v:
+        v.insert_many(
+            (tile.poly, ['tile{}'.format(i), tile.area])
+            for i, tile in enumerate(fp.tile((3, 3), boundary_effect='shrink').flat)
+        )
+    yield path
+    gdal.GetDriverByName('ESRI Shapefile').Delete(path)
+
+def test_parallel_read(path, pool):
+    ds = buzz.Dataset(max_active_per_source=2)
+    v = ds.aopen_vector(path)
+    kwargs_list = [
+        dict(fields=-1),
+        dict(fields='name', geom_type='coordinates'),
+        dict(fields='area', geom_type=None, where="name LIKE 'tile1%'"),
+        dict(mask=(100, 200, -300, -200)),
+        dict(slicing=slice(5, 600, 7)),
+        dict(slicing=slice(None, None, -3)),
+    ]
+    for kwargs in kwargs_list:
+        serial = list(v.iter_data(**kwargs))
+        assert serial
+        for chunks in [1, 3, 16, 10000]:
+            assert list(v.iter_data(pool=pool, chunks=chunks, **kwargs)) == serial
+        unordered = list(v.iter_data(pool=pool, chunks=7, ordered=False, **kwargs))
+        assert sorted(map(repr, unordered)) == sorted(map(repr, serial))
+
+    # The reads using filters are not partitioned
+    assert v._back.fast_partitions(None, None, None)
+    assert not v._back.fast_partitions(None, None, "name LIKE 'tile1%'")
+    assert not v._back.fast_partitions(None, (100, -300, 200, -200), None)
+
+def test_parallel_read_memory(pool):
+    ds = buzz.Dataset()
+    v = ds.acreate_vector('', 'point', driver='Memory')
+    v.insert_many(sg.Point(x, x % 7) for x in range(50))
+    assert list(v.iter_data(pool=pool, chunks=4)) == list(v.iter_data())
+
+def test_parallel_read_processes(path):
+    ds = buzz.Dataset()
+    v = ds.aopen_vector(path)
+    p = mp.Pool(2)
+    try:
+        res = list(v.iter_data(-1, pool=p, chunks=5))
+    finally:
+        p.terminate()
+    assert [(g.wkt, name, area) for g, name, area in res] == [
+        (g.wkt, name, area) for g, name, area in v.iter_data(-1)
+    ]
@@ -0,0 +1,124 @@
+"""Tests for the rasterization of vectors (`rasterize` and `acreate_rasterized_recipe`)"""
+
+# pylint: disable=redefined-outer-name
+
+import os
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+from osgeo import gdal
+
+import buzzard as buzz
+from .tools import SRS
+
+FIELDS = [
+    {'name': 'label', 'type': int},
+    {'name': 'height', 'type': float},
+    {'name': 'name', 'type': str},
+]
+
+@pytest.fixture()
+def fp():
+    return buzz.Footprint(tl=(SRS[0]['cx'], SRS[0]['cy']), size=(100, 100), rsize=(100, 100))
+
+@pytest.fixture()
+def features(fp):
+    rng = np.random.RandomState(42)
+    xy = fp.raster_to_spatial(rng.uniform(-10, 110, (60, 2)))
+    radius = rng.uniform(0.5, 15, 60)
+    return [
+        (sg.Point(*pt).buffer(r), [i + 1, None if i % 7 == 0 else r, 'c{}'.format(i)])
+        for i, (pt, r) in enumerate(zip(xy, radius))
+    ]
+
+@pytest.fixture(params=['ESRI Shapefile', 'Memory', 'MemoryVector'])
+def create(request, features):
+    paths = []
+
+    def _create(ds):
+        if request.param == 'MemoryVector':
+            v = ds.acreate_memory_vector('polygon', FIELDS, sr=SRS[0]['wkt'])
+        else:
+            path = '' if request.param == 'Memory' else '{}/{}.shp'.format(tempfile.gettempdir(), uuid.uuid4())
+            paths.append(path)
+            v = ds.acreate_vector(path, 'polygon', FIELDS, driver=request.param, sr=SRS[0]['wkt'])
+        v.insert_many(features)
+        return v
+
+    yield _create
+    for path in paths:
+        if path and os.path.isfile(path):
+            gdal.GetDriverByName('ESRI Shapefile').Delete(path)
+
+def test_rasterize(fp, features, create):
+    ds = buzz.Dataset()
+    v = create(ds)
+    polys = [poly for poly, _ in features]
+
+    assert (v.rasterize(fp) == fp.burn_polygons(polys)).all()
+    assert (v.rasterize(fp, all_touched=True) == fp.burn_polygons(polys, all_touched=True)).all()
+
+    # Values of a field, the last feature wins
+    labels = v.rasterize(fp, 'label')
+    assert labels.dtype == np.int64
+    assert (labels == fp.burn_polygons(polys, labelize=True)).all()
+
+    heights = v.rasterize(fp, 'height', out=np.full(tuple(fp.shape), -1.))
+    expected = np.full(tuple(fp.shape), -1.)
+    for poly, (_, height, _) in features:
+        if height is not None:
+            expected[fp.burn_polygons(poly)] = height
+    assert np.allclose(heights, expected)
+
+    # Outside of the vector
+    far = fp.move(fp.tl + 1000)
+    assert not v.rasterize(far).any()
+
+    with pytest.raises(TypeError):
+        v.rasterize(fp, 'name')
+    v.close()
+
+def test_rasterize_reprojected(fp, create):
+    ds = buzz.Dataset(sr_work=SRS[1]['wkt'])
+    v = create(ds)
+    # The work spatial reference is a translation of the stored one
+    fp_work = buzz.Footprint(gt=(-20, 1.5, 0, 20, 0, -1.5), rsize=(100, 100))
+    polys = v.get_table(None)
+    assert (v.rasterize(fp_work) == fp_work.burn_polygons(polys)).all()
+    v.close()
+
+def test_rasterized_recipe(fp, create):
+    ds = buzz.Dataset()
+    v = create(ds)
+    cache_dir = os.path.join(tempfile.gettempdir(), str(uuid.uuid4()))
+    r = v.acreate_rasterized_recipe(fp, cache_dir, 'label', cache_tiles=(32, 32))
+    assert r.dtype == np.int64
+    assert (r.get_data() == v.rasterize(fp, 'label')).all()
+    mask = v.acreate_rasterized_recipe(fp, cache_dir + '_mask', cache_tiles=(32, 32))
+    assert (mask.get_data() == v.rasterize(fp)).all()
+    r.close()
+    mask.close()
+    v.close()
+
+@pytest.mark.parametrize('driver', ['Memory', 'MemoryVector'])
+def test_rasterize_nan(fp, driver):
+    ds = buzz.Dataset()
+    fields = [{'name': 'height', 'type': float}]
+    if driver == 'MemoryVector':
+        v = ds.acreate_memory_vector('polygon', fields, sr=SRS[0]['wkt'])
+    else:
+        v = ds.acreate_vector('', 'polygon', fields, driver=driver, sr=SRS[0]['wkt'])
+    minx, miny, maxx, maxy = fp.poly.buffer(-10).bounds
+    midx = (minx + maxx) / 2
+    v.insert_data(sg.box(minx, miny, midx, maxy), [float('nan')])
+    v.insert_data(sg.box(midx, miny, maxx, maxy), [None])
+
+    # A NaN value is burnt, a null one is not
+    heights = v.rasterize(fp, 'height', out=np.full(tuple(fp.shape), -1.))
+    burnt = fp.burn_polygons([sg.box(minx, miny, midx, maxy)])
+    assert np.isnan(heights[burnt]).all()
+    assert (heights[~burnt] == -1).all()
+    v.close()
@@ -0,0 +1,81 @@
+"""Tests for the spatial joins of vectors (`bucket_by_tiles` and `sjoin`)"""
+
+# pylint: disable=redefined-outer-name
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+
+import buzzard as buzz
+from .tools import SRS
+
+@pytest.fixture()
+def fp():
+    return buzz.Footprint(tl=(0, 100), size=(100, 100), rsize=(100, 100))
+
+@pytest.fixture()
+def circles(fp):
+    rng = np.random.RandomState(42)
+    ds = buzz.Dataset()
+    v = ds.acreate_vector('', 'polygon', [{'name': 'i', 'type': int}], driver='Memory')
+    xy = fp.raster_to_spatial(rng.uniform(0, 100, (200, 2)))
+    radius = rng.uniform(0.5, 8, 200)
+    v.insert_many(
+        (sg.Point(*pt).buffer(r), [i])
+        for i, (pt, r) in enumerate(zip(xy, radius))
+    )
+    yield v
+    v.close()
+
+def test_bucket_by_tiles(fp, circles):
+    geoms = circles.get_table(None)
+    tiles = fp.tile((16, 16), boundary_effect='shrink')
+    buckets = circles.bucket_by_tiles(tiles)
+    assert buckets.shape == tiles.shape
+    for tile, indices in zip(tiles.flat, buckets.flat):
+        expected = [i for i, geom in enumerate(geoms) if geom.intersects(tile.poly)]
+        assert indices.tolist() == expected
+
+    assert all(
+        (a == b).all()
+        for a, b in zip(buckets.flat, circles.bucket_by_tiles(fp.tile_grid((16, 16), boundary_effect='shrink')).flat)
+    )
+    assert all(
+        (a == b).all()
+        for a, b in zip(buckets.flat, circles.bucket_by_tiles([t.poly for t in tiles.flat]))
+    )
+
+    # Filters
+    buckets = circles.bucket_by_tiles(tiles, where='i >= 100')
+    ids = circles.get_table('i', None, where='i >= 100')[0]
+    for tile, indices in zip(tiles.flat, buckets.flat):
+        expected = [i for i, geom in enumerate(geoms) if i >= 100 and geom.intersects(tile.poly)]
+        assert ids[indices].tolist() == expected
+
+@pytest.mark.parametrize('predicate', ['intersects', 'within', 'contains', 'overlaps'])
+def test_sjoin(fp, circles, predicate):
+    ds = buzz.Dataset()
+    squares = ds.acreate_vector('', 'polygon', driver='Memory')
+    squares.insert_many(tile.poly for tile in fp.tile((25, 25)).flat)
+    squares.insert_data(fp.poly)
+
+    geoms = circles.get_table(None)
+    other_geoms = squares.get_table(None)
+    pairs = circles.sjoin(squares, predicate)
+    assert pairs.shape[0] == 2
+    expected = [
+        (i, j)
+        for i, a in enumerate(geoms)
+        for j, b in enumerate(other_geoms)
+        if getattr(a, predicate)(b)
+    ]
+    assert list(map(tuple, pairs.T.tolist())) == expected
+    assert circles.sjoin(squares, predicate, mask=(1000, 1001, 1000, 1001)).shape == (2, 0)
+
+def test_sjoin_sr_work(circles):
+    ds = buzz.Dataset(sr_work=SRS[0]['wkt'])
+    other = ds.acreate_vector('', 'polygon', driver='Memory', sr=SRS[0]['wkt'])
+    other.insert_data(sg.box(0, 0, 100, 100))
+    with pytest.raises(ValueError, match='sr_work'):
+        circles.sjoin(other)
+    other.close()
@@ -0,0 +1,110 @@
+"""Tests for the spatial indices of vector files (`build_spatial_index`)"""
+
+# pylint: disable=redefined-outer-name
+
+import os
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+import shapely.geometry as sg
+from osgeo import gdal
+
+import buzzard as buzz
+from buzzard._gdal_file_vector import BackGDALFileVector
+
+FIELDS = [{'name': 'i', 'type': int}]
+
+@pytest.fixture()
+def features():
+    rng = np.random.RandomState(42)
+    xy = rng.uniform(0, 1000, (300, 2))
+    radius = rng.uniform(1, 30, 300)
+    return [
+        (sg.Point(*pt).buffer(r), [i])
+        for i, (pt, r) in enumerate(zip(xy, radius))
+    ]
+
+@pytest.fixture(params=[('ESRI Shapefile', 'shp'), ('GeoJSON', 'geojson')])
+def path(request, features):
+    driver, ext = request.param
+    path = '{}/{}.{}'.format(tempfile.gettempdir(), uuid.uuid4(), ext)
+    ds = buzz.Dataset()
+    with ds.acreate_vector(path, 'polygon', FIELDS, driver=driver).close as v:
+        v.insert_many(features)
+    yield path
+    for p in _index_paths(path):
+        if os.path.isfile(p):
+            os.remove(p)
+    gdal.GetDriverByName(driver).Delete(path)
+
+def _layer_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def _index_paths(path):
+    if path.endswith('.shp'):
+        return [os.path.splitext(path)[0] + '.qix']
+    return [
+        '{}.{}.{}'.format(path, _layer_name(path), ext)
+        for ext in ['idx', 'dat']
+    ]
+
+def _read(v, masks):
+    return [
+        (v.feature_count(mask=mask), v.get_table('i', None, mask=mask)[0].tolist(),
+         [i for i, in v.iter_data('i', None, mask=mask)],
+         [i for i, in v.iter_data('i', None, mask=mask, slicing=slice(None, None, -2))],
+         len(list(v.iter_data(None, mask=mask, slicing=slice(1, 5)))))
+        for mask in masks
+    ]
+
+def test_build_spatial_index(path, features, monkeypatch):
+    # The rect masks are (minx, maxx, miny, maxy)
+    masks = [features[12][0], (100, 400, 100, 400), sg.box(2000, 2000, 2100, 2100)]
+    expected = [
+        [i for geom, (i,) in features if geom.intersects(mask)]
+        for mask in [features[12][0], sg.box(100, 100, 400, 400), masks[2]]
+    ]
+
+    ds = buzz.Dataset()
+    v = ds.aopen_vector(path)
+    before = _read(v, masks)
+    assert [ids for _, ids, _, _, _ in before] == expected
+    assert [count for count, _, _, _, _ in before] == [len(ids) for ids in expected]
+    assert not any(os.path.isfile(p) for p in _index_paths(path))
+
+    v.build_spatial_index()
+    assert all(os.path.isfile(p) for p in _index_paths(path))
+    assert _read(v, masks) == before
+    assert v.get_table('i', None, mask=masks[0], where='i > 100')[0].tolist() == [
+        i for i in expected[0] if i > 100
+    ]
+    v.close()
+
+    # Built on the first read using a mask
+    for p in _index_paths(path):
+        os.remove(p)
+    ds = buzz.Dataset(auto_spatial_index=True)
+    v = ds.aopen_vector(path)
+    assert len(v.get_table(None)) == len(features)
+    assert not any(os.path.isfile(p) for p in _index_paths(path))
+    assert _read(v, masks) == before
+    assert all(os.path.isfile(p) for p in _index_paths(path))
+    v.close()
+
+    # A failure of the automatic build falls back to the reads without index
+    for p in _index_paths(path):
+        os.remove(p)
+
+    def _fail(*_):
+        raise RuntimeError('Read-only file system')
+    monkeypatch.setattr(BackGDALFileVector, '_create_qix', _fail)
+    monkeypatch.setattr(BackGDALFileVector, '_create_sidecar', _fail)
+    ds = buzz.Dataset(auto_spatial_index=True)
+    v = ds.aopen_vector(path)
+    assert _read(v, masks) == before
+    assert not any(os.path.isfile(p) for p in _index_paths(path))
+    with pytest.raises(RuntimeError, match='Read-only'):
+        v.build_spatial_index()
+    v.close()
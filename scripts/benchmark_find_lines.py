@@ -0,0 +1,113 @@
+"""
+Benchmark of Footprint.find_lines against its previous implementation, that walked the pixels in
+python and merged the segments with shapely.ops.linemerge. Pass the side of the mask in pixel.
+
+```sh
+$ python scripts/benchmark_find_lines.py 2000
+```
+
+"""
+
+import sys
+import time
+import multiprocessing.pool
+
+import numpy as np
+import scipy.ndimage as ndi
+import shapely.geometry as sg
+import shapely.ops
+import skimage.morphology as skm
+
+import buzzard as buzz
+
+def find_lines_legacy(fp, arr, output_offset):
+    """Previous implementation of `Footprint.find_lines`"""
+    arr = skm.thin(arr.astype(bool, copy=False)).astype('uint8', copy=False)
+
+    squares2x2_topleft_mask = ndi.convolve(
+        arr, [[1, 1, 0], [1, 1, 0], [0, 0, 0]], mode='constant',
+    ) == 4
+    squares2x2_yx_links = {
+        (int(y + dy), int(x + dx)): (int(y), (x))
+        for y, x in zip(*squares2x2_topleft_mask.nonzero())
+        for dy in range(2)
+        for dx in range(2)
+    }
+
+    count = np.sum(arr)
+    yx_lst = np.stack(arr.nonzero(), -1)
+    index = np.empty(fp.shape, dtype=int)
+    index[arr != 0] = np.arange(count)
+
+    convolve = lambda arr, kernel: ndi.convolve(arr, kernel, mode='constant', cval=0)
+    has_top = convolve(arr, [[0, 0, 0], [0, 0, 0], [0, 1, 0]]) * arr
+    has_right = convolve(arr, [[0, 0, 0], [1, 0, 0], [0, 0, 0]]) * arr
+    has_left = convolve(arr, [[0, 0, 0], [0, 0, 1], [0, 0, 0]]) * arr
+    has_topright = convolve(arr, [[0, 0, 0], [0, 0, 0], [1, 0, 0]]) * arr
+    has_topleft = convolve(arr, [[0, 0, 0], [0, 0, 0], [0, 0, 1]]) * arr
+    has_topright = (has_topright.astype('i1') - has_right - has_top).clip(0, 1).astype('u1')
+    has_topleft = (has_topleft.astype('i1') - has_left - has_top).clip(0, 1).astype('u1')
+
+    def _build_neighbors_in_direction(mask, yx_vector):
+        has_indices = mask[yx_lst[:, 0], yx_lst[:, 1]].nonzero()[0]
+        neig_yx = yx_lst[has_indices] + yx_vector
+        neig = index[neig_yx[:, 0], neig_yx[:, 1]]
+        return np.c_[neig, has_indices]
+
+    edges_indices = np.vstack([
+        _build_neighbors_in_direction(has_top, (-1, 0)),
+        _build_neighbors_in_direction(has_right, (0, 1)),
+        _build_neighbors_in_direction(has_topright, (-1, 1)),
+        _build_neighbors_in_direction(has_topleft, (-1, -1)),
+    ])
+    if edges_indices.size == 0:
+        return []
+
+    lines = []
+    for (n1, n2) in edges_indices:
+        yx1 = tuple(yx_lst[n1].tolist())
+        yx2 = tuple(yx_lst[n2].tolist())
+        if yx1 in squares2x2_yx_links and yx2 in squares2x2_yx_links:
+            continue
+        points = [yx1, yx2]
+        if points[0] in squares2x2_yx_links:
+            points.insert(0, squares2x2_yx_links[points[0]])
+        if points[-1] in squares2x2_yx_links:
+            points.append(squares2x2_yx_links[points[-1]])
+        lines.append(sg.LineString(
+            fp.raster_to_spatial(list(map(np.flipud, points))) + output_offset
+        ))
+
+    mline = shapely.ops.linemerge(lines)
+    if isinstance(mline, sg.LineString):
+        return [mline]
+    return list(mline.geoms)
+
+def road_network(fp, count, seed=42):
+    """Mask of a random network of 3 pixels wide roads"""
+    rng = np.random.RandomState(seed)
+    roads = [
+        sg.LineString(fp.raster_to_spatial(rng.uniform(0, fp.rsizex, (6, 2))))
+        for _ in range(count)
+    ]
+    return fp.burn_polygons([road.buffer(fp.pxsizex * 1.5) for road in roads])
+
+def main(side):
+    fp = buzz.Footprint(tl=(0, 0), size=(side, side), rsize=(side, side))
+    mask = road_network(fp, side // 20)
+    offset = fp.pxvec / 2
+    print('mask of {} pixels, {} burnt'.format(mask.size, mask.sum()))
+
+    def _bench(name, fn):
+        start = time.perf_counter()
+        lines = fn()
+        print('{:>18}: {:8.3f}s, {} lines'.format(name, time.perf_counter() - start, len(lines)))
+
+    _bench('legacy', lambda: find_lines_legacy(fp, mask, offset))
+    _bench('find_lines', lambda: fp.find_lines(mask, offset))
+    pool = multiprocessing.pool.ThreadPool()
+    _bench('find_lines tiled', lambda: fp.find_lines(mask, offset, tile_size=(512, 512), pool=pool))
+    pool.terminate()
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,52 @@
+"""
+Micro-benchmarks of the Footprint class. Pass the names of the benchmarks to run, or nothing to
+run them all.
+
+```sh
+$ python scripts/benchmark_footprint.py
+$ python scripts/benchmark_footprint.py clip hash
+```
+
+"""
+
+import sys
+import timeit
+
+import buzzard as buzz
+
+FP = buzz.Footprint(
+    tl=(672939.369686, 6876118.107215),
+    size=(20480 * 0.02, 20480 * 0.02),
+    rsize=(20480, 20480),
+)
+TILE = FP.clip(1000, 1000, 1512, 1512)
+OTHER = FP.clip(1200, 1300, 1800, 1900)
+
+BENCHMARKS = [
+    # (name, statement, number of repetitions)
+    ('construct', lambda: buzz.Footprint(gt=FP.gt, rsize=FP.rsize), 10000),
+    ('clip', lambda: FP.clip(1000, 1000, 1512, 1512), 10000),
+    ('dilate', lambda: TILE.dilate(16), 10000),
+    ('intersection', lambda: TILE & OTHER, 1000),
+    ('tile', lambda: FP.tile((512, 512)), 10),
+    ('tile_grid_to_ndarray', lambda: FP.tile_grid((512, 512)).to_ndarray(), 10),
+    ('hash', lambda: hash(TILE), 100000),
+    ('eq', lambda: TILE == OTHER, 10000),
+    ('coords', lambda: TILE.coords, 100000),
+    ('poly', lambda: TILE.poly, 100000),
+    ('dict_lookup', lambda d={TILE: 0}: d[TILE], 100000),
+]
+
+def main(names):
+    unknown = set(names) - {name for name, _, _ in BENCHMARKS}
+    if unknown:
+        raise ValueError('Unknown benchmarks: {}'.format(sorted(unknown)))
+    print('{:>22}  {:>12}  {:>8}'.format('benchmark', 'per call', 'calls'))
+    for name, stmt, number in BENCHMARKS:
+        if names and name not in names:
+            continue
+        best = min(timeit.repeat(stmt, number=number, repeat=5))
+        print('{:>22}  {:>10.2f}us  {:>8}'.format(name, best / number * 1e6, number))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])